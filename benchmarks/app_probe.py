@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# benchmarks/app_probe.py
+"""Drives one instance of the kit against the stand-in and prints its measurements.
+
+Started by benchmarks/run.py in a fresh process for each cold/warm run. The last
+line of output is `BENCH_RESULT <json>`.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import startup_timing  # noqa: E402  (first, so PROCESS_START is as early as possible)
+
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+def wait_for(app, predicate, timeout):
+    """Process events until predicate() is true; returns elapsed ms or None on timeout"""
+    start = time.perf_counter()
+    deadline = start + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return None
+        app.processEvents()
+        time.sleep(0.001)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_calls(func, count):
+    """Return the mean cost of func() in microseconds"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def measure_tool_open(app, window, url, title, external, timeout):
+    """Open a tool through the panel and return ms until its page finished loading"""
+    import config
+    import tool_sessions
+
+    config.set_config_value("open_external", external)
+    sessions = tool_sessions.get_manager()
+    tool_id = window.tools_panel.manifest.get_tool_id(title)
+    # One instance per tool: close a previous measurement's tab or window first
+    sessions.close(tool_id)
+    loaded = []
+    start = time.perf_counter()
+    window.tools_panel.open_tool_clicked(url, title)
+
+    session = sessions.get(tool_id)
+    if session is None or getattr(session.container, "web_view", None) is None:
+        return {"ok": False, "ms": None}
+    page = session.container.web_view.page()
+    page.loadFinished.connect(lambda ok: loaded.append((ok, time.perf_counter())))
+
+    if wait_for(app, lambda: loaded, timeout) is None:
+        return {"ok": False, "ms": None}
+    ok, finished = loaded[0]
+    # Sample memory now: the next measurement closes this tool again
+    from procstats import read_rss_bytes
+    return {"ok": ok, "ms": (finished - start) * 1000, "rss": read_rss_bytes(page.renderProcessPid())}
+
+
+def measure_frame_stats(app, window, timeout):
+    """Pull the game's steady-state frame statistics for the last sampling interval"""
+    probe = window.frame_probe
+    samples = []
+    probe.stats_ready.connect(samples.append)
+    probe.sample()
+    wait_for(app, lambda: samples, timeout)
+    probe.stats_ready.disconnect(samples.append)
+    return samples[0] if samples else None
+
+
+def press_shortcut(widget, key):
+    """Type Ctrl+Shift+key into widget the way a user would"""
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtCore import Qt
+    QTest.keyClick(widget, key, Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier)
+
+
+def check_shortcuts(app, window):
+    """Press the game shortcuts where typed keys go, the game view's focus proxy,
+    and return which of them took effect"""
+    from PyQt6.QtCore import Qt
+    game_view = window.game_view
+    target = game_view.focusProxy() or game_view
+    overlay = game_view.frame_overlay
+    press_shortcut(target, Qt.Key.Key_F)
+    shown = overlay.isVisible()
+    press_shortcut(target, Qt.Key.Key_F)
+    probe = game_view.input_probe
+    press_shortcut(target, Qt.Key.Key_L)
+    started = probe.active
+    press_shortcut(target, Qt.Key.Key_L)
+    stopped = wait_for(app, lambda: not probe.active, 5) is not None
+    return {"frame_overlay": shown and not overlay.isVisible(), "input_latency": started and stopped}
+
+
+def measure_input_latency(app, window, timeout, zooms=(1.0, 1.5)):
+    """Send synthetic key presses to the game at each zoom level and collect the
+    input-to-screen latency report for each"""
+    game_view = window.game_view
+    probe = game_view.input_probe
+    zoom_factor = game_view.zoom_factor
+    results = {}
+    for zoom in zooms:
+        game_view.setZoomFactor(zoom)
+        reports = []
+        probe.report_ready.connect(reports.append)
+        probe.run_synthetic(count=40, interval_ms=50)
+        wait_for(app, lambda: reports, timeout)
+        probe.report_ready.disconnect(reports.append)
+        probe.stop()
+        results[f"zoom_{zoom * 100:.0f}"] = reports[0] if reports else None
+    game_view.setZoomFactor(zoom_factor)
+    return results
+
+
+def measure_frame_pacing(app, window, url, title, timeout):
+    """Open a tool tab and go back to the game in each view mode, collecting the
+    game's frame pacing report for both switches"""
+    probe = window.frame_probe
+
+    def switch(action):
+        reports_before = len(probe.reports)
+        action()
+        if wait_for(app, lambda: len(probe.reports) > reports_before, timeout) is None:
+            return None
+        return probe.reports[-1][1]
+
+    # Start from the game tab with no report still pending
+    if window.tab_widget.currentIndex() != 0:
+        switch(lambda: window.tab_widget.setCurrentIndex(0))
+
+    results = {}
+    for mode in ("tabs", "split", "pip"):
+        window.set_tool_view_mode(mode)
+        results[mode] = {
+            "to_tool": switch(lambda: window.open_browser_tab(url, title)),
+            "to_game": switch(lambda: window.tab_widget.setCurrentIndex(0)),
+        }
+    window.set_tool_view_mode("tabs")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--workdir", required=True, help="holds config.json and web caches")
+    parser.add_argument("--tools", default="Quest Help,Skills Calculator")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--ram-cache", action="store_true", help="keep web caches in tmpfs")
+    args = parser.parse_args()
+
+    # Keep the user's config and caches untouched
+    os.makedirs(args.workdir, exist_ok=True)
+    os.chdir(args.workdir)
+    import config
+    config.set_config_value("cache_root", args.workdir)
+    config.set_config_value("window_geometry", [50, 50, 1280, 720])
+    config.set_config_value("ram_cache", args.ram_cache)
+
+    import url_schemes
+    url_schemes.register_all()
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    startup_timing.mark("app_created")
+
+    from main_window import MainWindow
+    from procstats import read_rss_bytes
+    from stand_in import TOOL_SLUGS
+
+    window = MainWindow(game_url=f"{args.base_url}/serverlist")
+    window.show()
+    startup_timing.mark("window_shown")
+
+    results = {"errors": []}
+    if wait_for(app, lambda: "game_loaded" in startup_timing.get_marks(), args.timeout) is None:
+        results["errors"].append("game view did not finish loading")
+    results["startup_ms"] = startup_timing.get_marks()
+
+    # Tool open latency, window vs tab
+    tool_memory = {}
+    results["tool_open_ms"] = {}
+    for title in [t.strip() for t in args.tools.split(",") if t.strip()]:
+        url = f"{args.base_url}/tools/{TOOL_SLUGS.get(title, 'forums')}"
+        entry = {}
+        for mode, external in (("window", True), ("tab", False)):
+            measured = measure_tool_open(app, window, url, title, external, args.timeout)
+            entry[mode] = measured["ms"]
+            if not measured["ok"]:
+                results["errors"].append(f"{title} ({mode}) did not load")
+            if "rss" in measured:
+                tool_memory[f"{title} ({mode})"] = measured["rss"]
+        results["tool_open_ms"][title] = entry
+
+    # Warm view pool effectiveness
+    if window.game_view is not None:
+        import view_pool
+        results["view_pool"] = view_pool.get_pool().get_stats()
+
+    # Game frame pacing with the game tab in front, then around tab switches in each view mode
+    if window.frame_probe is not None:
+        results["frame_stats"] = measure_frame_stats(app, window, args.timeout)
+        results["shortcuts"] = check_shortcuts(app, window)
+        for name, worked in results["shortcuts"].items():
+            if not worked:
+                results["errors"].append(f"{name} shortcut had no effect in the game view")
+        results["input_latency"] = measure_input_latency(app, window, args.timeout)
+        first_tool = [t.strip() for t in args.tools.split(",") if t.strip()][0]
+        results["frame_pacing"] = measure_frame_pacing(
+            app, window, f"{args.base_url}/tools/{TOOL_SLUGS.get(first_tool, 'forums')}",
+            first_tool, args.timeout)
+
+    # Per-page renderer memory
+    results["memory_bytes"] = dict(tool_memory)
+    if window.game_view is not None:
+        results["memory_bytes"]["game"] = read_rss_bytes(window.game_view.page().renderProcessPid())
+
+    # Cost of zoom and splitter handling on the GUI thread
+    results["handler_us"] = {}
+    if window.game_view is not None:
+        game_view = window.game_view
+        results["handler_us"]["zoom_in_out"] = time_calls(
+            lambda: (game_view.zoom_in(), game_view.zoom_out()), args.iterations) / 2
+    results["handler_us"]["splitter_moved"] = time_calls(
+        lambda: window.on_splitter_moved(0, 1), args.iterations)
+
+    # Storage I/O of the kit and its Chromium processes, before and after the exit snapshot
+    import ram_cache
+    from procstats import read_tree_io_bytes
+    read_bytes, written_bytes = read_tree_io_bytes(os.getpid())
+    results["disk_io_bytes"] = {"read": read_bytes, "written": written_bytes}
+    window.close()
+    ram = ram_cache.get_active()
+    if ram is not None:
+        # Same order as main(): the final snapshot waits for the web engine to shut down
+        import profiles
+        from PyQt6 import sip
+        profiles.close_all()
+        sip.delete(app)
+        ram.close()
+    read_bytes, written_bytes = read_tree_io_bytes(os.getpid())
+    results["disk_io_bytes"]["written_after_close"] = written_bytes
+    if ram is not None:
+        results["ram_cache"] = ram.get_stats()
+    config.flush_config()
+    print(RESULT_PREFIX + json.dumps(results))
+    return 0 if not results["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# benchmarks/blocklist_check.py
+"""Checks the tool-page blocklist matcher, without Qt.
+
+Verifies host-suffix and path-prefix rules against the default blocklist,
+then times lookups against a large synthetic list to show the cost follows
+the URL length rather than the number of rules.
+
+Usage: python benchmarks/blocklist_check.py
+"""
+import sys
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+from config import DEFAULT_CONFIG  # noqa: E402
+from url_matcher import HostPathMatcher  # noqa: E402
+
+LOOKUPS = 100000
+
+
+def time_lookups(matcher, urls):
+    start = time.perf_counter()
+    for _ in range(LOOKUPS // len(urls)):
+        for host, path in urls:
+            matcher.matches(host, path)
+    return (time.perf_counter() - start) * 1e9 / LOOKUPS
+
+
+def main():
+    matcher = HostPathMatcher(DEFAULT_CONFIG["blocklist"])
+    expect(matcher.matches("www.google-analytics.com", "/analytics.js"), "subdomain of a blocked host")
+    expect(matcher.matches("doubleclick.net", "/"), "blocked host itself")
+    expect(not matcher.matches("notdoubleclick.net", "/"), "label boundary respected")
+    expect(matcher.matches("www.youtube.com", "/embed/abc"), "path prefix rule on a subdomain")
+    expect(not matcher.matches("www.youtube.com", "/watch?v=abc"), "other paths on a path-rule host")
+    expect(not matcher.matches("lostcity.rs", "/t/some-thread"), "tool sites themselves pass")
+
+    urls = [
+        ("lostcity.rs", "/t/some-thread/1234"),
+        ("www.google-analytics.com", "/g/collect"),
+        ("cdn.jsdelivr.net", "/npm/jquery@3/dist/jquery.min.js"),
+        ("www.youtube.com", "/embed/dQw4w9WgXcQ"),
+    ]
+    small_ns = time_lookups(matcher, urls)
+    large = HostPathMatcher(DEFAULT_CONFIG["blocklist"]
+                            + [f"tracker{i}.example{i % 97}.com" for i in range(20000)]
+                            + [f"cdn{i}.net/ads/{i}/" for i in range(20000)])
+    large_ns = time_lookups(large, urls)
+    print(f"   {matcher.rule_count} rules: {small_ns:.0f} ns/lookup")
+    print(f"   {large.rule_count} rules: {large_ns:.0f} ns/lookup")
+    expect(large_ns < small_ns * 3, "lookup cost independent of blocklist size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# benchmarks/checks.py
+"""Shared setup for the standalone check scripts: puts the kit and the
+benchmarks folder on the import path and provides expect().
+
+Import it first in a check script: `from checks import expect`.
+"""
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+for path in (BENCH_DIR, ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def expect(condition, message):
+    """Print a check's outcome; the first failure ends the script with exit code 1"""
+    if not condition:
+        print(f"❌ {message}")
+        sys.exit(1)
+    print(f"✅ {message}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# benchmarks/game_assets_check.py
+"""Checks the versioned game-asset store: first warm, warm start after each
+asset's own check, integrity repair, a client update (never served stale),
+pruning of old versions, and an offline start served from disk.
+
+Serves a fake client (a script and a WebAssembly file) from a local HTTP
+server and drives game_assets.warm() against it. Needs no web engine.
+
+Usage: python benchmarks/game_assets_check.py
+"""
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+import game_assets  # noqa: E402
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write(path, data, mtime=None):
+    with open(path, "wb") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def open_store(root, urls):
+    """Open the store like a new launch would, with the game having requested urls"""
+    store = game_assets.GameAssetStore(root)
+    for url in urls:
+        store.record_seen(url)
+    return store
+
+
+def serve_all(store, urls, wait=True):
+    """Look every asset up like the scheme handler does, waiting for each one's
+    check unless wait is False; returns (served, bytes, ms)"""
+    start = time.perf_counter()
+    served = total = 0
+    for url in urls:
+        if wait:
+            store.check(url).result()
+        found = store.lookup(url)
+        if found is not None:
+            with open(found[0], "rb") as f:
+                total += len(f.read())
+            served += 1
+    return served, total, (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="2004kit-assets-") as workdir:
+        site = os.path.join(workdir, "site")
+        os.makedirs(site)
+        write(os.path.join(site, "client.js"), b"console.log('client v1');" * 200, mtime=1_000_000)
+        write(os.path.join(site, "game.wasm"), os.urandom(2 * 1024 * 1024), mtime=1_000_000)
+
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(QuietHandler, directory=site))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/client.js", f"{base}/game.wasm"]
+        root = os.path.join(workdir, "game_assets")
+
+        try:
+            # First run: nothing stored, the game's requests get recorded, warm downloads them
+            store = open_store(root, urls)
+            expect(store.version is None, "first launch starts with no stored client")
+            v1 = game_assets.warm(store, keep=1)
+            expect(v1 is not None, f"first warm stored client version {v1}")
+
+            # Next launch serves each asset from disk once that asset is checked
+            store = open_store(root, urls)
+            expect(serve_all(store, urls, wait=False)[0] == 0, "nothing served from disk before its check")
+            store.check(urls[0]).result()
+            expect(store.lookup(urls[0]) is not None and store.lookup(urls[1]) is None,
+                   "an asset is served as soon as its own check is done")
+            start = time.perf_counter()
+            expect(store.validate() == (len(urls), 0),
+                   f"remaining stored assets validated in {(time.perf_counter() - start) * 1000:.1f} ms")
+            served, total, elapsed_ms = serve_all(store, urls)
+            expect(store.version == v1 and served == len(urls),
+                   f"warm start serves {served} assets ({total // 1024} KB) from disk in {elapsed_ms:.1f} ms")
+            expect(game_assets.warm(store, keep=1) == v1, "unchanged client is not downloaded again")
+
+            # A damaged file is caught by the integrity check and repaired
+            manifest = store.load_manifest(v1)
+            wasm_file = manifest["assets"][urls[1]]["file"]
+            write(os.path.join(store.get_version_dir(v1), wasm_file), b"corrupt")
+            expect(store.verify(v1) == [urls[1]], "integrity check finds the damaged asset")
+            damaged = open_store(root, urls)
+            damaged.validate()
+            expect(damaged.has(urls[0]) and not damaged.has(urls[1]), "damaged asset not served")
+            game_assets.warm(store, keep=1)
+            expect(store.verify(v1) == [], "warm repairs the damaged asset")
+
+            # A client update makes a new version, reusing what didn't change
+            write(os.path.join(site, "client.js"), b"console.log('client v2');" * 300, mtime=2_000_000)
+            store = open_store(root, urls)
+            store.validate()
+            expect(store.lookup(urls[0]) is None and store.lookup(urls[1]) is not None,
+                   "updated client.js loads from the network; unchanged game.wasm from disk")
+            v2 = game_assets.warm(store, keep=1)
+            expect(v2 not in (None, v1), f"client update detected as version {v2}")
+            expect(os.path.isdir(store.get_version_dir(v1)),
+                   "version in use this session is kept until the next launch")
+            store = open_store(root, urls)
+            expect(store.version == v2, "next launch uses the new version")
+            game_assets.warm(store, keep=1)
+            expect(not os.path.isdir(store.get_version_dir(v1)), "old version pruned")
+
+            # Offline, the server can't be asked, so the stored copies are served as they are
+            server.shutdown()
+            server.server_close()
+            store = open_store(root, urls)
+            served, total, elapsed_ms = serve_all(store, urls)
+            expect(served == len(urls),
+                   f"offline start serves {served} assets ({total // 1024} KB) from disk in {elapsed_ms:.1f} ms")
+        finally:
+            server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
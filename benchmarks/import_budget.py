@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# benchmarks/import_budget.py
+"""Import-time regression check for the kit's startup path.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, takes the
+best of several runs for each module and fails if any module's cumulative
+import time is over its budget, or if a module that must stay lazy (the web
+engine and everything that pulls it in) is imported at startup.
+
+Usage: python benchmarks/import_budget.py [--runs N] [--scale FACTOR] [--json PATH]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget per module, in milliseconds
+BUDGETS_MS = {
+    "main": 150,
+    "main_window": 40,
+    "right_panel": 30,
+    "performance_panel": 15,
+    "memory_watchdog": 15,
+    "lifecycle": 10,
+    "procstats": 5,
+    "config": 20,
+    "styles": 5,
+    "startup_timing": 5,
+    "performance_presets": 5,
+    "tool_manifest": 5,
+    "single_instance": 60,
+}
+
+# Modules that `import main` must not pull in. main() itself loads QtWebEngineCore
+# to register the URL schemes before QApplication exists; that cost shows in the
+# app_created startup phase, not here.
+LAZY_MODULES = [
+    "PyQt6.QtWebEngineCore",
+    "PyQt6.QtWebEngineWidgets",
+    "game_view",
+    "profiles",
+    "view_pool",
+    "prefetch",
+    "offline_scheme",
+    "map_scheme",
+    "request_blocker",
+    "game_asset_scheme",
+]
+
+
+def measure_once(target="main"):
+    """Return module -> cumulative import time (ms) for one fresh interpreter"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # header line
+    return times
+
+
+def measure(runs=3, target="main"):
+    """Return module -> best cumulative import time (ms) over several runs"""
+    best = {}
+    for _ in range(runs):
+        for name, ms in measure_once(target).items():
+            best[name] = min(ms, best.get(name, ms))
+    return best
+
+
+def check(times, scale=1.0):
+    """Return a list of human-readable budget violations"""
+    failures = []
+    for name in LAZY_MODULES:
+        if name in times:
+            failures.append(f"{name} is imported at startup but must be loaded lazily")
+    for name, budget in BUDGETS_MS.items():
+        limit = budget * scale
+        if name in times and times[name] > limit:
+            failures.append(f"{name}: {times[name]:.1f} ms > budget {limit:.1f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to sample")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, for slow CI machines")
+    parser.add_argument("--json", help="write the measured times to this file")
+    args = parser.parse_args()
+
+    times = measure(args.runs)
+    for name in BUDGETS_MS:
+        if name in times:
+            print(f"{name:20s} {times[name]:8.1f} ms  (budget {BUDGETS_MS[name] * args.scale:.0f} ms)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({name: times[name] for name in BUDGETS_MS if name in times}, f, indent=4)
+
+    failures = check(times, args.scale)
+    if failures:
+        print("\n❌ Import budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✅ Import budget OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# benchmarks/input_latency_check.py
+"""Checks how input latency measurements are matched and reported: Qt events
+paired with the page's records, coalesced wheel events, input the page never
+saw, and the latency histogram.
+
+Feeds made-up timestamps to input_latency's matching functions, so it needs
+no web engine.
+
+Usage: python benchmarks/input_latency_check.py
+"""
+import sys
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+import input_latency  # noqa: E402
+
+
+def record(kind, event_ms, painted_ms):
+    return {"kind": kind, "event_ms": event_ms, "handled_ms": event_ms + 0.2, "painted_ms": painted_ms}
+
+
+def main():
+    # Two key presses, three wheel steps merged into one DOM event, a swallowed click
+    qt_events = [("keydown", 1000.0), ("wheel", 1100.0), ("wheel", 1104.0), ("wheel", 1108.0),
+                 ("mousedown", 1200.0), ("keydown", 1300.0)]
+    page_events = [record("keydown", 1003.0, 1020.0), record("wheel", 1110.0, 1130.0),
+                   record("keydown", 1302.5, 1333.0), {"kind": "keydown", "event_ms": 1400.0}]
+    matches = input_latency.match_events(qt_events, page_events)
+
+    expect(len(matches) == 3, "key presses and the coalesced wheel event matched; unpainted record skipped")
+    wheel = [m for m in matches if m[0] == "wheel"][0]
+    expect(wheel[1] == 1100.0, "coalesced wheel latency counts from the first Qt wheel event")
+    expect(qt_events == [("mousedown", 1200.0)], "unmatched click kept while it could still arrive")
+
+    input_latency.match_events(qt_events, [record("keydown", 1800.0, 1810.0)])
+    expect(qt_events == [], "input the page never saw is dropped after MAX_MATCH_MS")
+
+    report = input_latency.build_report(matches, "check")
+    expect(report["total"]["count"] == 3 and report["total"]["max_ms"] == 33.0,
+           f"total latency p50 {report['total']['p50_ms']:.1f} ms, max {report['total']['max_ms']:.1f} ms")
+    expect(report["qt_to_page"]["p50_ms"] == 3.0 and report["page_to_paint"]["p50_ms"] == 20.0,
+           "latency split into Qt→page and page→paint")
+    histogram = dict(report["histogram"])
+    expect(histogram["16-25 ms"] == 1 and histogram["25-33 ms"] == 1 and histogram["33-50 ms"] == 1
+           and sum(histogram.values()) == 3, "histogram buckets hold every matched event")
+    print(input_latency.format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
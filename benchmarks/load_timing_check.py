@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# benchmarks/load_timing_check.py
+"""Checks the page load timing log: appends only queue work for the writer
+thread, the log stays under its size cap while rotating, survives a torn last
+line, and summarizes loads per page with the slowest first.
+
+Writes made-up records to a temporary folder, so it needs no web engine.
+
+Usage: python benchmarks/load_timing_check.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+import load_timing  # noqa: E402
+
+MAX_BYTES = 16 * 1024
+
+
+def make_record(page, load_ms, first=False, cached=0, fetched=10, ok=True):
+    return {"time": time.time(), "page": page, "url": "https://example.invalid/", "ok": ok,
+            "first": first, "background": False, "ttfb_ms": load_ms / 4, "dom_content_loaded_ms": load_ms / 2,
+            "load_ms": load_ms, "transfer_bytes": 200 * 1024, "cached": cached, "revalidated": 0,
+            "fetched": fetched, "opaque": 0}
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="2004kit-timing-") as workdir:
+        log = load_timing.TimingLog(os.path.join(workdir, load_timing.LOG_FILE), MAX_BYTES)
+
+        start = time.perf_counter()
+        for i in range(500):
+            log.append(make_record("Game", 900 + i % 7, first=i == 0, cached=8, fetched=2))
+            log.append(make_record("Forums", 2500 + i % 11, first=i == 0, cached=0, fetched=10))
+        elapsed_us = (time.perf_counter() - start) / 1000 * 1e6
+        log.flush()
+        total = sum(os.path.getsize(p) for p in (log.path, log.get_rotated_path()))
+        expect(total <= 2 * MAX_BYTES and os.path.getsize(log.path) <= MAX_BYTES,
+               f"1000 appends kept the log at {total // 1024} KB (cap {MAX_BYTES // 1024} KB per file), "
+               f"{elapsed_us:.0f} µs per append")
+
+        with open(log.path, "a") as f:
+            f.write('{"page": "Game", "lo')  # Crash mid-write
+        records = log.read()
+        expect(records and all("page" in r for r in records), f"torn line skipped, {len(records)} records read")
+        expect("12 KB" in load_timing.format_record(dict(make_record("Game", 900), transfer_bytes=12345.0)),
+               "transfer size from JS floats printed as whole KB")
+
+        summary = load_timing.summarize(records + [make_record("Forums", 0, ok=False)])
+        expect([s["page"] for s in summary] == ["Forums", "Game"], "slowest page listed first")
+        forums, game = summary
+        expect(forums["failed"] == 1 and forums["cache_hit_ratio"] == 0.0,
+               f"Forums: p50 {forums['load_p50_ms']:.0f} ms, 1 failed load, no cache hits")
+        expect(abs(game["cache_hit_ratio"] - 0.8) < 1e-9 and 900 <= game["load_p50_ms"] <= 906,
+               f"Game: p50 {game['load_p50_ms']:.0f} ms, {game['cache_hit_ratio'] * 100:.0f}% cache hits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
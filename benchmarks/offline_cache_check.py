@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# benchmarks/offline_cache_check.py
+"""Exercises the offline tool cache against the local stand-in, without Qt.
+
+Checks a cold fetch, a warm hit, keep-alive reuse across cache misses,
+bounded background revalidation of stale entries, serving the cached copy once the
+network is gone, and LRU eviction under the size cap. Prints timings and exits non-zero on the first wrong behaviour.
+
+Usage: python benchmarks/offline_cache_check.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+from content_store import ContentStore, CachingFetcher, REVALIDATE_WORKERS  # noqa: E402
+from stand_in import StandInServer, TOOL_SLUGS  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    server = StandInServer().start()
+    url = server.tool_url("Quest Help")
+    try:
+        with tempfile.TemporaryDirectory(prefix="2004kit-offline-") as root:
+            store = ContentStore(root, 50 * 1024 * 1024)
+            fetcher = CachingFetcher(store, ttl=3600, timeout=5)
+
+            result, cold_ms = timed(fetcher.fetch, url)
+            expect(result.source == "network" and result.body, f"cold fetch from network ({cold_ms:.1f} ms)")
+
+            served_before = server.get_counters()["requests"]
+            result, warm_ms = timed(fetcher.fetch, url)
+            expect(result.source == "cache" and server.get_counters()["requests"] == served_before,
+                   f"warm fetch served from store without network ({warm_ms:.1f} ms)")
+
+            # Cache misses on one host share a keep-alive connection
+            opened_before = server.get_counters()["connections"]
+            for name in ("Forums", "Highscores", "Market Prices"):
+                fetcher.fetch(server.tool_url(name))
+            opened = server.get_counters()["connections"] - opened_before
+            expect(opened == 0, f"3 more cache misses opened {opened} new connections")
+
+            # Stale entries are served immediately and refreshed with a conditional request
+            fetcher.ttl = 0
+            result, stale_ms = timed(fetcher.fetch, url)
+            expect(result.source == "stale" and result.body, f"stale entry served immediately ({stale_ms:.1f} ms)")
+            deadline = time.time() + 5
+            while fetcher._revalidating and time.time() < deadline:
+                time.sleep(0.01)
+            expect(not fetcher._revalidating, "background revalidation finished")
+            for name in ("Forums", "Highscores", "Market Prices"):
+                fetcher.fetch(server.tool_url(name))
+            workers = [t for t in threading.enumerate() if t.name.startswith("CacheRevalidate")]
+            expect(len(workers) <= REVALIDATE_WORKERS,
+                   f"{len(workers)} revalidation threads for 4 stale pages")
+            while fetcher._revalidating and time.time() < deadline + 5:
+                time.sleep(0.01)
+
+            # Network gone: the cached copy still loads
+            server.stop()
+            result, offline_ms = timed(fetcher.fetch, url)
+            expect(result.body is not None, f"cached copy served while offline ({offline_ms:.1f} ms)")
+            result = fetcher.fetch(server.tool_url("Bestiary"))
+            expect(result.body is None and result.source == "offline", "uncached page fails cleanly offline")
+            server = None
+
+        # LRU eviction under a small cap
+        with tempfile.TemporaryDirectory(prefix="2004kit-offline-") as root:
+            server = StandInServer().start()
+            url = server.tool_url("Quest Help")
+            page_size = len(CachingFetcher(ContentStore(root, 1 << 30)).fetch(url).body)
+            store = ContentStore(os.path.join(root, "small"), page_size * 2)
+            fetcher = CachingFetcher(store)
+            for name in list(TOOL_SLUGS)[:4]:
+                fetcher.fetch(server.tool_url(name))
+            stats = store.get_stats()
+            expect(stats["bytes"] <= page_size * 2, f"store stays under its cap ({stats})")
+            expect(server.tool_url("Forums") not in store.entries, "least recently used entry evicted")
+    finally:
+        if server is not None:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
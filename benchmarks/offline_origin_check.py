@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# benchmarks/offline_origin_check.py
+"""Checks what a tool page sees when it is served from the offline cache: its
+origin is kitcache://host rather than https://host, same-origin fetch() still
+reaches the cache, and whether cookies and localStorage work there.
+
+Pages are put in a temporary content store up front, so no network is needed.
+Needs QtWebEngine; prints a notice and exits 0 where it can't load.
+
+Usage: python benchmarks/offline_origin_check.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+
+HOST = "tools.kit.invalid"
+PAGE = """<!DOCTYPE html>
+<html><body><script>
+window.__origin = {origin: location.origin, secure: window.isSecureContext};
+try { document.cookie = "kit=1"; window.__origin.cookies = document.cookie.indexOf("kit=1") >= 0; }
+catch (e) { window.__origin.cookies = false; }
+try { localStorage.setItem("kit", "1"); window.__origin.storage = localStorage.getItem("kit") === "1"; }
+catch (e) { window.__origin.storage = false; }
+fetch("/data.json").then(function(r) { return r.json(); })
+    .then(function(data) { window.__origin.fetched = data.ok === true; })
+    .catch(function(e) { window.__origin.fetched = String(e); });
+</script></body></html>
+"""
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        import url_schemes
+        url_schemes.register_all()
+        from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+    except ImportError as e:
+        print(f"⚠️ QtWebEngine is not available, skipping: {e}")
+        return 0
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QUrl
+    from content_store import ContentStore
+    import offline_scheme
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory(prefix="2004kit-origin-") as root:
+        store = ContentStore(os.path.join(root, "offline_cache"), 1 << 20)
+        store.put(f"https://{HOST}/page", PAGE.encode(), "text/html")
+        store.put(f"https://{HOST}/data.json", json.dumps({"ok": True}).encode(), "application/json")
+
+        profile = QWebEngineProfile(app)
+        handler = offline_scheme.install(profile, root)
+        page = QWebEnginePage(profile, app)
+        loaded = []
+        page.loadFinished.connect(loaded.append)
+        page.setUrl(QUrl(f"{offline_scheme.SCHEME.decode()}://{HOST}/page"))
+
+        result = {}
+        deadline = time.time() + 15
+        while time.time() < deadline and "fetched" not in result:
+            app.processEvents()
+            if loaded:
+                page.runJavaScript("window.__origin || {}", lambda value: result.update(value or {}))
+            time.sleep(0.01)
+
+        expect(loaded and loaded[0], "cached page loaded from the content store")
+        expect(result.get("origin") == f"kitcache://{HOST}",
+               f"page origin is {result.get('origin')}, not https://{HOST}")
+        expect(result.get("secure") is True, "kitcache pages are a secure context")
+        expect(result.get("fetched") is True, f"same-origin fetch() served from the cache ({result.get('fetched')})")
+        print(f"ℹ️ document.cookie {'works' if result.get('cookies') else 'is unavailable'}, "
+              f"localStorage {'works' if result.get('storage') else 'is unavailable'} on kitcache pages; "
+              f"either way they are kept apart from https://{HOST}")
+        handler.shutdown()
+        page.deleteLater()
+        app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
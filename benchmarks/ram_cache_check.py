@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# benchmarks/ram_cache_check.py
+"""Checks the RAM cache mode: restore into tmpfs, periodic snapshots back to
+disk that keep only the hot part of the caches and leave live storage alone, a
+final snapshot that writes storage whole, and the byte counters.
+
+Works on fake profile folders in a temporary cache root, so it needs no web
+engine. Skips itself on systems without a tmpfs folder.
+
+Usage: python benchmarks/ram_cache_check.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+import ram_cache  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def write(path, size, age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="2004kit-ram-") as disk_root:
+        ram_root = ram_cache.get_ram_root(disk_root)
+        if ram_root is None:
+            print("⚠️ No tmpfs folder on this system; RAM cache mode falls back to disk")
+            return 0
+
+        # A previous disk snapshot: cookies plus an old and a recent cache entry
+        write(os.path.join(disk_root, "web_storage", "Cookies"), 64 * 1024)
+        write(os.path.join(disk_root, "web_cache", "Cache_Data", "old_0"), 3 * MB, age=3600)
+        write(os.path.join(disk_root, "web_cache", "Cache_Data", "new_0"), 2 * MB, age=60)
+
+        cache = ram_cache.RamCache(disk_root, ram_root, max_bytes=4 * MB,
+                                   snapshot_bytes=3 * MB, interval=0)
+        try:
+            cache.restore()
+            ram_files = {rel for _, _, rel in ram_cache.list_files(ram_root)}
+            expect(os.path.join("web_storage", "Cookies") in ram_files, "storage restored into RAM")
+            expect(os.path.join("web_cache", "Cache_Data", "new_0") in ram_files
+                   and os.path.join("web_cache", "Cache_Data", "old_0") not in ram_files,
+                   f"cache restore kept the newest entries within the RAM ceiling "
+                   f"({cache.bytes_restored // 1024} KB)")
+            expect(cache.cap_cache_size("game", 512 * MB) == int(4 * MB * 0.6),
+                   "game HTTP cache capped to its share of the RAM ceiling")
+
+            # Chromium writes while running; a periodic snapshot copies cache changes back
+            write(os.path.join(ram_root, "web_storage", "Cookies"), 80 * 1024)
+            write(os.path.join(ram_root, "web_cache", "Cache_Data", "hot_0"), 2 * MB)
+            copied = cache.snapshot()
+            expect(os.path.getsize(os.path.join(disk_root, "web_storage", "Cookies")) == 64 * 1024,
+                   "periodic snapshot leaves storage in use alone")
+            expect(os.path.exists(os.path.join(disk_root, "web_cache", "Cache_Data", "hot_0"))
+                   and not os.path.exists(os.path.join(disk_root, "web_cache", "Cache_Data", "new_0")),
+                   "snapshot keeps only the hot cache subset on disk")
+            expect(copied == cache.get_stats()["snapshot_bytes"] and copied > 0,
+                   f"snapshot counted {copied // 1024} KB written in {cache.last_snapshot_ms:.1f} ms")
+            expect(cache.snapshot() == 0, "unchanged files are not copied again")
+
+            # Once the engine is down, the final snapshot writes storage whole
+            cache.close()
+            expect(os.path.getsize(os.path.join(disk_root, "web_storage", "Cookies")) == 80 * 1024,
+                   "final snapshot wrote updated storage to disk")
+        finally:
+            shutil.rmtree(ram_root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
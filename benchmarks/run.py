@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# benchmarks/run.py
+"""Headless, offline benchmark suite for the 2004Kit client shell.
+
+Starts the local stand-in, then launches the kit twice under
+QT_QPA_PLATFORM=offscreen against a fresh cache directory: once cold and once
+warm (same caches). Each run reports startup phase timings, time to the game
+view's loadFinished, tool open latency in a window and in a tab, game frame
+pacing around tab switches in each view mode, per-page renderer memory, disk
+bytes read and written (add --ram-cache to compare with tmpfs caches) and the
+cost of the zoom and splitter handlers. Results are written as JSON so two
+releases can be compared with --compare.
+
+Usage: python benchmarks/run.py [--output PATH] [--compare OLD.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(1, os.path.dirname(BENCH_DIR))
+
+from stand_in import StandInServer  # noqa: E402
+from app_probe import RESULT_PREFIX  # noqa: E402
+import import_budget  # noqa: E402
+import ram_cache  # noqa: E402
+
+
+def run_probe(base_url, workdir, timeout, ram_cache=False):
+    """Run the kit once and return its parsed result dict"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Software rendering keeps numbers comparable on machines without a GPU
+    env.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--disable-gpu")
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, "app_probe.py"),
+         "--base-url", base_url, "--workdir", workdir, "--timeout", str(timeout)]
+        + (["--ram-cache"] if ram_cache else []),
+        env=env, capture_output=True, text=True, timeout=timeout * 10,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            data = json.loads(line[len(RESULT_PREFIX):])
+            data["process_wall_ms"] = wall_ms
+            return data
+    raise RuntimeError(f"Probe produced no result (exit {result.returncode}):\n"
+                       f"{result.stdout}\n{result.stderr}")
+
+
+def flatten(data, prefix=""):
+    """Flatten nested result dicts into dotted keys with numeric values"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old, new):
+    """Print every metric that exists in both result files with its change"""
+    old_flat, new_flat = flatten(old["runs"]), flatten(new["runs"])
+    print(f"{'metric':60s} {'old':>12s} {'new':>12s} {'change':>8s}")
+    for name in sorted(set(old_flat) & set(new_flat)):
+        before, after = old_flat[name], new_flat[name]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{name:60s} {before:12.1f} {after:12.1f} {change:>8s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the 2004Kit benchmark suite")
+    parser.add_argument("--output", default=os.path.join(
+        BENCH_DIR, "results", time.strftime("%Y%m%d-%H%M%S") + ".json"))
+    parser.add_argument("--compare", help="previous results file to diff against")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--ram-cache", action="store_true",
+                        help="run with web caches in tmpfs to compare disk I/O")
+    args = parser.parse_args()
+
+    server = StandInServer().start()
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "runs": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="2004kit-bench-") as workdir:
+            for phase in ("cold", "warm"):
+                server.reset_counters()
+                print(f"Running {phase} start...")
+                run = run_probe(server.base_url, workdir, args.timeout, args.ram_cache)
+                run["network"] = server.get_counters()
+                results["runs"][phase] = run
+                for error in run.get("errors", []):
+                    print(f"  ⚠️ {error}")
+            # The RAM copy outlives the kit until reboot; don't leave one per benchmark run
+            ram_root = ram_cache.get_ram_root(os.path.abspath(workdir))
+            if ram_root:
+                shutil.rmtree(ram_root, ignore_errors=True)
+    finally:
+        server.stop()
+
+    results["runs"]["imports_ms"] = {
+        name: ms for name, ms in import_budget.measure().items() if name in import_budget.BUDGETS_MS
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(json.load(f), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# benchmarks/single_instance_check.py
+"""Checks that a second launch of the kit forwards its request and exits quickly.
+
+Runs a stand-in "first instance" (just the instance server, no web engine) in a
+child process, launches main.py against it with --tool, --url and no arguments,
+and times each launch. Finally kills the child to leave a stale socket behind
+and checks that a new instance can still claim the name.
+
+Usage: python benchmarks/single_instance_check.py
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from checks import ROOT, expect  # noqa: E402  (puts the kit on sys.path)
+
+# Interpreter start plus QtCore/QtNetwork import; the web engine must never load
+MAX_FORWARD_MS = 1500
+
+
+def serve():
+    """Child process: listen like a running kit and echo requests to stdout"""
+    from PyQt6.QtCore import QCoreApplication
+    import single_instance
+
+    app = QCoreApplication(sys.argv)
+    server = single_instance.InstanceServer(parent=app)
+    if not server.listen():
+        print("LISTEN_FAILED", flush=True)
+        return 1
+    server.request_received.connect(lambda request: print("REQUEST " + json.dumps(request), flush=True))
+    print("READY", flush=True)
+    return app.exec()
+
+
+def launch(workdir, *args):
+    """Run main.py like a user would; returns (exit code, wall ms, output)"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *args],
+                            cwd=workdir, env=env, capture_output=True, text=True, timeout=60)
+    return result.returncode, (time.perf_counter() - start) * 1000, result.stdout + result.stderr
+
+
+def read_request(child):
+    line = child.stdout.readline().strip()
+    return json.loads(line[len("REQUEST "):]) if line.startswith("REQUEST ") else None
+
+
+def main():
+    if "--serve" in sys.argv:
+        return serve()
+
+    with tempfile.TemporaryDirectory(prefix="2004kit-instance-") as workdir:
+        child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve"],
+                                 cwd=workdir, stdout=subprocess.PIPE, text=True)
+        try:
+            expect(child.stdout.readline().strip() == "READY", "first instance is listening")
+
+            cases = [
+                (["--tool", "Quest Help"], {"action": "open_tool", "tool": "Quest Help"}),
+                (["--url", "https://2004.losthq.rs/?p=questguides"],
+                 {"action": "open_url", "url": "https://2004.losthq.rs/?p=questguides"}),
+                ([], {"action": "focus"}),
+            ]
+            for args, expected in cases:
+                code, wall_ms, output = launch(workdir, *args)
+                expect(code == 0 and "forwarded" in output,
+                       f"second launch {args or '(no args)'} forwarded and exited ({wall_ms:.0f} ms)")
+                expect(wall_ms < MAX_FORWARD_MS, f"second launch finished within {MAX_FORWARD_MS} ms")
+                expect(read_request(child) == expected, f"running instance received {expected['action']}")
+        finally:
+            child.send_signal(signal.SIGKILL)
+            child.wait()
+
+        # The killed child leaves its socket file behind; a new kit must still start
+        from PyQt6.QtCore import QCoreApplication
+        import single_instance
+        os.chdir(workdir)
+        # The server's socket notifier needs a live application event dispatcher
+        app = QCoreApplication(sys.argv)
+        server = single_instance.InstanceServer(parent=app)
+        expect(server.listen(), "stale socket from a crashed instance is reclaimed")
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# benchmarks/stand_in.py
+"""Local HTTP stand-in for 2004.lostcity.rs and the tool sites.
+
+Serves a fake serverlist page that pulls a client script and a binary blob the
+size of a real client, plus one page per tool with a stylesheet, a script and
+a few images. Everything is generated deterministically so cold and warm runs
+download exactly the same bytes.
+
+Usage: python benchmarks/stand_in.py [--port PORT]
+"""
+import argparse
+import hashlib
+import socket
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# Sizes roughly matching the real client's assets
+CLIENT_JS_BYTES = 300 * 1024
+CLIENT_WASM_BYTES = 1024 * 1024
+TOOL_ASSET_BYTES = 40 * 1024
+TOOL_IMAGE_BYTES = 16 * 1024
+TOOL_IMAGE_COUNT = 4
+
+# Tool slugs used by the benchmark, one per built-in tool in tool_manifest.DEFAULT_TOOLS
+TOOL_SLUGS = {
+    "Forums": "forums",
+    "Clue Coordinates": "clue-coordinates",
+    "Clue Scroll Help": "clue-scroll-help",
+    "World Map": "worldmap",
+    "Highscores": "hiscores",
+    "Market Prices": "markets",
+    "Quest Help": "questguides",
+    "Skill Guides": "skillguides",
+    "Skills Calculator": "calculators",
+    "Bestiary": "droptables",
+}
+
+
+def filler(seed, size, text=True):
+    """Return size deterministic bytes derived from seed"""
+    chunks = []
+    total = 0
+    counter = 0
+    while total < size:
+        digest = hashlib.sha256(f"{seed}:{counter}".encode()).hexdigest()
+        chunk = digest.encode() if text else bytes.fromhex(digest)
+        chunks.append(chunk)
+        total += len(chunk)
+        counter += 1
+    return b"".join(chunks)[:size]
+
+
+GAME_PAGE = b"""<!DOCTYPE html>
+<html><head><title>2004Scape Stand-in</title></head>
+<body style="margin:0;background:#000">
+<canvas id="canvas" width="789" height="532"></canvas>
+<script src="/client/client.js"></script>
+<script>
+fetch('/client/client.wasm').then(function(r) { return r.arrayBuffer(); }).then(function(buf) {
+    var ctx = document.getElementById('canvas').getContext('2d');
+    var frame = 0;
+    function draw() {
+        frame++;
+        ctx.fillStyle = 'rgb(' + (frame % 255) + ',40,40)';
+        ctx.fillRect(0, 0, 789, 532);
+        requestAnimationFrame(draw);
+    }
+    draw();
+    document.title = '2004Scape Stand-in (' + buf.byteLength + ' bytes)';
+});
+</script>
+</body></html>
+"""
+
+
+def tool_page(slug):
+    images = "".join(f'<img src="/tools/{slug}/img{i}.png" width="64" height="64">'
+                     for i in range(TOOL_IMAGE_COUNT))
+    return f"""<!DOCTYPE html>
+<html><head><title>{slug}</title>
+<link rel="stylesheet" href="/tools/{slug}/style.css">
+<script src="/tools/{slug}/app.js"></script>
+</head>
+<body><h1>{slug}</h1>{images}<p>{'Guide text. ' * 400}</p></body></html>
+""".encode()
+
+
+def build_routes():
+    """Return path -> (content type, body) for every served resource"""
+    client_js = b"var CLIENT = '" + filler("client.js", CLIENT_JS_BYTES - 20) + b"';\n"
+    routes = {
+        "/serverlist": ("text/html", GAME_PAGE),
+        "/client/client.js": ("application/javascript", client_js),
+        "/client/client.wasm": ("application/wasm", filler("client.wasm", CLIENT_WASM_BYTES, text=False)),
+    }
+    for slug in TOOL_SLUGS.values():
+        routes[f"/tools/{slug}"] = ("text/html", tool_page(slug))
+        routes[f"/tools/{slug}/style.css"] = (
+            "text/css", b"/* " + filler(slug + ".css", TOOL_ASSET_BYTES) + b" */\nbody{color:#333}\n")
+        routes[f"/tools/{slug}/app.js"] = (
+            "application/javascript", b"// " + filler(slug + ".js", TOOL_ASSET_BYTES) + b"\n")
+        for i in range(TOOL_IMAGE_COUNT):
+            routes[f"/tools/{slug}/img{i}.png"] = (
+                "image/png", filler(f"{slug}{i}.png", TOOL_IMAGE_BYTES, text=False))
+    return routes
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real sites
+    protocol_version = "HTTP/1.1"
+    routes = {}
+    bytes_served = 0
+    requests_served = 0
+    connections_opened = 0
+    open_sockets = set()
+    counter_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInHandler.counter_lock:
+            StandInHandler.connections_opened += 1
+            StandInHandler.open_sockets.add(self.connection)
+
+    def finish(self):
+        with StandInHandler.counter_lock:
+            StandInHandler.open_sockets.discard(self.connection)
+        super().finish()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        route = self.routes.get(path)
+        if route is None:
+            self.send_error(404)
+            return
+
+        content_type, body = route
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+        with StandInHandler.counter_lock:
+            StandInHandler.bytes_served += len(body)
+            StandInHandler.requests_served += 1
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)  # Dropped keep-alive connections are normal
+
+
+class StandInServer:
+    """Runs the stand-in on a background thread"""
+
+    def __init__(self, port=0):
+        StandInHandler.routes = build_routes()
+        self.httpd = StandInHTTPServer(("127.0.0.1", port), StandInHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def game_url(self):
+        return f"{self.base_url}/serverlist"
+
+    def tool_url(self, name):
+        return f"{self.base_url}/tools/{TOOL_SLUGS.get(name, 'forums')}"
+
+    def get_counters(self):
+        with StandInHandler.counter_lock:
+            return {"bytes": StandInHandler.bytes_served,
+                    "requests": StandInHandler.requests_served,
+                    "connections": StandInHandler.connections_opened}
+
+    def reset_counters(self):
+        with StandInHandler.counter_lock:
+            StandInHandler.bytes_served = 0
+            StandInHandler.requests_served = 0
+            StandInHandler.connections_opened = 0
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        # Drop idle keep-alive connections too, so the network is really gone
+        with StandInHandler.counter_lock:
+            sockets = list(StandInHandler.open_sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the 2004Kit benchmark stand-in")
+    parser.add_argument("--port", type=int, default=8004)
+    args = parser.parse_args()
+    server = StandInServer(args.port)
+    print(f"Serving stand-in on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
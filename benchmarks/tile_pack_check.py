@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# benchmarks/tile_pack_check.py
+"""Checks the World Map tile pack: tiles survive reopening, lookups aren't held
+up by a flush, and a pack cut off in the middle of a flush (in the new tile
+bodies or the new index) reopens with every tile from the flush before it.
+
+Writes made-up tiles to a temporary folder, so it needs no web engine.
+
+Usage: python benchmarks/tile_pack_check.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+import tile_pack  # noqa: E402
+
+
+def make_tile(n):
+    # Some bodies hold the footer's magic bytes, which must not pass for a footer
+    return (tile_pack.MAGIC if n % 5 == 0 else b"") + os.urandom(2048 + n)
+
+
+def put_tiles(pack, tiles, numbers):
+    for n in numbers:
+        tiles[f"z2/{n}.png"] = make_tile(n)
+        pack.put(f"z2/{n}.png", tiles[f"z2/{n}.png"], "image/png")
+
+
+def all_readable(pack, tiles):
+    return all(pack.read(key) == (body, "image/png") for key, body in tiles.items())
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="2004kit-tiles-") as workdir:
+        path = os.path.join(workdir, "world_map.pack")
+        pack = tile_pack.TilePack(path)
+        tiles = {}
+        put_tiles(pack, tiles, range(0, 50))
+        pack.flush()
+        put_tiles(pack, tiles, range(50, 100))
+        pack.flush()
+        complete_size = os.path.getsize(path)
+        expect(all_readable(tile_pack.TilePack(path), tiles), f"{len(tiles)} tiles read back after reopening")
+
+        # Lookups from the GUI thread while a large flush is written
+        big = tile_pack.TilePack(os.path.join(workdir, "big.pack"))
+        for n in range(1000):
+            big.put(f"z3/{n}.png", os.urandom(64 * 1024), "image/png")
+        flush_thread = threading.Thread(target=big.flush)
+        start = time.perf_counter()
+        flush_thread.start()
+        slowest = 0
+        while flush_thread.is_alive():
+            lookup_start = time.perf_counter()
+            big.locate("z3/500.png")
+            slowest = max(slowest, time.perf_counter() - lookup_start)
+        flush_ms = (time.perf_counter() - start) * 1000
+        expect(slowest * 1000 < max(5, flush_ms / 4) and big.get_stats()["pending"] == 0,
+               f"slowest lookup {slowest * 1000:.2f} ms during a {flush_ms:.0f} ms flush of 64 MB")
+
+        # Flushes cut short after part of the tile bodies, and after part of the index
+        for label, keep in (("tile bodies", 0.3), ("index", 0.97)):
+            pack = tile_pack.TilePack(path)
+            put_tiles(pack, dict(tiles), range(100, 130))
+            pack.flush()
+            with open(path, "r+b") as f:
+                f.truncate(complete_size + int((os.path.getsize(path) - complete_size) * keep))
+            reopened = tile_pack.TilePack(path)
+            expect(len(reopened) == len(tiles) and all_readable(reopened, tiles),
+                   f"pack cut off in the new {label} reopens with all {len(tiles)} earlier tiles")
+            expect(os.path.getsize(path) == complete_size and not os.path.exists(path + ".corrupt"),
+                   "unfinished write cut off, pack kept")
+
+        put_tiles(reopened, tiles, range(130, 140))
+        reopened.flush()
+        expect(all_readable(tile_pack.TilePack(path), tiles), "recovered pack takes new tiles")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# benchmarks/tool_list_check.py
+"""Checks that the tools list builds and repaints in about the same time for
+10 tools as for thousands of bookmarks.
+
+Builds a ToolListView over synthetic manifest entries of growing size, then
+times building the view, a full repaint, and filtering keystroke by keystroke.
+Needs no web engine.
+
+Usage: python benchmarks/tool_list_check.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from checks import expect  # noqa: E402  (puts the kit on sys.path)
+
+SIZES = [10, 100, 1000, 5000]
+REPEATS = 20
+
+# A repaint only touches visible rows, so the largest list may cost this much
+# more than the smallest (plus a little slack for timer noise)
+MAX_REPAINT_RATIO = 3.0
+REPAINT_SLACK_MS = 2.0
+
+
+def make_tools(count):
+    import tool_manifest
+    tools = []
+    for i in range(count):
+        name = f"Bookmark {i:05d}"
+        entry = dict(tool_manifest.TOOL_DEFAULTS, id=tool_manifest.make_tool_id(name), name=name,
+                     url=f"https://example.com/{i}", icon="📖")
+        tools.append(tool_manifest.ToolSpec(entry))
+    return tools
+
+
+def measure(app, count):
+    """Return (build ms, repaint ms, per-keystroke filter ms) for a list of count tools"""
+    from tool_list import ToolListView
+
+    tools = make_tools(count)
+    start = time.perf_counter()
+    view = ToolListView(tools)
+    view.resize(250, 600)
+    view.show()
+    app.processEvents()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    view.viewport().grab()  # Warm the delegate's pixmap caches
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        view.viewport().grab()
+    repaint_ms = (time.perf_counter() - start) * 1000 / REPEATS
+
+    query = "bookmark 0012"
+    start = time.perf_counter()
+    for i in range(1, len(query) + 1):
+        view.set_filter(query[:i])
+        app.processEvents()
+    filter_ms = (time.perf_counter() - start) * 1000 / len(query)
+
+    visible = view.model().rowCount()
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return build_ms, repaint_ms, filter_ms, visible
+
+
+def main():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    results = {}
+    for count in SIZES:
+        build_ms, repaint_ms, filter_ms, visible = measure(app, count)
+        results[count] = repaint_ms
+        print(f"{count:5d} tools: build {build_ms:7.1f} ms  repaint {repaint_ms:6.2f} ms  "
+              f"filter {filter_ms:6.2f} ms/key  ({visible} match)")
+
+    smallest, largest = results[SIZES[0]], results[SIZES[-1]]
+    expect(largest <= smallest * MAX_REPAINT_RATIO + REPAINT_SLACK_MS,
+           f"repaint with {SIZES[-1]} tools ({largest:.2f} ms) stays close to {SIZES[0]} tools ({smallest:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
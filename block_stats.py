@@ -0,0 +1,19 @@
+# block_stats.py
+import threading
+
+# Requests blocked per tool, kept apart from request_blocker so the
+# performance panel can read them without loading QtWebEngine
+_counts = {}  # tool title -> blocked request count
+_lock = threading.Lock()
+
+
+def record(title):
+    """Count one blocked request for a tool"""
+    with _lock:
+        _counts[title] = _counts.get(title, 0) + 1
+
+
+def get_counts():
+    """Return {tool title: blocked request count} for tools that have blocked anything"""
+    with _lock:
+        return dict(_counts)
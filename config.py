@@ -1,8 +1,19 @@
 # config.py
+import atexit
+import copy
 import json
 import os
+import sys
+import threading
+import time
 
 CONFIG_FILE = "config.json"
+APP_NAME = "2004Kit"
+
+# Write coalescing: flush once writes have been quiet for SAVE_DEBOUNCE seconds,
+# but never hold a change back for longer than SAVE_MAX_LATENCY seconds
+SAVE_DEBOUNCE = 0.5
+SAVE_MAX_LATENCY = 2.0
 
 DEFAULT_CONFIG = {
     "window_geometry": None,
@@ -10,10 +21,69 @@ DEFAULT_CONFIG = {
     "zoom_factor": 1.0,
     "open_external": True,  # True = separate windows, False = in-game browser
     "tool_window_geometry": [200, 200, 900, 700],  # x, y, width, height
-    "theme": "dark_pastel"
+    "theme": "dark_pastel",
+    "single_instance": True,  # Hand later launches to the running kit instead of starting again
+    "performance_preset": "default",  # "default", or opt-in "low-memory", "balanced" or "max-fps"; applied at startup
+    "tool_view_mode": "tabs",  # Where the game goes behind a tool tab: "tabs", "split" or "pip"
+    "split_view_game_share": 0.6,  # Share of the split view width given to the game
+    "pip_geometry": None,  # x, y, width, height of the picture-in-picture window
+    "frame_pacing_window_ms": 1000,  # Frames compared before and after a tab switch
+    "frame_stats_interval": 5,  # Seconds between frame pacing samples from the game page, 0 = off
+    "frame_stats_log_interval": 60,  # Seconds between frame pacing log lines, 0 = no logging
+    "frame_stats_overlay": False,  # Show frame pacing over the game (toggle with Ctrl+Shift+F)
+    "load_timing_enabled": True,  # Log navigation and resource timings of every game and tool page load
+    "load_timing_log_kb": 512,  # Size of load_timing.jsonl (in cache_root) before it rotates; one old file is kept
+    "cache_root": None,  # Folder for all web profile caches, None = per-user data folder
+    "ram_cache": False,  # Keep web caches and storage in RAM (tmpfs), snapshotted to cache_root
+    "ram_cache_mb": 768,  # RAM ceiling for the in-memory caches; storage is always kept whole
+    "ram_cache_snapshot_mb": 256,  # Most recently used cache data copied back to disk
+    "ram_cache_snapshot_interval": 300,  # Seconds between background cache snapshots, 0 = only on exit
+    "game_asset_cache": True,  # Serve the game client's files from a local versioned copy
+    "game_asset_versions_kept": 2,  # Client versions kept on disk
+    "profile_cache_mb": {"game": 512, "tools": 256, "ephemeral": 32},  # HTTP cache caps per profile
+    "hibernate_enabled": True,  # Freeze/discard tool pages that stay in the background
+    "hibernate_freeze_after": 60,  # Seconds hidden before a tool page is frozen
+    "hibernate_discard_after": 600,  # Seconds hidden before a tool page is discarded
+    "tool_memory_budget_mb": 1024,  # Discard old tool pages when their renderers exceed this
+    "watchdog_interval": 5,  # Seconds between renderer memory/CPU samples
+    "tool_manifest": "tools.json",  # Optional file adding tools or changing their URL, icon and resource policy
+    "tool_session_limit": 8,  # Open tool tabs/windows; the least recently used closes beyond this
+    "view_pool_size": 2,  # Blank tool views kept warm for instant opening, 0 = off
+    "prerender_enabled": True,  # Preconnect on tool hover and prerender after a short dwell
+    "prerender_dwell_ms": 400,  # Hover time before a tool is prerendered
+    "prerender_max_count": 2,  # Prerendered tools kept at once
+    "prerender_memory_mb": 300,  # Memory allowed for renderers that only prerendered tools use
+    "offline_cache_enabled": True,  # Serve static guide sites from a local content store
+    "offline_cache_hosts": ["2004.losthq.rs", "razgals.github.io"],  # Hosts served from the store
+    "offline_cache_mb": 200,  # Size cap of the offline content store
+    "offline_cache_ttl": 3600,  # Seconds before a cached page is revalidated in the background
+    "world_map_pack_enabled": True,  # Serve World Map tiles from a local tile pack
+    "world_map_url_prefix": "https://2004.lostcity.rs/worldmap",  # Pages loaded through the pack
+    "world_map_tile_pattern": r"\.(png|jpe?g|webp|gif|jag|dat)$",  # Paths stored as tiles
+    "world_map_bulk_template": None,  # Tile URL with {name} fields for "download whole map"; else tiles the map's pages name
+    "world_map_bulk_range": None,  # {"name": [first, last]} for each field in the template
+    "blocklist": [  # Host (and subdomains) or host/path-prefix rules blocked in tool pages
+        "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+        "doubleclick.net", "adservice.google.com", "connect.facebook.net",
+        "static.cloudflareinsights.com", "hotjar.com", "fonts.googleapis.com",
+        "fonts.gstatic.com", "platform.twitter.com", "youtube.com/embed/",
+        "youtube-nocookie.com/embed/"
+    ],
+    "request_blocking_tools": ["forums", "market-prices", "highscores"]  # Tool manifest ids the blocklist applies to
 }
 
-def load_config():
+def get_data_dir():
+    """Per-user folder for caches and downloads, the same whatever the working directory"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_NAME)
+
+def _read_config_file():
+    """Read and normalize config.json from disk"""
     if os.path.exists(CONFIG_FILE):
         try:
             with open(CONFIG_FILE, "r") as f:
@@ -21,40 +91,166 @@ def load_config():
                 # Ensure all default keys exist
                 for key, value in DEFAULT_CONFIG.items():
                     if key not in config:
-                        config[key] = value
-                
+                        config[key] = copy.deepcopy(value)
+
                 # Convert geometry values to integers if they exist
                 if config.get("window_geometry") and isinstance(config["window_geometry"], list):
                     config["window_geometry"] = [int(x) for x in config["window_geometry"]]
                 if config.get("tool_window_geometry") and isinstance(config["tool_window_geometry"], list):
                     config["tool_window_geometry"] = [int(x) for x in config["tool_window_geometry"]]
-                
+
                 # Ensure numeric values are correct type
                 if "zoom_factor" in config:
                     config["zoom_factor"] = float(config["zoom_factor"])
                 if "right_panel_width" in config:
                     config["right_panel_width"] = int(config["right_panel_width"])
-                    
+
                 return config
         except Exception as e:
             print(f"Error loading config: {e}")
-            return DEFAULT_CONFIG.copy()
-    return DEFAULT_CONFIG.copy()
+            return copy.deepcopy(DEFAULT_CONFIG)
+    return copy.deepcopy(DEFAULT_CONFIG)
 
-def save_config(config):
+def _copy_value(value):
+    """Copy lists and dicts so callers never share them with the store"""
+    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+def _write_config_file(data):
+    """Atomically replace config.json with already-serialized data"""
+    directory = os.path.dirname(os.path.abspath(CONFIG_FILE))
+    tmp_path = os.path.join(directory, f".{os.path.basename(CONFIG_FILE)}.{os.getpid()}.tmp")
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=4)
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_FILE)
     except Exception as e:
         print(f"Error saving config: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+class ConfigStore:
+    """Process-wide config held in memory and persisted from a background thread.
+
+    Values go in and come out as copies, so every change goes through set() or
+    update() under the lock while the writer thread serializes the dict."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._data = _read_config_file()
+        self._dirty_since = None  # time of the first unflushed change
+        self._last_change = None  # time of the most recent unflushed change
+        self._write_lock = threading.Lock()  # serializes file writes
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+        self._worker.start()
+
+    def get_all(self):
+        """Return a copy of the whole config"""
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return _copy_value(self._data.get(key, default))
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = _copy_value(value)
+            self._mark_dirty()
+
+    def update(self, values):
+        with self._lock:
+            self._data.update(copy.deepcopy(values))
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        """Record a change and wake the writer (caller holds the lock)"""
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        self._last_change = now
+        self._wakeup.notify()
+
+    def _snapshot(self):
+        """Serialize pending changes and clear the dirty marker (caller holds the lock)"""
+        if self._dirty_since is None:
+            return None
+        self._dirty_since = None
+        self._last_change = None
+        return json.dumps(self._data, indent=4)
+
+    def _run(self):
+        """Writer thread: wait for changes, coalesce them, then write once"""
+        while True:
+            with self._lock:
+                while self._dirty_since is None and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                # Wait until writes go quiet or the max latency is reached
+                while self._dirty_since is not None and not self._closed:
+                    deadline = min(self._last_change + SAVE_DEBOUNCE,
+                                   self._dirty_since + SAVE_MAX_LATENCY)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+            self.flush()
+
+    def flush(self):
+        """Write any pending changes synchronously"""
+        with self._write_lock:
+            with self._lock:
+                data = self._snapshot()
+            if data is not None:
+                _write_config_file(data)
+
+    def close(self):
+        """Flush pending changes and stop the writer thread"""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Return the process-wide config store, loading config.json on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ConfigStore()
+                atexit.register(_store.close)
+    return _store
+
+def load_config():
+    """Return a copy of the config; save changes with save_config() or set_config_value()"""
+    return get_store().get_all()
+
+def save_config(config):
+    """Queue config changes for a debounced write to disk"""
+    get_store().update(config)
+
+def flush_config():
+    """Write pending config changes to disk immediately"""
+    if _store is not None:
+        _store.flush()
 
 def get_config_value(key, default=None):
     """Get a single config value"""
-    config = load_config()
-    return config.get(key, default)
+    return get_store().get(key, default)
 
 def set_config_value(key, value):
     """Set a single config value"""
-    config = load_config()
-    config[key] = value
-    save_config(config)
\ No newline at end of file
+    get_store().set(key, value)
@@ -0,0 +1,371 @@
+# content_store.py
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+
+INDEX_FILE = "index.json"
+USER_AGENT = "2004Kit"
+
+# Response headers worth keeping for revalidation
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_PER_HOST = 4
+
+# Stale entries are refreshed this many at a time
+REVALIDATE_WORKERS = 2
+
+
+class HTTPStatusError(OSError):
+    """The server answered with an error status"""
+
+    def __init__(self, code, url):
+        super().__init__(f"HTTP {code} for {url}")
+        self.code = code
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by worker threads, so a page's
+    subresources reuse one TCP and TLS handshake per host"""
+
+    def __init__(self, max_idle_per_host=MAX_IDLE_PER_HOST):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}  # (scheme, host, port) -> [connection]
+        self._lock = threading.Lock()
+        self._context = ssl.create_default_context()
+
+    def _get_key(self, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise OSError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        return (parts.scheme, parts.hostname, port), path
+
+    def _connect(self, key, timeout):
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _take(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _give(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, url, headers, timeout):
+        """GET url and read the whole response; returns (status, headers, body).
+        Raises OSError when the server can't be reached."""
+        key, path = self._get_key(url)
+        for attempt in range(2):
+            connection = self._take(key)
+            reused = connection is not None
+            if connection is None:
+                connection = self._connect(key, timeout)
+            elif connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    continue  # The server closed the idle connection; try a fresh one
+                if isinstance(e, OSError):
+                    raise
+                raise OSError(f"{type(e).__name__}: {e}") from e
+            if response.will_close:
+                connection.close()
+            else:
+                self._give(key, connection)
+            return response.status, response.headers, body
+
+    def preconnect(self, url, timeout=10):
+        """Open a connection to url's host ahead of the first request (blocking)"""
+        key, _ = self._get_key(url)
+        with self._lock:
+            if self._idle.get(key):
+                return
+        connection = self._connect(key, timeout)
+        try:
+            connection.connect()
+        except OSError:
+            connection.close()
+            return
+        self._give(key, connection)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class ContentStore:
+    """On-disk, content-addressed cache of URL responses with LRU eviction"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.entries = self._load_index()  # url -> metadata dict
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_FILE), "r") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Atomically write the index (caller holds the lock)"""
+        path = os.path.join(self.root, INDEX_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving offline cache index: {e}")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def get(self, url):
+        """Return (metadata, body) for a cached URL, or (None, None)"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            entry["last_used"] = time.time()
+            if "redirect" in entry:
+                self.hits += 1
+                return dict(entry), b""
+            path = self._blob_path(entry["hash"])
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            # Blob vanished underneath the index
+            with self._lock:
+                self.entries.pop(url, None)
+                self.misses += 1
+            return None, None
+        with self._lock:
+            self.hits += 1
+        return dict(entry), body
+
+    def get_entry(self, url):
+        """Return a copy of the metadata for url without counting a hit"""
+        with self._lock:
+            entry = self.entries.get(url)
+            return dict(entry) if entry is not None else None
+
+    def put(self, url, body, content_type, headers=None):
+        """Store a response body under its content hash"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        now = time.time()
+        entry = {
+            "hash": digest,
+            "size": len(body),
+            "content_type": content_type,
+            "fetched": now,
+            "last_used": now,
+        }
+        for header in VALIDATOR_HEADERS:
+            if headers and headers.get(header):
+                entry[header] = headers[header]
+
+        with self._lock:
+            self.entries[url] = entry
+            self._evict()
+            self._save_index()
+
+    def put_redirect(self, url, target):
+        """Remember that url redirects to target"""
+        now = time.time()
+        with self._lock:
+            self.entries[url] = {"redirect": target, "fetched": now, "last_used": now}
+            self._save_index()
+
+    def touch(self, url):
+        """Mark a cached entry as freshly validated"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry["fetched"] = time.time()
+                self._save_index()
+
+    def total_bytes(self):
+        """Size of all stored blobs, counting shared content once"""
+        sizes = {}
+        for entry in self.entries.values():
+            if "hash" in entry:
+                sizes[entry["hash"]] = entry["size"]
+        return sum(sizes.values())
+
+    def _evict(self):
+        """Drop least recently used entries until the store fits (caller holds the lock)"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            del self.entries[url]
+            digest = entry.get("hash")
+            # Content addressing means another URL may still use this blob
+            if digest and not any(e.get("hash") == digest for e in self.entries.values()):
+                total -= entry["size"]
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class FetchResult:
+    """Outcome of a cached fetch"""
+
+    def __init__(self, body=None, content_type=None, redirect=None, error=None, source=""):
+        self.body = body
+        self.content_type = content_type
+        self.redirect = redirect
+        self.error = error
+        self.source = source  # "cache", "stale", "network", "offline" or ""
+
+
+class CachingFetcher:
+    """Stale-while-revalidate HTTP GET on top of a ContentStore"""
+
+    def __init__(self, store, ttl=3600, timeout=10, pool=None):
+        self.store = store
+        self.ttl = ttl
+        self.timeout = timeout
+        self.pool = pool or ConnectionPool()
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self._revalidator = ThreadPoolExecutor(max_workers=REVALIDATE_WORKERS,
+                                               thread_name_prefix="CacheRevalidate")
+
+    def fetch(self, url, ttl=None):
+        """Return a FetchResult for url, preferring the store (blocking; call off the GUI thread)"""
+        ttl = self.ttl if ttl is None else ttl
+        entry, body = self.store.get(url)
+        if entry is not None:
+            fresh = time.time() - entry["fetched"] < ttl
+            if not fresh:
+                self.revalidate_async(url)
+            if "redirect" in entry:
+                return FetchResult(redirect=entry["redirect"], source="cache" if fresh else "stale")
+            return FetchResult(body, entry["content_type"], source="cache" if fresh else "stale")
+
+        try:
+            return self._download(url)
+        except OSError as e:
+            code = getattr(e, "code", None)
+            return FetchResult(error=f"HTTP {code}" if code else str(e), source="offline")
+
+    def _download(self, url, entry=None):
+        """Fetch from the network and update the store"""
+        request_headers = {"User-Agent": USER_AGENT}
+        if entry is not None:
+            if entry.get("ETag"):
+                request_headers["If-None-Match"] = entry["ETag"]
+            if entry.get("Last-Modified"):
+                request_headers["If-Modified-Since"] = entry["Last-Modified"]
+
+        final_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self.pool.request(final_url, request_headers, self.timeout)
+            location = response_headers.get("Location")
+            if status not in REDIRECT_CODES or not location:
+                break
+            final_url = urllib.parse.urljoin(final_url, location)
+            # The validators belong to the original URL
+            request_headers = {"User-Agent": USER_AGENT}
+        else:
+            raise OSError(f"Too many redirects for {url}")
+
+        if status == 304 and entry is not None and final_url == url:
+            self.store.touch(url)
+            return FetchResult(source="network")
+        if not 200 <= status < 300:
+            raise HTTPStatusError(status, final_url)
+        content_type = response_headers.get("Content-Type", "application/octet-stream")
+        headers = {name: response_headers.get(name) for name in VALIDATOR_HEADERS}
+
+        if final_url != url:
+            self.store.put_redirect(url, final_url)
+            self.store.put(final_url, body, content_type, headers)
+            return FetchResult(redirect=final_url, source="network")
+        self.store.put(url, body, content_type, headers)
+        return FetchResult(body, content_type, source="network")
+
+    def revalidate(self, url):
+        """Refresh a stale entry with a conditional request; keeps the old copy on failure"""
+        entry = self.store.get_entry(url)
+        try:
+            self._download(url, entry if entry and "redirect" not in entry else None)
+        except OSError:
+            pass  # Offline: keep serving the stale copy
+        finally:
+            with self._lock:
+                self._revalidating.discard(url)
+
+    def revalidate_async(self, url):
+        """Queue a background revalidation unless one is already pending"""
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+        try:
+            self._revalidator.submit(self.revalidate, url)
+        except RuntimeError:
+            with self._lock:
+                self._revalidating.discard(url)  # Shut down
+
+    def close(self):
+        """Drop queued revalidations and idle connections"""
+        self._revalidator.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
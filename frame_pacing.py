@@ -0,0 +1,197 @@
+# frame_pacing.py
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+import config
+import time
+
+# Records requestAnimationFrame timestamps in a ring buffer and reports frame
+# interval statistics, either for the last few seconds or for the window just
+# before and just after a moment. Aggregation happens in the page so only a
+# handful of numbers cross over to Python.
+PROBE_SCRIPT = """
+(function() {
+    if (window.__kitPacing) return;
+    var size = 2048, times = new Float64Array(size), count = 0;
+    // Gaps longer than this are the page being hidden, not slow frames
+    var PAUSE_MS = 1000;
+    function tick(t) {
+        times[count % size] = t;
+        count++;
+        requestAnimationFrame(tick);
+    }
+    requestAnimationFrame(tick);
+
+    function stats(from, to) {
+        var deltas = [], prev = null, first = Math.max(0, count - size);
+        for (var i = first; i < count; i++) {
+            var t = times[i % size];
+            if (t > from && t <= to && prev !== null) deltas.push(t - prev);
+            prev = t;
+        }
+        if (!deltas.length) return {frames: 0};
+        var sorted = deltas.slice().sort(function(a, b) { return a - b; });
+        var pick = function(q) { return sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))]; };
+        var total = deltas.reduce(function(a, b) { return a + b; }, 0);
+        // A frame that took n typical intervals stands for n - 1 dropped frames
+        var typical = pick(0.5), dropped = 0;
+        for (var j = 0; j < deltas.length; j++) {
+            if (deltas[j] <= PAUSE_MS) dropped += Math.max(0, Math.round(deltas[j] / typical) - 1);
+        }
+        return {
+            frames: deltas.length,
+            fps: deltas.length * 1000 / total,
+            p50_ms: typical,
+            p95_ms: pick(0.95),
+            p99_ms: pick(0.99),
+            max_ms: sorted[sorted.length - 1],
+            dropped: dropped,
+            long_frames: deltas.filter(function(d) { return d > 50; }).length
+        };
+    }
+
+    window.__kitPacing = {
+        report: function(sinceMs, windowMs) {
+            var pivot = performance.now() - sinceMs;
+            return {before: stats(pivot - windowMs, pivot), after: stats(pivot, pivot + windowMs)};
+        },
+        summary: function(windowMs) {
+            var now = performance.now();
+            return stats(now - windowMs, now);
+        }
+    };
+})()
+"""
+
+REPORT_SCRIPT = "window.__kitPacing ? window.__kitPacing.report(%f, %f) : null"
+SUMMARY_SCRIPT = "window.__kitPacing ? window.__kitPacing.summary(%f) : null"
+
+# Reports kept for the benchmark probe and the console
+REPORT_HISTORY = 20
+
+OVERLAY_STYLE = ("background-color: rgba(0, 0, 0, 160); color: #b8f5b0; "
+                 "font-family: monospace; font-size: 11px; padding: 4px; border-radius: 3px;")
+
+
+def get_seconds_value(key, default):
+    try:
+        return max(0.0, float(config.get_config_value(key, default)))
+    except (ValueError, TypeError):
+        return float(default)
+
+
+class FramePacingProbe(QObject):
+    """Measures the game page's frame pacing, continuously and around tab switches"""
+    report_ready = pyqtSignal(str, object)  # label, {"before": stats, "after": stats}
+    stats_ready = pyqtSignal(object)  # stats for the last sampling interval
+
+    def __init__(self, page, parent=None):
+        super().__init__(parent)
+        self.page = page
+        self.reports = []  # (label, report), oldest first
+        self.latest = None  # stats from the last sample
+        self.last_logged = 0.0
+
+        # Pull the aggregates on a slow timer; the page does the per-frame work
+        self.interval = get_seconds_value("frame_stats_interval", 5)
+        self.log_interval = get_seconds_value("frame_stats_log_interval", 60)
+        self.sample_timer = QTimer(self)
+        self.sample_timer.timeout.connect(self.sample)
+        if self.interval > 0:
+            self.sample_timer.start(int(self.interval * 1000))
+
+    def install(self, ok=True):
+        """Start recording frames in the current document"""
+        if ok:
+            self.page.runJavaScript(PROBE_SCRIPT)
+
+    def get_window_ms(self):
+        try:
+            return max(100, int(config.get_config_value("frame_pacing_window_ms", 1000)))
+        except (ValueError, TypeError):
+            return 1000
+
+    def sample(self):
+        """Ask the page for the frame statistics since the previous sample"""
+        window_ms = (self.interval or 5) * 1000
+        try:
+            self.page.runJavaScript(SUMMARY_SCRIPT % window_ms, self.on_stats)
+        except RuntimeError:
+            self.sample_timer.stop()  # Game view destroyed
+
+    def on_stats(self, stats):
+        if not isinstance(stats, dict):
+            return
+        self.latest = stats
+        now = time.monotonic()
+        if stats.get("frames") and self.log_interval and now - self.last_logged >= self.log_interval:
+            self.last_logged = now
+            print(f"🎞️ Frame pacing: {format_stats(stats)}")
+        self.stats_ready.emit(stats)
+
+    def measure_switch(self, label):
+        """Compare the frames before now with the frames after, once they have been drawn"""
+        window_ms = self.get_window_ms()
+        switched_at = time.perf_counter()
+
+        def collect():
+            since_ms = (time.perf_counter() - switched_at) * 1000
+            try:
+                self.page.runJavaScript(REPORT_SCRIPT % (since_ms, window_ms),
+                                        lambda result: self.on_report(label, result))
+            except RuntimeError:
+                pass  # Game view replaced in the meantime
+
+        QTimer.singleShot(window_ms + 100, collect)
+
+    def on_report(self, label, report):
+        if not isinstance(report, dict):
+            return
+        self.reports.append((label, report))
+        del self.reports[:-REPORT_HISTORY]
+        print(f"🎞️ Frame pacing, {label}: before {format_stats(report.get('before'))}; "
+              f"after {format_stats(report.get('after'))}")
+        self.report_ready.emit(label, report)
+
+
+class FrameStatsOverlay(QLabel):
+    """Corner readout of the game's frame pacing, updated at each sample"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet(OVERLAY_STYLE)
+        self.setText("waiting for frames")
+        self.adjustSize()
+        self.move(8, 8)
+        self.setVisible(bool(config.get_config_value("frame_stats_overlay", False)))
+
+    def show_stats(self, stats):
+        if not self.isVisible():
+            return
+        if not stats.get("frames"):
+            self.setText("paused")
+        else:
+            self.setText(f"{stats['fps']:.0f} fps\n"
+                         f"p50 {stats['p50_ms']:5.1f} ms\n"
+                         f"p95 {stats['p95_ms']:5.1f} ms\n"
+                         f"p99 {stats['p99_ms']:5.1f} ms\n"
+                         f"dropped {stats['dropped']}")
+        self.adjustSize()
+        self.raise_()
+
+    def toggle(self):
+        """Show or hide the overlay and remember the choice"""
+        visible = not self.isVisible()
+        self.setVisible(visible)
+        if visible:
+            self.raise_()
+        config.set_config_value("frame_stats_overlay", visible)
+        return visible
+
+
+def format_stats(stats):
+    if not stats or not stats.get("frames"):
+        return "no frames"
+    return (f"{stats['fps']:.0f} fps, p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+            f"p99 {stats['p99_ms']:.1f} ms, max {stats['max_ms']:.0f} ms, "
+            f"{stats['dropped']} dropped, {stats['long_frames']} long")
@@ -0,0 +1,178 @@
+# game_asset_scheme.py
+from PyQt6.QtWebEngineCore import (QWebEngineUrlSchemeHandler, QWebEngineUrlRequestInterceptor,
+                                   QWebEngineUrlRequestInfo, QWebEngineUrlRequestJob)
+from PyQt6.QtCore import QFile, QIODevice, QUrl, pyqtSignal
+from game_assets import GameAssetStore, is_asset_url, warm
+import offline_scheme
+import config
+import url_schemes
+import os
+import threading
+import time
+
+# Stored game assets are loaded as kitasset://host/path instead of https://
+SCHEME = url_schemes.GAME_ASSETS
+
+# Let the game have the network to itself before checking for a new client
+WARM_DELAY_MS = 60000
+
+# The game page is on https://, so its fetch() of a wasm or data file from kitasset://
+# is cross-origin and needs an Access-Control-Allow-Origin header (Qt 6.7 and later)
+CAN_SET_HEADERS = hasattr(QWebEngineUrlRequestJob, "setAdditionalResponseHeaders")
+
+_store = None
+_interceptor = None
+_handler = None
+_warm_thread = None
+_validate_thread = None
+
+
+def is_enabled():
+    return bool(config.get_config_value("game_asset_cache", True))
+
+
+def to_network_url(qurl):
+    network_url = QUrl(qurl)
+    network_url.setScheme("https")
+    return network_url
+
+
+class GameAssetInterceptor(QWebEngineUrlRequestInterceptor):
+    """Records what the game loads and points stored assets at their local copy"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def interceptRequest(self, info):
+        url = info.requestUrl()
+        if url.scheme() != "https":
+            return
+        text = url.toString()
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            self.store.record_page(text)
+            return
+        if bytes(info.requestMethod()) != b"GET" or not is_asset_url(text):
+            return
+        self.store.record_seen(text)
+        if self.store.has(text):
+            local_url = QUrl(url)
+            local_url.setScheme(SCHEME.decode())
+            info.redirect(local_url)
+        else:
+            self.store.note_miss()
+
+
+class GameAssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves redirected game assets straight from the versioned store on disk.
+    A request whose asset hasn't been checked yet waits for that one check."""
+    checked = pyqtSignal(int)  # job token
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.jobs = offline_scheme.JobTracker()
+        # Check threads hand requests back to the GUI thread through a queued signal
+        self.checked.connect(self.on_checked)
+
+    def requestStarted(self, job):
+        check = self.store.check(to_network_url(job.requestUrl()).toString())
+        if check.done():
+            self.serve(job)
+            return
+        token = self.jobs.add(job)
+        check.add_done_callback(lambda _, t=token: self.checked.emit(t))
+
+    def on_checked(self, token):
+        job = self.jobs.take(token)
+        if job is not None:
+            self.serve(job)
+
+    def serve(self, job):
+        network_url = to_network_url(job.requestUrl())
+        found = self.store.lookup(network_url.toString())
+        if found is None:
+            # Failed its check or dropped from the store; has() stops redirecting it
+            job.redirect(network_url)
+            return
+        path, content_type = found
+        file = QFile(path, job)
+        if not file.open(QIODevice.OpenModeFlag.ReadOnly):
+            job.redirect(network_url)
+            return
+        job.setAdditionalResponseHeaders({b"Access-Control-Allow-Origin": [b"*"]})
+        job.reply(content_type.encode(), file)
+
+
+def get_store(cache_root):
+    """Return the game asset store under cache_root, opening it on first use"""
+    global _store
+    if _store is None:
+        _store = GameAssetStore(os.path.join(cache_root, "game_assets"))
+        stats = _store.get_stats()
+        if stats["version"]:
+            print(f"📦 Checking {stats['assets']} stored game assets from version {stats['version']}")
+    return _store
+
+
+def start_validate(store):
+    """Check every stored asset in the background, ahead of the game asking for it"""
+    global _validate_thread
+    if _validate_thread is not None or store.version is None:
+        return
+
+    def run():
+        start = time.perf_counter()
+        valid, rejected = store.validate()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"📦 {valid} stored game assets confirmed current, {rejected} load from the network "
+              f"({elapsed_ms:.0f} ms)")
+
+    _validate_thread = threading.Thread(target=run, name="GameAssetValidate", daemon=True)
+    _validate_thread.start()
+
+
+def install(profile, page, cache_root):
+    """Serve the game page's stored assets from disk and record what it loads"""
+    global _interceptor, _handler
+    if not is_enabled():
+        return
+    if not CAN_SET_HEADERS:
+        # Without the header CORS would block the game's fetches, so leave the network alone
+        print("⚠️ This PyQt6-WebEngine can't set response headers; game assets load from the network")
+        return
+    store = get_store(cache_root)
+    # Runs while the page itself loads, so most assets are checked before they're requested
+    start_validate(store)
+    if _handler is None:
+        _handler = GameAssetSchemeHandler(store, profile.parent())
+        profile.installUrlSchemeHandler(SCHEME, _handler)
+        _interceptor = GameAssetInterceptor(store, profile.parent())
+    page.setUrlRequestInterceptor(_interceptor)
+
+
+def start_warm():
+    """Check for a new client version and pre-fetch it in the background"""
+    global _warm_thread
+    if _store is None or not is_enabled():
+        return
+    if _warm_thread is not None and _warm_thread.is_alive():
+        return
+    try:
+        keep = max(1, int(config.get_config_value("game_asset_versions_kept", 2)))
+    except (ValueError, TypeError):
+        keep = 2
+    # Daemon thread: an install cut short by exit leaves a .partial folder that prune() removes
+    _warm_thread = threading.Thread(target=warm, args=(_store, keep), name="GameAssetWarmer", daemon=True)
+    _warm_thread.start()
+
+
+def shutdown():
+    """Save what the game loaded this session for the next warm"""
+    if _store is not None:
+        _store.save_seen()
+        _store.close()
+
+
+def get_stats():
+    return _store.get_stats() if _store is not None else None
@@ -0,0 +1,371 @@
+# game_assets.py
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+USER_AGENT = "2004Kit"
+CURRENT_FILE = "current.json"
+MANIFEST_FILE = "manifest.json"
+SEEN_FILE = "seen.json"
+
+# Client files worth keeping locally: scripts, WebAssembly and the game's data archives
+ASSET_EXTENSIONS = (".js", ".mjs", ".wasm", ".data", ".jag", ".sf2", ".css")
+
+ASSET_LINK_PATTERN = re.compile(r"""(?:src|href)\s*=\s*["']([^"'#]+)["']""", re.IGNORECASE)
+
+# Stored assets are checked against the live client this many at a time
+VALIDATE_WORKERS = 8
+
+# How long one asset's check waits for the server before trusting the stored copy
+CHECK_TIMEOUT = 5
+
+
+def is_asset_url(url):
+    path = urllib.parse.urlsplit(url).path.lower()
+    return path.endswith(ASSET_EXTENSIONS)
+
+
+def discover_assets(html, base_url):
+    """Return the asset URLs a client page links to"""
+    urls = set()
+    for link in ASSET_LINK_PATTERN.findall(html):
+        url = urllib.parse.urljoin(base_url, link.strip())
+        if url.startswith("https://") and is_asset_url(url):
+            urls.add(url)
+    return urls
+
+
+def open_url(url, method="GET", timeout=15):
+    request = urllib.request.Request(url, method=method, headers={"User-Agent": USER_AGENT})
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+def get_validator(url, timeout=15):
+    """Return a string that changes whenever the asset at url does (one HEAD request)"""
+    with open_url(url, "HEAD", timeout) as response:
+        headers = response.headers
+        if headers.get("ETag"):
+            return headers["ETag"]
+        return f"{headers.get('Last-Modified', '')} {headers.get('Content-Length', '')}".strip()
+
+
+def compute_version(validators):
+    """Client version id: a digest of every asset URL and its validator"""
+    digest = hashlib.sha1()
+    for url in sorted(validators):
+        digest.update(f"{url} {validators[url]}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def link_or_copy(source, target):
+    """Share an unchanged file with the previous version instead of duplicating it"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class GameAssetStore:
+    """Versioned, integrity-checked copies of the game client's files.
+
+    Each client version lives in versions/<id>/ with a manifest of URL -> file,
+    size and sha256. The version in use is fixed for the session, and each of
+    its files is served once check() has matched that one file against the live
+    client; a newer version installed by warm() is picked up on the next launch."""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "versions"), exist_ok=True)
+        self.version = self.read_current()
+        self.assets = self.load_manifest(self.version).get("assets", {}) if self.version else {}
+        self.validated = set()  # asset URLs confirmed current and intact this session
+        self.rejected = set()  # asset URLs found damaged or changed on the server
+        self._checks = {}  # asset URL -> Future of its check
+        self._executor = None
+        seen = self.read_json(os.path.join(root, SEEN_FILE), {})
+        self.previous_pages = set(seen.get("pages", []))
+        self.previous_assets = set(seen.get("assets", []))
+        self.pages = set()  # client pages the game loaded this session
+        self.seen = set()  # asset URLs the game requested this session
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    def read_json(self, path, default):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def write_json(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def get_version_dir(self, version):
+        return os.path.join(self.root, "versions", version)
+
+    def read_current(self):
+        version = self.read_json(os.path.join(self.root, CURRENT_FILE), {}).get("version")
+        return version if version and os.path.isdir(self.get_version_dir(version)) else None
+
+    def load_manifest(self, version):
+        return self.read_json(os.path.join(self.get_version_dir(version), MANIFEST_FILE), {})
+
+    def has(self, url):
+        """Whether url has a stored copy that hasn't failed its check"""
+        with self._lock:
+            entry = self.assets.get(url)
+            return entry is not None and bool(entry.get("validator")) and url not in self.rejected
+
+    def lookup(self, url):
+        """Return (path, content type) of this session's validated copy of url, or None"""
+        with self._lock:
+            entry = self.assets.get(url) if url in self.validated else None
+        if entry is not None:
+            path = os.path.join(self.get_version_dir(self.version), entry["file"])
+            try:
+                if os.path.getsize(path) == entry["size"]:
+                    with self._lock:
+                        self.hits += 1
+                        self.bytes_served += entry["size"]
+                    return path, entry["content_type"]
+            except OSError:
+                pass
+            # Damaged or missing: serve from the network until the next warm repairs it
+            with self._lock:
+                self.assets.pop(url, None)
+                self.validated.discard(url)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def record_page(self, url):
+        with self._lock:
+            self.pages.add(url)
+
+    def record_seen(self, url):
+        with self._lock:
+            self.seen.add(url)
+
+    def note_miss(self):
+        """Count an asset the game had to fetch from the network"""
+        with self._lock:
+            self.misses += 1
+
+    def get_known_urls(self):
+        """Return (pages, assets) seen this session and the one before"""
+        with self._lock:
+            return self.pages | self.previous_pages, self.seen | self.previous_assets
+
+    def save_seen(self):
+        """Remember this session's pages and assets for the next warm"""
+        with self._lock:
+            if not self.seen:
+                return
+            data = {"pages": sorted(self.pages), "assets": sorted(self.seen)}
+        try:
+            self.write_json(os.path.join(self.root, SEEN_FILE), data)
+        except OSError as e:
+            print(f"Error saving game asset list: {e}")
+
+    def check(self, url, timeout=CHECK_TIMEOUT):
+        """Start checking url's stored copy unless that has begun already.
+
+        Returns a Future of whether the copy may be served: its file must match
+        the stored sha256 and, if the server answers, the server's validator
+        must match the one it was stored with, so a client updated under the
+        same URLs loads from the network. Offline, the copy warm() stored is
+        served as it is."""
+        with self._lock:
+            future = self._checks.get(url)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=VALIDATE_WORKERS,
+                                                        thread_name_prefix="GameAssetCheck")
+                future = self._executor.submit(self._check, url, timeout)
+                self._checks[url] = future
+        return future
+
+    def _check(self, url, timeout):
+        """Worker thread: check one stored copy and record the outcome"""
+        with self._lock:
+            entry = self.assets.get(url)
+        ok = (entry is not None and bool(entry.get("validator"))
+              and file_sha256(os.path.join(self.get_version_dir(self.version), entry["file"])) == entry["sha256"])
+        if ok:
+            try:
+                ok = get_validator(url, timeout) == entry["validator"]
+            except urllib.error.HTTPError:
+                ok = False  # Gone from the live client
+            except (urllib.error.URLError, OSError):
+                pass  # Offline: nothing newer to load anyway
+        with self._lock:
+            (self.validated if ok else self.rejected).add(url)
+        return ok
+
+    def validate(self, timeout=CHECK_TIMEOUT):
+        """Check every stored copy and wait for the outcome (blocking; run off the
+        GUI thread). Returns (valid, rejected) counts."""
+        with self._lock:
+            urls = list(self.assets)
+        results = [self.check(url, timeout).result() for url in urls]
+        return results.count(True), results.count(False)
+
+    def close(self):
+        """Drop checks that haven't started"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def verify(self, version):
+        """Return the URLs whose stored copy is missing or fails its sha256 check"""
+        directory = self.get_version_dir(version)
+        assets = self.load_manifest(version).get("assets", {})
+        return [url for url, entry in assets.items()
+                if file_sha256(os.path.join(directory, entry["file"])) != entry["sha256"]]
+
+    def install(self, version, validators):
+        """Store a client version, reusing unchanged files from the current one.
+        Returns (downloaded, reused) counts."""
+        current = self.read_current()
+        previous = self.load_manifest(current).get("assets", {}) if current else {}
+        partial = self.get_version_dir(version) + ".partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        os.makedirs(partial)
+
+        assets = {}
+        downloaded = reused = 0
+        for url, validator in sorted(validators.items()):
+            name = hashlib.sha1(url.encode()).hexdigest()[:20] + os.path.splitext(urllib.parse.urlsplit(url).path)[1]
+            target = os.path.join(partial, name)
+            old = previous.get(url)
+            if old is not None and validator and old.get("validator") == validator:
+                source = os.path.join(self.get_version_dir(current), old["file"])
+                if file_sha256(source) == old["sha256"]:
+                    link_or_copy(source, target)
+                    assets[url] = dict(old, file=name)
+                    reused += 1
+                    continue
+            try:
+                with open_url(url) as response:
+                    body = response.read()
+                    content_type = response.headers.get("Content-Type", "application/octet-stream")
+            except (urllib.error.URLError, OSError) as e:
+                print(f"⚠️ Could not download game asset {url}: {e}")
+                continue
+            with open(target, "wb") as f:
+                f.write(body)
+            assets[url] = {
+                "file": name,
+                "size": len(body),
+                "sha256": hashlib.sha256(body).hexdigest(),
+                "content_type": content_type.split(";")[0].strip(),
+                "validator": validator,
+            }
+            downloaded += 1
+
+        self.write_json(os.path.join(partial, MANIFEST_FILE),
+                        {"version": version, "created": time.time(), "assets": assets})
+        final = self.get_version_dir(version)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(partial, final)
+        self.write_json(os.path.join(self.root, CURRENT_FILE), {"version": version})
+        return downloaded, reused
+
+    def prune(self, keep):
+        """Delete all but the newest keep versions, never the one in use or the current one"""
+        versions_dir = os.path.join(self.root, "versions")
+        protected = {self.version, self.read_current()}
+        versions = []
+        for name in os.listdir(versions_dir):
+            path = os.path.join(versions_dir, name)
+            if name.endswith(".partial"):
+                shutil.rmtree(path, ignore_errors=True)  # left by an interrupted install
+            elif os.path.isdir(path):
+                versions.append((self.load_manifest(name).get("created", 0), name))
+        versions.sort(reverse=True)
+        for _, name in versions[max(1, keep):]:
+            if name not in protected:
+                shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+                print(f"🧹 Pruned game assets version {name}")
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "version": self.version,
+                "assets": len(self.assets),
+                "validated": len(self.validated),
+                "rejected": len(self.rejected),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_served": self.bytes_served,
+            }
+
+
+def warm(store, keep=2):
+    """Bring the store up to date with the live client (blocking; run off the GUI thread).
+
+    Returns the current version id, or None if nothing could be checked."""
+    start = time.perf_counter()
+    store.save_seen()
+    pages, urls = store.get_known_urls()
+    for page in pages:
+        try:
+            with open_url(page) as response:
+                html = response.read().decode("utf-8", "replace")
+                urls |= discover_assets(html, response.geturl())
+        except (urllib.error.URLError, OSError) as e:
+            print(f"⚠️ Could not scan game page {page}: {e}")
+    if not urls:
+        print("Game assets not known yet; they are recorded as the game loads")
+        return None
+
+    validators = {}
+    for url in urls:
+        try:
+            validators[url] = get_validator(url)
+        except (urllib.error.URLError, OSError):
+            pass  # Gone from the live client, or offline
+    if not validators:
+        print("⚠️ Could not reach the game server to check for a new client")
+        return None
+
+    version = compute_version(validators)
+    if version == store.read_current():
+        damaged = store.verify(version)
+        if not damaged:
+            store.prune(keep)
+            print(f"✅ Game assets up to date (version {version})")
+            return version
+        print(f"⚠️ {len(damaged)} game assets failed their integrity check; repairing")
+
+    downloaded, reused = store.install(version, validators)
+    store.prune(keep)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"📦 Game assets version {version}: {downloaded} downloaded, {reused} reused "
+          f"in {elapsed_ms:.0f} ms (used from next launch)")
+    return version
@@ -0,0 +1,72 @@
+# game_dock.py
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, pyqtSignal
+import config
+
+# Where the game goes while a tool tab is in front
+TABS_MODE = "tabs"
+SPLIT_MODE = "split"
+PIP_MODE = "pip"
+VIEW_MODES = {
+    TABS_MODE: "Tabs",
+    SPLIT_MODE: "Split view",
+    PIP_MODE: "Picture-in-picture",
+}
+
+
+def get_view_mode():
+    mode = config.get_config_value("tool_view_mode", TABS_MODE)
+    return mode if mode in VIEW_MODES else TABS_MODE
+
+
+class GameHost(QWidget):
+    """Container the game view can be moved in and out of without reloading"""
+
+    def __init__(self, placeholder_text="", parent=None):
+        super().__init__(parent)
+        self.host_layout = QVBoxLayout(self)
+        self.host_layout.setContentsMargins(0, 0, 0, 0)
+        self.placeholder = QLabel(placeholder_text)
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setStyleSheet("font-size: 16px;")
+        self.host_layout.addWidget(self.placeholder)
+        self.widget = None
+
+    def set_widget(self, widget):
+        """Show widget here; adding it to the layout takes it from its old host"""
+        self.widget = widget
+        self.placeholder.hide()
+        self.host_layout.addWidget(widget)
+        widget.show()
+
+    def take_widget(self):
+        """Forget the hosted widget; its new host reparents it"""
+        widget = self.widget
+        self.widget = None
+        self.placeholder.show()
+        return widget
+
+    def set_placeholder_text(self, text):
+        self.placeholder.setText(text)
+
+
+class PictureInPictureWindow(GameHost):
+    """Small always-on-top window that keeps the game visible over tool tabs"""
+    closed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__("", parent)
+        self.setWindowFlags(Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint)
+        self.setWindowTitle("⚔️ LostCity")
+        self.setMinimumSize(240, 160)
+        try:
+            x, y, w, h = [int(value) for value in config.get_config_value("pip_geometry")]
+            self.setGeometry(x, y, w, h)
+        except (ValueError, TypeError):
+            self.resize(480, 320)
+
+    def closeEvent(self, event):
+        geom = self.geometry()
+        config.set_config_value("pip_geometry", [geom.x(), geom.y(), geom.width(), geom.height()])
+        self.closed.emit()
+        event.accept()
@@ -1,21 +1,25 @@
 # game_view.py
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-from PyQt6.QtCore import Qt, QUrl, QDir, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import Qt, QUrl, pyqtSignal
 import config
+import profiles
+import game_asset_scheme
+import load_timing
+from frame_pacing import FramePacingProbe, FrameStatsOverlay
+from input_latency import InputLatencyProbe
 
 
 class GameViewWidget(QWebEngineView):
     zoom_changed = pyqtSignal(float)
+    render_process_crashed = pyqtSignal()
     
     def __init__(self, url, parent=None):
         super().__init__(parent)
 
         try:
-            # Setup persistent profile
-            profile = QWebEngineProfile("2004Client", self)
-            profile.setCachePath(QDir.currentPath() + "/web_cache")
-            profile.setPersistentStoragePath(QDir.currentPath() + "/web_storage")
+            # Use the shared persistent game profile
+            profile = profiles.get_profile(profiles.GAME_PROFILE)
             
             # Enable developer tools for debugging if needed
             # profile.settings().setAttribute(
@@ -25,6 +29,9 @@ class GameViewWidget(QWebEngineView):
             page = QWebEnginePage(profile, self)
             self.setPage(page)
 
+            # Client files of the last checked version load from the local store
+            game_asset_scheme.install(profile, page, profiles.get_cache_root())
+
             # Load the game
             self.setUrl(QUrl(url))
 
@@ -34,6 +41,13 @@ class GameViewWidget(QWebEngineView):
 
             # Connect signals
             self.page().loadFinished.connect(self.on_load_finished)
+            self.page().renderProcessTerminated.connect(self.on_render_process_terminated)
+
+            # Frame pacing probe, injected at each load, and its optional overlay
+            self.frame_probe = FramePacingProbe(page, self)
+            self.frame_overlay = FrameStatsOverlay(self)
+            self.frame_probe.stats_ready.connect(self.frame_overlay.show_stats)
+            self.input_probe = InputLatencyProbe(self, self)
             
             # Enable focus for keyboard events
             self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -42,11 +56,17 @@ class GameViewWidget(QWebEngineView):
             print(f"Error initializing GameViewWidget: {e}")
             # Set a basic zoom factor as fallback
             self.zoom_factor = 1.0
+            self.frame_probe = None
+            self.frame_overlay = None
+            self.input_probe = None
 
     def on_load_finished(self, ok: bool):
         """Handle page load completion"""
         if ok:
             print("✅ Game page loaded successfully.")
+            if self.frame_probe is not None:
+                self.frame_probe.install()
+                self.input_probe.install()
             # Apply saved zoom factor after page loads
             try:
                 self.setZoomFactor(self.zoom_factor)
@@ -54,6 +74,14 @@ class GameViewWidget(QWebEngineView):
                 print(f"Error setting zoom factor: {e}")
         else:
             print("❌ Failed to load game page.")
+        load_timing.collect(self.page(), "Game", ok)
+
+    def on_render_process_terminated(self, status, exit_code):
+        """Handle the game renderer dying (OOM, crash or kill)"""
+        if status == QWebEnginePage.RenderProcessTerminationStatus.NormalTerminationStatus:
+            return
+        print(f"❌ Game renderer terminated ({status.name}, exit code {exit_code})")
+        self.render_process_crashed.emit()
 
     def wheelEvent(self, event):
         """Handle mouse wheel events for zooming"""
@@ -89,6 +117,16 @@ class GameViewWidget(QWebEngineView):
             print(f"Error in wheelEvent: {e}")
             super().wheelEvent(event)
 
+    def toggle_frame_overlay(self):
+        """Show or hide the frame pacing overlay (Ctrl+Shift+F, set up by MainWindow)"""
+        if self.frame_overlay is not None and self.frame_overlay.toggle():
+            self.frame_probe.sample()
+
+    def toggle_input_latency(self):
+        """Start or stop measuring input latency (Ctrl+Shift+L, set up by MainWindow)"""
+        if self.input_probe is not None:
+            self.input_probe.toggle()
+
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts"""
         try:
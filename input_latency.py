@@ -0,0 +1,289 @@
+# input_latency.py
+from PyQt6.QtCore import QCoreApplication, QObject, QEvent, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QKeyEvent
+import performance_presets
+import time
+
+# Records when each input event reaches the page and when the frame that
+# follows it has been painted (a message posted from the next rAF callback runs
+# once that frame's rendering is done). Times are on the page clock,
+# performance.timeOrigin + performance.now(), in ms.
+PAGE_SCRIPT = """
+(function() {
+    if (window.__kitInput) return;
+    var records = [], MAX_RECORDS = 512;
+    function onInput(event) {
+        var record = {kind: event.type, event_ms: performance.timeOrigin + event.timeStamp,
+                      handled_ms: performance.timeOrigin + performance.now()};
+        requestAnimationFrame(function() {
+            var channel = new MessageChannel();
+            channel.port1.onmessage = function() {
+                record.painted_ms = performance.timeOrigin + performance.now();
+                records.push(record);
+                if (records.length > MAX_RECORDS) records.splice(0, records.length - MAX_RECORDS);
+            };
+            channel.port2.postMessage(0);
+        });
+    }
+    ['keydown', 'mousedown', 'wheel'].forEach(function(type) {
+        window.addEventListener(type, onInput, {capture: true, passive: true});
+    });
+    window.__kitInput = {
+        drain: function() { var out = records; records = []; return out; }
+    };
+})()
+"""
+
+DRAIN_SCRIPT = "window.__kitInput ? window.__kitInput.drain() : null"
+CLOCK_SCRIPT = "performance.timeOrigin + performance.now()"
+
+# Qt event types and the DOM events Chromium turns them into
+QT_EVENT_KINDS = {
+    QEvent.Type.KeyPress: "keydown",
+    QEvent.Type.MouseButtonPress: "mousedown",
+    QEvent.Type.Wheel: "wheel",
+}
+
+# Chromium merges wheel events that arrive faster than it can dispatch them
+COALESCED_KINDS = ("wheel",)
+
+# A Qt event not seen by the page within this long is dropped (blocked or swallowed)
+MAX_MATCH_MS = 500
+
+# Upper bounds of the histogram buckets in ms; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (8, 16, 25, 33, 50, 75, 100, 150)
+
+# Key the game ignores, sent for synthetic measurements
+SYNTHETIC_KEY = Qt.Key.Key_F24
+
+CLOCK_SAMPLES = 5
+DRAIN_INTERVAL_MS = 1000
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_histogram(latencies):
+    """Return [(label, count)] over HISTOGRAM_BUCKETS_MS"""
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in latencies:
+        index = 0
+        while index < len(HISTOGRAM_BUCKETS_MS) and value >= HISTOGRAM_BUCKETS_MS[index]:
+            index += 1
+        counts[index] += 1
+    labels = []
+    lower = 0
+    for upper in HISTOGRAM_BUCKETS_MS:
+        labels.append(f"{lower}-{upper} ms")
+        lower = upper
+    labels.append(f"{lower}+ ms")
+    return list(zip(labels, counts))
+
+
+def match_events(qt_events, page_events, tolerance_ms=2.0):
+    """Pair Qt-side input timestamps with the page's records of the same events.
+
+    qt_events: [(kind, qt_ms)] on the page clock, oldest first; matched entries are
+    removed and ones too old to ever match are dropped. page_events: the page's
+    records. Returns [(kind, qt_ms, record)]."""
+    matches = []
+    for record in sorted(page_events, key=lambda r: r["event_ms"]):
+        if "painted_ms" not in record:
+            continue
+        kind = record["kind"]
+        candidates = [i for i, (k, t) in enumerate(qt_events)
+                      if k == kind and t <= record["event_ms"] + tolerance_ms
+                      and record["event_ms"] - t <= MAX_MATCH_MS]
+        if not candidates:
+            continue
+        # A coalesced wheel event stands for every Qt wheel event before it
+        used = candidates if kind in COALESCED_KINDS else candidates[:1]
+        matches.append((kind, qt_events[used[0]][1], record))
+        for index in reversed(used):
+            del qt_events[index]
+    if page_events:
+        newest = max(r["event_ms"] for r in page_events)
+        qt_events[:] = [(k, t) for k, t in qt_events if newest - t <= MAX_MATCH_MS]
+    return matches
+
+
+def summarize(values):
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.5),
+        "p95_ms": percentile(values, 0.95),
+        "max_ms": max(values),
+    }
+
+
+def build_report(matches, label):
+    """Latency report for matched events: Qt to page, page to painted, and total"""
+    total = [r["painted_ms"] - qt_ms for _, qt_ms, r in matches]
+    report = {
+        "label": label,
+        "total": summarize(total),
+        "qt_to_page": summarize([r["event_ms"] - qt_ms for _, qt_ms, r in matches]),
+        "page_to_paint": summarize([r["painted_ms"] - r["event_ms"] for _, _, r in matches]),
+        "by_kind": {},
+        "histogram": build_histogram(total),
+    }
+    for kind in sorted({kind for kind, _, _ in matches}):
+        report["by_kind"][kind] = summarize([r["painted_ms"] - qt_ms for k, qt_ms, r in matches if k == kind])
+    return report
+
+
+def format_report(report):
+    total = report["total"]
+    if not total["count"]:
+        return f"⌨️ Input latency ({report['label']}): no events matched"
+    lines = [f"⌨️ Input latency ({report['label']}): {total['count']} events, "
+             f"p50 {total['p50_ms']:.1f} ms, p95 {total['p95_ms']:.1f} ms, max {total['max_ms']:.1f} ms "
+             f"(Qt→page p50 {report['qt_to_page']['p50_ms']:.1f} ms, "
+             f"page→paint p50 {report['page_to_paint']['p50_ms']:.1f} ms)"]
+    widest = max(count for _, count in report["histogram"])
+    for label, count in report["histogram"]:
+        bar = "█" * round(30 * count / widest) if widest else ""
+        lines.append(f"    {label:>11} | {bar} {count}")
+    return "\n".join(lines)
+
+
+class InputLatencyProbe(QObject):
+    """Measures input-to-screen latency of the game view on request"""
+    report_ready = pyqtSignal(object)
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.target = None  # widget that receives the view's input
+        self.active = False
+        self.source = "real"
+        self.qt_events = []  # (kind, ms on the page clock)
+        self.matches = []
+        self.clock_offset = None  # page clock minus perf_counter, in ms
+        self.clock_error = None
+        self.clock_samples = []
+        self.synthetic_left = 0
+
+        self.drain_timer = QTimer(self)
+        self.drain_timer.setInterval(DRAIN_INTERVAL_MS)
+        self.drain_timer.timeout.connect(self.drain)
+        self.synthetic_timer = QTimer(self)
+        self.synthetic_timer.timeout.connect(self.send_synthetic)
+
+    def install(self, ok=True):
+        """Add the page listeners if a measurement is running when a document loads"""
+        if ok and self.active:
+            self.view.page().runJavaScript(PAGE_SCRIPT)
+            # A new document has a new time origin
+            self.clock_offset = None
+            self.clock_samples = []
+            self.sync_clock()
+
+    def start(self, source="real"):
+        """Start timestamping input; stop() returns and prints the histogram"""
+        if self.active:
+            return
+        self.active = True
+        self.source = source
+        self.qt_events = []
+        self.matches = []
+        self.clock_offset = None
+        self.clock_samples = []
+        # Chromium takes input through the view's focus proxy, so stamp it there
+        self.target = self.view.focusProxy() or self.view
+        self.target.installEventFilter(self)
+        self.view.page().runJavaScript(PAGE_SCRIPT)
+        self.view.page().runJavaScript(DRAIN_SCRIPT)  # Drop records from an earlier run
+        self.sync_clock()
+        self.drain_timer.start()
+        print(f"⌨️ Measuring input latency ({source} input)...")
+
+    def stop(self):
+        self.synthetic_timer.stop()
+        self.drain_timer.stop()
+        if not self.active:
+            return None
+        self.active = False
+        if self.target is not None:
+            try:
+                self.target.removeEventFilter(self)
+            except RuntimeError:
+                pass  # Focus proxy replaced with the page
+            self.target = None
+        report = self.get_report()
+        print(format_report(report))
+        self.report_ready.emit(report)
+        return report
+
+    def toggle(self):
+        if self.active:
+            self.drain(then_stop=True)
+        else:
+            self.start()
+
+    def run_synthetic(self, count=40, interval_ms=100):
+        """Send count harmless key presses and report when they have been painted"""
+        self.start("synthetic")
+        self.synthetic_left = count
+        self.synthetic_timer.start(interval_ms)
+
+    def send_synthetic(self):
+        if self.synthetic_left <= 0 or self.target is None:
+            self.synthetic_timer.stop()
+            # Leave time for the last frames to be painted
+            QTimer.singleShot(DRAIN_INTERVAL_MS, lambda: self.drain(then_stop=True))
+            return
+        if self.clock_offset is None:
+            return  # Wait for the clock sync
+        self.synthetic_left -= 1
+        for event_type in (QEvent.Type.KeyPress, QEvent.Type.KeyRelease):
+            event = QKeyEvent(event_type, SYNTHETIC_KEY, Qt.KeyboardModifier.NoModifier)
+            QCoreApplication.sendEvent(self.target, event)
+
+    def sync_clock(self):
+        """Estimate the page clock offset from the quickest of a few round trips"""
+        if len(self.clock_samples) >= CLOCK_SAMPLES:
+            rtt, offset = min(self.clock_samples)
+            self.clock_offset, self.clock_error = offset, rtt / 2
+            return
+        sent = time.perf_counter() * 1000
+
+        def on_clock(page_ms):
+            if not isinstance(page_ms, (int, float)) or not self.active:
+                return
+            received = time.perf_counter() * 1000
+            self.clock_samples.append((received - sent, page_ms - (sent + received) / 2))
+            self.sync_clock()
+
+        self.view.page().runJavaScript(CLOCK_SCRIPT, on_clock)
+
+    def eventFilter(self, obj, event):
+        kind = QT_EVENT_KINDS.get(event.type())
+        if kind is not None and self.clock_offset is not None:
+            self.qt_events.append((kind, time.perf_counter() * 1000 + self.clock_offset))
+        return False
+
+    def drain(self, then_stop=False):
+        """Collect the page's records and pair them with the Qt timestamps"""
+        def on_records(records):
+            if isinstance(records, list):
+                self.matches.extend(match_events(self.qt_events, records, max(2.0, self.clock_error or 0)))
+            if then_stop:
+                self.stop()
+
+        try:
+            self.view.page().runJavaScript(DRAIN_SCRIPT, on_records)
+        except RuntimeError:
+            self.stop()
+
+    def get_report(self):
+        zoom = self.view.zoomFactor()
+        label = f"{self.source}, zoom {zoom * 100:.0f}%, {performance_presets.get_active_preset()}"
+        report = build_report(self.matches, label)
+        report["zoom"] = zoom
+        report["clock_error_ms"] = self.clock_error
+        return report
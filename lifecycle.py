@@ -0,0 +1,202 @@
+# lifecycle.py
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+from procstats import read_rss_bytes, format_bytes
+import tool_manifest
+import config
+import time
+
+# QWebEnginePage.LifecycleState names. States are handled by name so this module
+# does not have to import QtWebEngine before a page exists.
+ACTIVE = "Active"
+FROZEN = "Frozen"
+DISCARDED = "Discarded"
+
+# How often hidden pages are checked, in milliseconds
+CHECK_INTERVAL_MS = 5000
+
+# How long to wait after a discard before measuring what the renderer gave back
+RECLAIM_SAMPLE_DELAY_MS = 2000
+
+# Ordering used to compare a target state against Chromium's recommendation
+STATE_ORDER = {
+    ACTIVE: 0,
+    FROZEN: 1,
+    DISCARDED: 2,
+}
+
+
+def get_state(page):
+    """Return the lifecycle state name of a page"""
+    return page.lifecycleState().name
+
+
+class PageLifecycleManager(QObject):
+    """Freezes and discards background tool pages once they have been hidden long enough"""
+    state_changed = pyqtSignal(object, str)  # page, state name
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pages = {}  # page -> {"title", "policy", "hidden_since", "last_active"}
+        self.reclaimed_bytes = 0
+        self.freeze_count = 0
+        self.discard_count = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_pages)
+        self.timer.start(CHECK_INTERVAL_MS)
+
+    def register(self, page, title):
+        """Start tracking a tool page. The game page must never be registered here."""
+        now = time.monotonic()
+        self.pages[page] = {
+            "title": title,
+            "policy": tool_manifest.get_manifest().get_policy(title),
+            "hidden_since": None if page.isVisible() else now,
+            "last_active": now,
+        }
+        # Pooled pages are registered again each time they are borrowed
+        if not getattr(page, "lifecycle_connected", False):
+            page.lifecycle_connected = True
+            page.visibleChanged.connect(lambda visible, p=page: self.on_visibility_changed(p, visible))
+            page.destroyed.connect(lambda *args, p=page: self.unregister(p))
+
+    def unregister(self, page):
+        """Stop tracking a page"""
+        self.pages.pop(page, None)
+
+    def touch(self, page):
+        """Mark a page as just used and bring it back to Active if needed"""
+        info = self.pages.get(page)
+        if info is None:
+            return
+        info["last_active"] = time.monotonic()
+        if page.isVisible():
+            info["hidden_since"] = None
+        self.restore(page)
+
+    def restore(self, page):
+        """Return a frozen or discarded page to Active"""
+        try:
+            if get_state(page) != ACTIVE:
+                page.setLifecycleState(page.LifecycleState.Active)
+                title = self.pages.get(page, {}).get("title", "page")
+                print(f"☀️ Restored tool page: {title}")
+                self.state_changed.emit(page, ACTIVE)
+        except RuntimeError:
+            # Underlying page already deleted
+            self.unregister(page)
+
+    def on_visibility_changed(self, page, visible):
+        """Track when a page goes to the background and wake it when it returns"""
+        info = self.pages.get(page)
+        if info is None:
+            return
+        now = time.monotonic()
+        if visible:
+            info["hidden_since"] = None
+            info["last_active"] = now
+            self.restore(page)
+        elif info["hidden_since"] is None:
+            info["hidden_since"] = now
+            info["last_active"] = now
+
+    def is_allowed(self, page, target):
+        """Whether the tool's manifest policy lets its page be frozen or discarded"""
+        info = self.pages.get(page)
+        if info is None:
+            return True
+        policy = info["policy"]
+        return policy.discard if target == DISCARDED else policy.freeze
+
+    def get_timeouts(self):
+        """Return (freeze_after, discard_after) in seconds from config"""
+        try:
+            freeze_after = float(config.get_config_value("hibernate_freeze_after", 60))
+            discard_after = float(config.get_config_value("hibernate_discard_after", 600))
+        except (ValueError, TypeError):
+            freeze_after, discard_after = 60.0, 600.0
+        return freeze_after, max(freeze_after, discard_after)
+
+    def check_pages(self):
+        """Move pages that have been hidden long enough to a deeper lifecycle state"""
+        if not config.get_config_value("hibernate_enabled", True):
+            return
+
+        freeze_after, discard_after = self.get_timeouts()
+        now = time.monotonic()
+        for page, info in list(self.pages.items()):
+            if info["hidden_since"] is None:
+                continue
+            hidden_for = now - info["hidden_since"]
+            if hidden_for >= discard_after and self.is_allowed(page, DISCARDED):
+                self.set_state(page, DISCARDED)
+            elif hidden_for >= freeze_after:
+                self.set_state(page, FROZEN)
+
+    def set_state(self, page, target, force=False):
+        """Apply a lifecycle state if the page and its tool allow it; returns True if it changed"""
+        if not self.is_allowed(page, target):
+            return False
+        try:
+            if page.isVisible():
+                return False
+            if STATE_ORDER[get_state(page)] >= STATE_ORDER[target]:
+                return False
+            # Chromium knows about audio, devtools and similar reasons to keep a page alive
+            if not force and STATE_ORDER[page.recommendedState().name] < STATE_ORDER[target]:
+                return False
+
+            title = self.pages.get(page, {}).get("title", "page")
+            pid = page.renderProcessPid()
+            rss_before = read_rss_bytes(pid)
+            page.setLifecycleState(getattr(page.LifecycleState, target))
+        except RuntimeError:
+            self.unregister(page)
+            return False
+
+        if target == DISCARDED:
+            self.discard_count += 1
+            print(f"🗑️ Discarded tool page: {title}")
+            self.state_changed.emit(page, DISCARDED)
+            if rss_before is not None:
+                QTimer.singleShot(RECLAIM_SAMPLE_DELAY_MS,
+                                  lambda: self.record_reclaimed(pid, rss_before))
+        else:
+            self.freeze_count += 1
+            print(f"💤 Froze tool page: {title}")
+            self.state_changed.emit(page, FROZEN)
+        return True
+
+    def discard(self, page, force=False):
+        """Discard a hidden page right away, regardless of idle time"""
+        if page not in self.pages:
+            return False
+        return self.set_state(page, DISCARDED, force)
+
+    def record_reclaimed(self, pid, rss_before):
+        """Add the renderer memory released by a discard to the running total"""
+        rss_after = read_rss_bytes(pid) or 0
+        freed = max(0, rss_before - rss_after)
+        self.reclaimed_bytes += freed
+        print(f"Reclaimed {format_bytes(freed)} (total {format_bytes(self.reclaimed_bytes)})")
+
+    def get_stats(self):
+        """Return counters for display"""
+        return {
+            "tracked": len(self.pages),
+            "frozen": self.freeze_count,
+            "discarded": self.discard_count,
+            "reclaimed_bytes": self.reclaimed_bytes,
+        }
+
+
+_manager = None
+
+
+def get_manager():
+    """Return the process-wide lifecycle manager"""
+    global _manager
+    if _manager is None:
+        _manager = PageLifecycleManager(QApplication.instance())
+    return _manager
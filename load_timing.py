@@ -0,0 +1,266 @@
+# load_timing.py
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QLabel
+import config
+import atexit
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+LOG_FILE = "load_timing.jsonl"
+
+# Navigation Timing and a Resource Timing summary for the current document, in ms
+# since navigation start. Cross-origin resources without Timing-Allow-Origin report
+# no sizes and are counted as opaque.
+TIMING_SCRIPT = """
+(function() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    var resources = performance.getEntriesByType('resource');
+    var result = {resources: resources.length, transfer_bytes: 0, body_bytes: 0,
+                  cached: 0, revalidated: 0, fetched: 0, opaque: 0};
+    if (nav) {
+        result.dns_ms = nav.domainLookupEnd - nav.domainLookupStart;
+        result.connect_ms = nav.connectEnd - nav.connectStart;
+        result.tls_ms = nav.secureConnectionStart > 0 ? nav.connectEnd - nav.secureConnectionStart : 0;
+        result.ttfb_ms = nav.responseStart - nav.startTime;
+        result.dom_content_loaded_ms = nav.domContentLoadedEventEnd - nav.startTime;
+        result.load_ms = (nav.loadEventEnd || nav.loadEventStart || performance.now()) - nav.startTime;
+        result.transfer_bytes += nav.transferSize || 0;
+        result.body_bytes += nav.encodedBodySize || 0;
+        result.document_cached = nav.transferSize === 0 && nav.encodedBodySize > 0;
+    }
+    for (var i = 0; i < resources.length; i++) {
+        var r = resources[i];
+        result.transfer_bytes += r.transferSize || 0;
+        result.body_bytes += r.encodedBodySize || 0;
+        if (!r.encodedBodySize) result.opaque++;
+        else if (r.transferSize === 0) result.cached++;
+        else if (r.transferSize < r.encodedBodySize) result.revalidated++;
+        else result.fetched++;
+    }
+    return result;
+})()
+"""
+
+SUMMARY_COLUMNS = ["Page", "Loads", "Load p50", "Load p95", "TTFB p50", "First load", "Cache hits", "Size p50"]
+
+
+def is_enabled():
+    return bool(config.get_config_value("load_timing_enabled", True))
+
+
+def get_cache_hit_ratio(record):
+    """Share of measurable resources served from cache (revalidations count as hits)"""
+    hits = record.get("cached", 0) + record.get("revalidated", 0)
+    total = hits + record.get("fetched", 0)
+    return hits / total if total else None
+
+
+class TimingLog:
+    """Append-only JSONL log capped at max_bytes, with one rotated file kept.
+    Records are written from a background thread, off the GUI thread."""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = []  # serialized records waiting for the writer
+        self._write_lock = threading.Lock()  # serializes file access
+        self._closed = False
+        self._worker = None
+
+    def get_rotated_path(self):
+        return self.path + ".1"
+
+    def append(self, record):
+        """Queue a record for the writer thread"""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._pending.append(line)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="LoadTimingWriter", daemon=True)
+                self._worker.start()
+                atexit.register(self.close)
+            self._wakeup.notify()
+
+    def _run(self):
+        """Writer thread: wait for records, then write everything queued"""
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write queued records synchronously"""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            for line in lines:
+                self._write_line(line)
+
+    def _write_line(self, line):
+        """Append one line, rotating first if it would pass max_bytes (caller holds the write lock)"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                os.replace(self.path, self.get_rotated_path())
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Error writing load timing log: {e}")
+
+    def close(self):
+        """Write queued records and stop the writer thread"""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+
+    def read(self):
+        """Return every record on disk or queued, oldest first"""
+        self.flush()
+        records = []
+        with self._write_lock:
+            for path in (self.get_rotated_path(), self.path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                records.append(json.loads(line))
+                            except ValueError:
+                                pass  # Line cut short by a crash
+                except OSError:
+                    pass
+        return records
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+
+def summarize(records):
+    """Per-page load statistics, slowest median load first"""
+    pages = {}
+    for record in records:
+        pages.setdefault(record.get("page", "?"), []).append(record)
+    summary = []
+    for page, entries in pages.items():
+        loaded = [r for r in entries if r.get("ok") and r.get("load_ms") is not None]
+        ratios = [ratio for ratio in map(get_cache_hit_ratio, loaded) if ratio is not None]
+        summary.append({
+            "page": page,
+            "loads": len(entries),
+            "failed": len(entries) - len([r for r in entries if r.get("ok")]),
+            "load_p50_ms": percentile([r["load_ms"] for r in loaded], 0.5),
+            "load_p95_ms": percentile([r["load_ms"] for r in loaded], 0.95),
+            "ttfb_p50_ms": percentile([r["ttfb_ms"] for r in loaded if r.get("ttfb_ms") is not None], 0.5),
+            "first_load_p50_ms": percentile([r["load_ms"] for r in loaded if r.get("first")], 0.5),
+            "cache_hit_ratio": sum(ratios) / len(ratios) if ratios else None,
+            "bytes_p50": percentile([r.get("transfer_bytes", 0) for r in loaded], 0.5),
+        })
+    summary.sort(key=lambda s: s["load_p50_ms"] or 0, reverse=True)
+    return summary
+
+
+def format_record(record):
+    if not record.get("ok"):
+        return f"⏱️ {record['page']} failed to load"
+    if record.get("load_ms") is None:
+        return f"⏱️ {record['page']} loaded (no navigation timing)"
+    ratio = get_cache_hit_ratio(record)
+    cache = f", {ratio * 100:.0f}% cached" if ratio is not None else ""
+    return (f"⏱️ {record['page']} loaded: TTFB {record['ttfb_ms']:.0f} ms, "
+            f"DOMContentLoaded {record['dom_content_loaded_ms']:.0f} ms, load {record['load_ms']:.0f} ms, "
+            f"{int(record['transfer_bytes']) // 1024} KB{cache}")
+
+
+_log = None
+_seen_pages = set()  # pages loaded at least once this session
+
+
+def get_log():
+    """Return the load timing log in the cache folder, creating it on first use"""
+    global _log
+    if _log is None:
+        root = config.get_config_value("cache_root") or config.get_data_dir()
+        try:
+            max_bytes = int(config.get_config_value("load_timing_log_kb", 512)) * 1024
+        except (ValueError, TypeError):
+            max_bytes = 512 * 1024
+        _log = TimingLog(os.path.join(os.path.abspath(os.path.expanduser(root)), LOG_FILE), max_bytes)
+    return _log
+
+
+def collect(page, label, ok=True, background=False):
+    """Read the finished load's timings from the page and log them"""
+    url = page.url()
+    if not is_enabled() or url.scheme() in ("about", "data", ""):
+        return
+    parts = urllib.parse.urlsplit(url.toString())
+    record = {
+        "time": round(time.time(), 3),
+        "page": label,
+        "url": f"{parts.scheme}://{parts.netloc}{parts.path}",  # Queries may hold session data
+        "ok": ok,
+        "first": label not in _seen_pages,
+        "background": background,
+    }
+    _seen_pages.add(label)
+
+    def on_timing(result):
+        if isinstance(result, dict):
+            record.update({key: round(value, 1) if isinstance(value, float) else value
+                           for key, value in result.items()})
+        print(format_record(record))
+        get_log().append(record)
+
+    try:
+        page.runJavaScript(TIMING_SCRIPT, on_timing)
+    except RuntimeError:
+        pass  # Page deleted
+
+
+class LoadTimingDialog(QDialog):
+    """Per-page load times from the timing log"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Page load times")
+        self.resize(720, 360)
+        layout = QVBoxLayout(self)
+
+        records = get_log().read()
+        summary = summarize(records)
+        layout.addWidget(QLabel(f"{len(records)} loads in {get_log().path}"))
+
+        tree = QTreeWidget()
+        tree.setColumnCount(len(SUMMARY_COLUMNS))
+        tree.setHeaderLabels(SUMMARY_COLUMNS)
+        tree.setRootIsDecorated(False)
+        tree.setUniformRowHeights(True)
+
+        def ms(value):
+            return f"{value:.0f} ms" if value is not None else "-"
+
+        for entry in summary:
+            loads = str(entry["loads"]) + (f" ({entry['failed']} failed)" if entry["failed"] else "")
+            ratio = entry["cache_hit_ratio"]
+            tree.addTopLevelItem(QTreeWidgetItem([
+                entry["page"], loads, ms(entry["load_p50_ms"]), ms(entry["load_p95_ms"]),
+                ms(entry["ttfb_p50_ms"]), ms(entry["first_load_p50_ms"]),
+                f"{ratio * 100:.0f}%" if ratio is not None else "-",
+                f"{int(entry['bytes_p50']) // 1024} KB" if entry["bytes_p50"] is not None else "-",
+            ]))
+        for column in range(len(SUMMARY_COLUMNS)):
+            tree.resizeColumnToContents(column)
+        layout.addWidget(tree)
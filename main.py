@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 # main.py
+from startup_timing import mark
 import sys
+import single_instance
+
+# A second launch hands its request (focus, --tool, --url) to the running kit
+# and exits before loading any UI code or starting a second web engine
+if __name__ == "__main__" and single_instance.forward_to_running(sys.argv[1:]):
+    sys.exit(0)
+
 import traceback
 import os
 from PyQt6.QtWidgets import QApplication, QMessageBox
@@ -9,11 +17,31 @@ from PyQt6.QtGui import QFont
 
 # Import your main window class
 from main_window import MainWindow
+import performance_presets
+
+mark("imports_done")
 
 def main():
     try:
+        # Chromium reads its switches once, when the web engine starts
+        performance_presets.apply_chromium_flags()
+
+        # The kit's URL schemes must be registered before QApplication exists.
+        # This loads the QtWebEngineCore library; the engine itself still starts
+        # after the window's first paint.
+        try:
+            import url_schemes
+            url_schemes.register_all()
+        except ImportError as e:
+            print(f"⚠️ Could not register the kit's URL schemes: {e}")
+
+        # QtWebEngine is imported lazily after the app exists, which requires
+        # shared OpenGL contexts to be requested up front
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+        
         # Create QApplication instance
         app = QApplication(sys.argv)
+        mark("app_created")
         
         # Set application properties
         app.setApplicationName("2004Scape Toolkit")
@@ -29,12 +57,41 @@ def main():
         except Exception as font_error:
             print(f"Warning: Could not load RuneScape font: {font_error}")
         
+        # Claim the instance before the web engine can touch the profiles
+        instance_server = None
+        if single_instance.is_enabled():
+            instance_server = single_instance.InstanceServer(parent=app)
+            if not instance_server.listen():
+                # Another kit won the race to start; hand it our request instead
+                if single_instance.forward_to_running(sys.argv[1:]):
+                    return
+                instance_server = None
+        
         # Create and show main window
         main_window = MainWindow()
         main_window.show()
+        mark("window_shown")
+        
+        if instance_server is not None:
+            instance_server.request_received.connect(main_window.handle_instance_request)
+        request = single_instance.parse_request(sys.argv[1:])
+        if request["action"] != single_instance.FOCUS:
+            main_window.handle_instance_request(request)
         
         # Start the application event loop
-        sys.exit(app.exec())
+        exit_code = app.exec()
+
+        # Chromium writes cookies and local storage out as its pages, profiles and
+        # finally the engine itself shut down; only then can the RAM cache copy them
+        import ram_cache
+        ram = ram_cache.get_active()
+        if ram is not None:
+            import profiles
+            from PyQt6 import sip
+            profiles.close_all()
+            sip.delete(app)
+            ram.close()
+        sys.exit(exit_code)
         
     except ImportError as e:
         error_msg = f"Import Error: {e}\n\nMissing required modules. Please install:\npip install PyQt6 PyQt6-WebEngine"
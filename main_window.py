@@ -1,17 +1,23 @@
 # main_window.py
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QSplitter, 
-                             QVBoxLayout, QTabWidget)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QIcon
-from game_view import GameViewWidget
+                             QVBoxLayout, QTabWidget, QMenu)
+from PyQt6.QtCore import Qt, QTimer, QUrl
+from PyQt6.QtGui import QFont, QIcon, QKeySequence, QShortcut
 from right_panel import RightToolsPanel, InGameBrowser
+from startup_timing import mark
+from game_dock import GameHost, PictureInPictureWindow, get_view_mode, TABS_MODE, SPLIT_MODE
+import memory_watchdog
+import tool_sessions
 import config
-from styles import MAIN_STYLESHEET
+from styles import MAIN_STYLESHEET, get_icon_path
 import os
 
 
+GAME_URL = "https://2004.lostcity.rs/serverlist?lores.x=55&lores.y=62&method=0"
+
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, game_url=GAME_URL):
         super().__init__()
         self.setWindowTitle("2004Kit")
         
@@ -68,20 +74,47 @@ class MainWindow(QMainWindow):
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self.close_browser_tab)
         
-        # Game view tab (always present)
-        self.game_view = GameViewWidget("https://2004.lostcity.rs/serverlist?lores.x=55&lores.y=62&method=0")
-        self.game_view.setZoomFactor(self.config.get("zoom_factor", 1.0))
-        self.tab_widget.addTab(self.game_view, "⚔️ LostCity")
+        # Right-clicking a tool tab offers to move it into its own window
+        self.tab_widget.tabBar().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tab_widget.tabBar().customContextMenuRequested.connect(self.show_tab_menu)
+        
+        # Game tab (always present). A lightweight splash holds its place until
+        # the web engine is started after the window has painted once.
+        self.game_url = game_url
+        self.game_view = None
+        self.frame_probe = None
+        self.game_tab = GameHost("⚔️ Starting 2004Scape...")
+        self.game_splash = self.game_tab.placeholder
+        self.game_splash.setStyleSheet("font-size: 20px; font-weight: bold;")
+        self.game_host = self.game_tab
+        self.tab_widget.addTab(self.game_tab, "⚔️ LostCity")
         
         # Make game tab unclosable
         self.tab_widget.tabBar().setTabButton(0, self.tab_widget.tabBar().ButtonPosition.RightSide, None)
         
-        left_layout.addWidget(self.tab_widget)
+        # In split view the game sits beside the tabs while a tool tab is in
+        # front, so Chromium keeps rendering it at full rate
+        self.game_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.split_host = GameHost()
+        self.split_host.hide()
+        self.game_splitter.addWidget(self.split_host)
+        self.game_splitter.addWidget(self.tab_widget)
+        self.game_splitter.splitterMoved.connect(self.on_game_splitter_moved)
+        self.pip_window = None
+        self.tools_preloaded = False
+        self.current_tab_title = self.tab_widget.tabText(0)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        
+        left_layout.addWidget(self.game_splitter)
         self.splitter.addWidget(self.left_widget)
 
         # Right side: Tools panel
         self.tools_panel = RightToolsPanel()
         self.tools_panel.browser_requested.connect(self.open_browser_tab)
+        self.tools_panel.view_mode_changed.connect(self.set_tool_view_mode)
+        self.tools_panel.dock_requested.connect(
+            lambda view, url, title: self.open_browser_tab(url, title, view))
+        self.tools_panel.open_external_changed.connect(self.on_open_external_changed)
         self.splitter.addWidget(self.tools_panel)
 
         # Set initial splitter sizes
@@ -95,36 +128,222 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(self.splitter)
         self.setCentralWidget(central_widget)
+
+        # Game shortcuts live here: keys typed in the game go to Chromium's focus
+        # proxy, not the view, and the game may be in the picture-in-picture window
+        self.frame_overlay_shortcut = QShortcut(QKeySequence("Ctrl+Shift+F"), self)
+        self.frame_overlay_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        self.frame_overlay_shortcut.activated.connect(self.toggle_frame_overlay)
+        self.input_latency_shortcut = QShortcut(QKeySequence("Ctrl+Shift+L"), self)
+        self.input_latency_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        self.input_latency_shortcut.activated.connect(self.toggle_input_latency)
+        
+        # Open tool tabs and windows, keyed by tool id
+        self.sessions = tool_sessions.get_manager()
+        
+        # Watch renderer memory and keep tool pages under budget
+        self.watchdog = memory_watchdog.get_watchdog()
+        self.watchdog.start()
+        
+        self.first_paint_done = False
+        mark("window_constructed")
+
+    def paintEvent(self, event):
+        """Start the web engine once the window shell has been painted"""
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            mark("first_paint")
+            QTimer.singleShot(0, self.init_game_view)
+
+    def init_game_view(self):
+        """Create the game view, which starts the web engine, and swap out the splash"""
+        if self.game_view is not None:
+            return
+        # Importing game_view loads QtWebEngine, so keep it out of startup
+        try:
+            from game_view import GameViewWidget
+        except ImportError as e:
+            print(f"❌ Could not load the web engine: {e}")
+            self.game_splash.setText(
+                f"❌ Could not load the web engine:\n{e}\n\npip install PyQt6 PyQt6-WebEngine"
+            )
+            return
+        
+        self.game_view = GameViewWidget(self.game_url)
+        self.game_view.setZoomFactor(self.config.get("zoom_factor", 1.0))
+        self.game_view.render_process_crashed.connect(self.recover_game_view)
+        self.game_view.page().loadFinished.connect(self.on_game_load_finished)
+        
+        # Replace the splash in the first tab
+        self.game_tab.set_widget(self.game_view)
+        self.game_splash.setStyleSheet("font-size: 16px;")
+        self.place_game_view()
         
-        # Track browser tabs
-        self.browser_tabs = {}
+        self.frame_probe = self.game_view.frame_probe
+        self.watchdog.watch_game(self.game_view.page())
+        mark("web_engine_started")
+        
+        # Pre-warm tool views once the game has its head start
+        import view_pool
+        QTimer.singleShot(0, view_pool.get_pool().fill)
+        self.tools_panel.enable_prefetch()
+
+    def on_game_load_finished(self, ok):
+        """Record time to the first game load and start the manifest's preloads"""
+        if ok:
+            mark("game_loaded")
+            if not self.tools_preloaded:
+                self.tools_preloaded = True
+                self.tools_panel.preload_tools()
+                # Pre-fetch a new client version, if any, for the next launch
+                import game_asset_scheme
+                QTimer.singleShot(game_asset_scheme.WARM_DELAY_MS, game_asset_scheme.start_warm)
+
+    def toggle_frame_overlay(self):
+        if self.game_view is not None:
+            self.game_view.toggle_frame_overlay()
+
+    def toggle_input_latency(self):
+        if self.game_view is not None:
+            self.game_view.toggle_input_latency()
+
+    def recover_game_view(self):
+        """Reload the game after its renderer died, without restarting the app"""
+        print("🔄 Reloading game after renderer termination...")
+        # Reload from the event loop rather than inside the termination signal
+        QTimer.singleShot(0, lambda: self.game_view.setUrl(QUrl(self.game_url)))
+
+    def set_tool_view_mode(self, mode):
+        """Switch between tabs, split view and picture-in-picture for the game"""
+        config.set_config_value("tool_view_mode", mode)
+        self.place_game_view()
+
+    def on_tab_changed(self, index):
+        """Move the game if needed and measure its frame pacing across the switch"""
+        previous_title = self.current_tab_title
+        self.current_tab_title = self.tab_widget.tabText(index)
+        widget = self.tab_widget.widget(index)
+        if hasattr(widget, "tool_id"):
+            self.sessions.touch(widget.tool_id)
+        if self.game_view is None:
+            return
+        self.place_game_view()
+        if self.frame_probe is not None:
+            self.frame_probe.measure_switch(
+                f"{previous_title} → {self.current_tab_title} ({get_view_mode()})")
 
-    def open_browser_tab(self, url, title):
-        """Open a tool in a new tab within the main window"""
+    def place_game_view(self):
+        """Put the game in its tab, beside the tabs, or in the floating window"""
+        if self.game_view is None:
+            return
+        mode = get_view_mode()
+        if self.tab_widget.currentIndex() <= 0 or mode == TABS_MODE:
+            host = self.game_tab
+        elif mode == SPLIT_MODE:
+            host = self.split_host
+        else:
+            host = self.get_pip_window()
+
+        if host is not self.game_host:
+            self.game_host.take_widget()
+            host.set_widget(self.game_view)
+            self.game_host = host
+
+        self.split_host.setVisible(host is self.split_host)
+        if host is self.split_host:
+            self.restore_split_sizes()
+        if self.pip_window is not None:
+            # Hiding rather than closing keeps the window's position for next time
+            self.pip_window.setVisible(host is self.pip_window)
+        self.game_tab.set_placeholder_text(
+            "⚔️ The game is shown beside the tools" if host is self.split_host
+            else "⚔️ The game is shown in a floating window")
+
+    def get_pip_window(self):
+        if self.pip_window is None:
+            self.pip_window = PictureInPictureWindow(self)
+            self.pip_window.closed.connect(self.on_pip_closed)
+        return self.pip_window
+
+    def on_pip_closed(self):
+        """Closing the floating window brings the game back to its tab"""
+        if self.game_host is self.pip_window:
+            self.tab_widget.setCurrentIndex(0)
+
+    def restore_split_sizes(self):
+        sizes = self.game_splitter.sizes()
+        if sizes and sizes[0] > 0:
+            return
+        total = sum(sizes) or self.left_widget.width()
+        try:
+            share = float(config.get_config_value("split_view_game_share", 0.6))
+        except (ValueError, TypeError):
+            share = 0.6
+        game_width = int(total * min(max(share, 0.2), 0.8))
+        self.game_splitter.setSizes([game_width, total - game_width])
+
+    def on_game_splitter_moved(self, pos, index):
+        """Remember how much of the split the game takes"""
+        sizes = self.game_splitter.sizes()
+        if len(sizes) >= 2 and sum(sizes) > 0:
+            config.set_config_value("split_view_game_share", sizes[0] / sum(sizes))
+
+    def handle_instance_request(self, request):
+        """Act on a request forwarded by a second launch of the kit"""
+        # Bring the window forward whatever was asked
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+        action = request.get("action")
+        if action == "open_tool":
+            name = request.get("tool", "")
+            manifest = self.tools_panel.manifest
+            tool = manifest.find(name) or manifest.get(name)
+            if tool is not None:
+                self.tools_panel.open_tool_clicked(tool.url, tool.name)
+                return
+            print(f"⚠️ Unknown tool requested: {name}")
+        elif action == "open_url":
+            url = QUrl(request.get("url", ""))
+            if url.isValid() and url.scheme() in ("http", "https"):
+                self.tools_panel.open_tool_clicked(url.toString(), url.host())
+            else:
+                print(f"⚠️ Ignoring URL request: {request.get('url')}")
+
+    def open_browser_tab(self, url, title, view=None):
+        """Open a tool in a new tab within the main window, optionally adopting a loaded view"""
         print(f"Opening browser tab: {title} - {url}")  # Debug print
         
         # Get icon for this tool
-        from styles import get_icon_path
         icon = get_icon_path(title)
         tab_title = f"{icon} {title}"
         
-        # Check if tab already exists
-        for i in range(self.tab_widget.count()):
-            if self.tab_widget.tabText(i) == tab_title:
-                self.tab_widget.setCurrentIndex(i)
-                return
+        # Already open in a tab or window: bring that one forward
+        tool_id = self.tools_panel.manifest.get_tool_id(title)
+        if self.sessions.focus(tool_id):
+            if view is not None:
+                # The moved page isn't needed twice
+                import view_pool
+                view_pool.get_pool().release(view)
+            return
         
         try:
             # Create new browser tab
-            browser = InGameBrowser(url, title)
+            browser = InGameBrowser(url, title, view=view)
+            browser.tool_id = tool_id
             browser.closed.connect(lambda: self.close_browser_by_widget(browser))
             
             # Add tab with proper icon
             tab_index = self.tab_widget.addTab(browser, tab_title)
             self.tab_widget.setCurrentIndex(tab_index)
             
-            # Store reference
-            self.browser_tabs[tab_index] = browser
+            self.sessions.add(tool_id, title, url, tool_sessions.TAB, browser,
+                              focus=lambda: self.tab_widget.setCurrentWidget(browser),
+                              close=lambda: self.close_browser_by_widget(browser))
             
         except Exception as e:
             print(f"Error creating browser tab: {e}")
@@ -137,42 +356,93 @@ class MainWindow(QMainWindow):
         widget = self.tab_widget.widget(index)
         if widget:
             # Remove from tracking
-            if index in self.browser_tabs:
-                del self.browser_tabs[index]
+            if hasattr(widget, "tool_id"):
+                self.sessions.remove(widget.tool_id, widget)
             
-            # Remove tab
+            # Remove tab, returning its web view to the pool
             self.tab_widget.removeTab(index)
+            if hasattr(widget, "release_view"):
+                widget.release_view()
             widget.deleteLater()
 
+    def show_tab_menu(self, pos):
+        """Context menu for tool tabs"""
+        index = self.tab_widget.tabBar().tabAt(pos)
+        if index <= 0:  # The game tab stays put
+            return
+        menu = QMenu(self)
+        action = menu.addAction("Move to window")
+        if menu.exec(self.tab_widget.tabBar().mapToGlobal(pos)) == action:
+            self.detach_tab(index)
+
+    def detach_tab(self, index):
+        """Move a tool tab's live page into its own window"""
+        widget = self.tab_widget.widget(index)
+        if not hasattr(widget, "take_view"):
+            return
+        view = widget.take_view()
+        self.close_browser_tab(index)
+        if view is not None:
+            self.tools_panel.open_tool_window(widget.url, widget.title, view)
+
+    def on_open_external_changed(self, external):
+        """Move open tool tabs into windows when separate windows are switched on"""
+        if not external:
+            return  # The tools panel docks its windows itself
+        for index in range(self.tab_widget.count() - 1, 0, -1):
+            self.detach_tab(index)
+
     def close_browser_by_widget(self, browser_widget):
         """Close browser tab by widget reference"""
-        for i in range(self.tab_widget.count()):
-            if self.tab_widget.widget(i) == browser_widget:
-                self.close_browser_tab(i)
-                break
+        index = self.tab_widget.indexOf(browser_widget)
+        if index > 0:
+            self.close_browser_tab(index)
 
     def on_splitter_moved(self, pos, index):
         """Save splitter position to config"""
         sizes = self.splitter.sizes()
         if len(sizes) >= 2:
-            self.config["right_panel_width"] = sizes[1]
-            config.save_config(self.config)
+            config.set_config_value("right_panel_width", sizes[1])
 
     def closeEvent(self, event):
         """Save window state when closing"""
         # Save window geometry
         geom = self.geometry()
-        self.config["window_geometry"] = [geom.x(), geom.y(), geom.width(), geom.height()]
+        config.set_config_value("window_geometry", [geom.x(), geom.y(), geom.width(), geom.height()])
         
         # Save zoom factor
-        self.config["zoom_factor"] = self.game_view.zoom_factor
+        if self.game_view is not None:
+            config.set_config_value("zoom_factor", self.game_view.zoom_factor)
         
         # Save splitter sizes
         sizes = self.splitter.sizes()
         if len(sizes) >= 2:
-            self.config["right_panel_width"] = sizes[1]
+            config.set_config_value("right_panel_width", sizes[1])
+        
+        # The floating game window goes with the main window
+        if self.pip_window is not None:
+            self.pip_window.closed.disconnect(self.on_pip_closed)
+            self.pip_window.close()
+        
+        # Stop the renderer sampler thread
+        self.watchdog.stop()
+        
+        # Drop pending offline cache fetches so they don't hold up exit
+        if self.game_view is not None:
+            import offline_scheme
+            import map_scheme
+            for handler in (offline_scheme.get_handler(), map_scheme.get_handler()):
+                if handler is not None:
+                    handler.shutdown()
+            import game_asset_scheme
+            game_asset_scheme.shutdown()
+            # The final RAM cache snapshot runs in main() once the web engine is down
+            import ram_cache
+            if ram_cache.get_active() is not None:
+                ram_cache.get_active().stop()
         
-        config.save_config(self.config)
+        # Make sure everything queued by the debounced writer hits the disk
+        config.flush_config()
         event.accept()
 
     def resizeEvent(self, event):
@@ -180,7 +450,7 @@ class MainWindow(QMainWindow):
         super().resizeEvent(event)
         # Maintain right panel width ratio
         if hasattr(self, 'splitter'):
-            panel_width = self.config.get("right_panel_width", 250)
+            panel_width = config.get_config_value("right_panel_width", 250)
             total_width = self.width()
             game_width = max(400, total_width - panel_width)  # Minimum game width
             self.splitter.setSizes([game_width, panel_width])
@@ -0,0 +1,299 @@
+# map_scheme.py
+from PyQt6.QtWebEngineCore import QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+from PyQt6.QtCore import QIODevice, QTimer, QUrl, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from tile_pack import TilePack
+import offline_scheme
+import config
+import url_schemes
+import os
+import re
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# The World Map page is loaded as kitmap://host/path so every same-origin tile
+# request reaches the pack instead of the network
+SCHEME = url_schemes.WORLD_MAP
+
+# Pending tiles are appended to the pack this often, and every N bulk downloads
+FLUSH_INTERVAL_MS = 30000
+BULK_FLUSH_EVERY = 256
+
+# Quoted strings and CSS url(...) values in the map's pages and scripts
+REFERENCE_PATTERN = re.compile(r"""["'(]([^"'()\s<>]{1,512})["')]""")
+TEXT_TYPES = ("text/", "javascript", "json")
+
+_handler = None
+
+
+def is_enabled():
+    return bool(config.get_config_value("world_map_pack_enabled", True))
+
+
+def map_url(url):
+    """Return the kitmap:// form of the World Map URL, leaving other URLs alone"""
+    prefix = config.get_config_value("world_map_url_prefix") or ""
+    if not is_enabled() or not prefix or not url.startswith(prefix):
+        return url
+    qurl = QUrl(url)
+    qurl.setScheme(SCHEME.decode())
+    return qurl.toString()
+
+
+def to_network_url(qurl):
+    network_url = QUrl(qurl)
+    network_url.setScheme("https")
+    return network_url.toString()
+
+
+def tile_key(qurl):
+    """Key a tile by path and query; the host is always the map's own"""
+    key = qurl.path()
+    if qurl.hasQuery():
+        key += "?" + qurl.query()
+    return key
+
+
+def is_tile(path):
+    pattern = config.get_config_value("world_map_tile_pattern") or ""
+    return bool(pattern) and re.search(pattern, path) is not None
+
+
+def find_tile_urls(page_url, body, content_type):
+    """Return the tile URLs a page, script or JSON file refers to on its own host"""
+    if not any(kind in (content_type or "") for kind in TEXT_TYPES):
+        return set()
+    host = urllib.parse.urlsplit(page_url).netloc
+    urls = set()
+    for reference in REFERENCE_PATTERN.findall(body.decode("utf-8", "replace")):
+        url = urllib.parse.urljoin(page_url, reference)
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == "https" and parts.netloc == host and is_tile(parts.path):
+            urls.add(urllib.parse.urlunsplit(parts._replace(fragment="")))
+    return urls
+
+
+def download(url, timeout=15):
+    """Fetch a URL, returning (body, content type); raises on failure"""
+    request = urllib.request.Request(url, headers={"User-Agent": "2004Kit"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        return response.read(), content_type.split(";")[0].strip()
+
+
+class MappedTileDevice(QIODevice):
+    """Read-only device over a slice of the pack's mmap, so tiles are never copied whole"""
+
+    def __init__(self, source, offset, length, parent=None):
+        super().__init__(parent)
+        self.source = source  # keeps the mapping alive while the job reads
+        self.start = offset
+        self.length = length
+
+    def isSequential(self):
+        return False
+
+    def size(self):
+        return self.length
+
+    def readData(self, maxlen):
+        position = self.pos()
+        end = min(self.length, position + maxlen)
+        return self.source[self.start + position:self.start + end]
+
+    def writeData(self, data):
+        return -1
+
+
+class WorldMapSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves World Map tiles from the tile pack and everything else from the offline cache"""
+    fetched = pyqtSignal(int, object)  # job token, (kind, payload)
+    bulk_progress = pyqtSignal(int, int)  # done, total
+
+    def __init__(self, pack_path, parent=None):
+        super().__init__(parent)
+        self.pack = TilePack(pack_path)
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="WorldMap")
+        self.bulk_thread = None
+        self.bulk_cancel = threading.Event()
+        self.jobs = offline_scheme.JobTracker()
+        self.discovered = set()  # tile URLs the map's pages refer to, found this session
+        self.discovered_lock = threading.Lock()
+        self.tile_hits = 0
+        self.tile_misses = 0
+        self.fetched.connect(self.on_fetched)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(lambda: self.executor.submit(self.pack.flush))
+        self.flush_timer.start(FLUSH_INTERVAL_MS)
+
+    def requestStarted(self, job):
+        if bytes(job.requestMethod()) != b"GET":
+            # offline_scheme.NetworkPassthrough sends these to the network before they get here
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        qurl = job.requestUrl()
+        if is_tile(qurl.path()):
+            key = tile_key(qurl)
+            located = self.pack.locate(key)
+            if located is not None:
+                self.tile_hits += 1
+                self.reply_slice(job, located)
+                return
+            self.tile_misses += 1
+            self.executor.submit(self.fetch_tile, self.jobs.add(job), key, to_network_url(qurl))
+        else:
+            self.executor.submit(self.fetch_page, self.jobs.add(job), to_network_url(qurl))
+
+    def reply_slice(self, job, located):
+        source, offset, length, content_type = located
+        device = MappedTileDevice(source, offset, length, job)
+        device.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(content_type.encode(), device)
+
+    def fetch_tile(self, token, key, url):
+        """Worker thread: download a missing tile once and keep it in the pack"""
+        try:
+            body, content_type = download(url)
+        except (urllib.error.URLError, OSError) as e:
+            self.fetched.emit(token, ("error", e))
+            return
+        self.pack.put(key, body, content_type)
+        self.fetched.emit(token, ("tile", self.pack.locate(key)))
+
+    def fetch_page(self, token, url):
+        """Worker thread: non-tile resources go through the offline content store"""
+        handler = offline_scheme.get_handler()
+        if handler is None:
+            try:
+                body, content_type = download(url)
+            except (urllib.error.URLError, OSError) as e:
+                self.fetched.emit(token, ("error", e))
+                return
+            self.discover(url, body, content_type)
+            self.fetched.emit(token, ("body", (body, content_type)))
+            return
+        result = handler.fetcher.fetch(url)
+        if result.redirect:
+            self.fetched.emit(token, ("redirect", result.redirect))
+        elif result.body is not None:
+            self.discover(url, result.body, result.content_type)
+            self.fetched.emit(token, ("body", (result.body, result.content_type)))
+        else:
+            self.fetched.emit(token, ("error", result.error))
+
+    def discover(self, url, body, content_type):
+        """Remember the tiles a map page or script refers to, for the bulk download"""
+        found = find_tile_urls(url, body, content_type)
+        if found:
+            with self.discovered_lock:
+                self.discovered.update(found)
+
+    def on_fetched(self, token, outcome):
+        """GUI thread: complete a request once its worker is done, if its page is still there"""
+        job = self.jobs.take(token)
+        if job is None:
+            return
+        kind, payload = outcome
+        if kind == "tile" and payload is not None:
+            self.reply_slice(job, payload)
+        elif kind == "body":
+            body, content_type = payload
+            content_type = (content_type or "application/octet-stream").split(";")[0].strip()
+            self.reply_slice(job, (body, 0, len(body), content_type))
+        elif kind == "redirect":
+            job.redirect(QUrl(map_url(payload)))
+        else:
+            print(f"World map could not load {job.requestUrl().toString()}: {payload}")
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+
+    def get_bulk_urls(self):
+        """Every tile of the map: the configured URL template expanded over its
+        ranges, or else the tile URLs found in the map's pages this session"""
+        template = config.get_config_value("world_map_bulk_template")
+        ranges = config.get_config_value("world_map_bulk_range") or {}
+        if not template:
+            with self.discovered_lock:
+                return sorted(self.discovered)
+
+        urls = [template]
+        for name, (low, high) in ranges.items():
+            urls = [url.replace("{" + name + "}", str(value))
+                    for url in urls for value in range(int(low), int(high) + 1)]
+        return urls
+
+    def has_bulk_source(self):
+        """Whether there is anything to download the whole map from"""
+        return bool(config.get_config_value("world_map_bulk_template")) or bool(self.discovered)
+
+    def start_bulk_download(self):
+        """Download the whole map into the pack in the background"""
+        if self.bulk_thread is not None and self.bulk_thread.is_alive():
+            return False
+        urls = self.get_bulk_urls()
+        if not urls:
+            print("🗺️ No world map tile URLs known: open the World Map or set world_map_bulk_template")
+            return False
+        self.bulk_cancel.clear()
+        self.bulk_thread = threading.Thread(target=self.bulk_download, args=(urls,),
+                                            name="WorldMapBulk", daemon=True)
+        self.bulk_thread.start()
+        print(f"🗺️ Downloading {len(urls)} world map tiles for offline use")
+        return True
+
+    def bulk_download(self, urls):
+        """Worker thread: fetch every tile not already in the pack"""
+        done = 0
+        downloaded = 0
+        skipped = 0
+        failed = 0
+        for url in urls:
+            if self.bulk_cancel.is_set():
+                break
+            key = tile_key(QUrl(url))
+            if key in self.pack:
+                skipped += 1
+            else:
+                try:
+                    body, content_type = download(url)
+                    self.pack.put(key, body, content_type)
+                    downloaded += 1
+                except (urllib.error.URLError, OSError):
+                    failed += 1
+            done += 1
+            if done % BULK_FLUSH_EVERY == 0:
+                self.pack.flush()
+                self.bulk_progress.emit(done, len(urls))
+        self.pack.flush()
+        self.bulk_progress.emit(done, len(urls))
+        status = "finished" if done == len(urls) else f"stopped after {done}/{len(urls)} tiles"
+        print(f"🗺️ World map download {status}: {downloaded} downloaded, "
+              f"{skipped} already stored, {failed} failed")
+
+    def get_stats(self):
+        stats = self.pack.get_stats()
+        stats.update({"hits": self.tile_hits, "misses": self.tile_misses})
+        return stats
+
+    def shutdown(self):
+        """Stop background work and write pending tiles"""
+        self.bulk_cancel.set()
+        self.flush_timer.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pack.flush()
+
+
+def install(profile, cache_root):
+    """Attach the World Map handler to a profile"""
+    global _handler
+    if _handler is None:
+        _handler = WorldMapSchemeHandler(os.path.join(cache_root, "world_map.pack"), profile.parent())
+    profile.installUrlSchemeHandler(SCHEME, _handler)
+    return _handler
+
+
+def get_handler():
+    """Return the installed handler, or None if no profile uses it yet"""
+    return _handler
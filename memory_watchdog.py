@@ -0,0 +1,205 @@
+# memory_watchdog.py
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+from procstats import read_rss_bytes, read_cpu_seconds, format_bytes
+import lifecycle
+import config
+import threading
+import time
+
+
+class ProcessSampler(QThread):
+    """Samples RSS and CPU usage of renderer processes from /proc off the GUI thread"""
+    sampled = pyqtSignal(dict)  # pid -> {"rss": bytes or None, "cpu": percent or None}
+
+    def __init__(self, interval=5.0, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self._pids = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._last_cpu = {}  # pid -> (cpu seconds, wall time)
+
+    def set_pids(self, pids):
+        """Replace the set of processes to sample (called from the GUI thread)"""
+        with self._lock:
+            self._pids = {pid for pid in pids if pid}
+
+    def stop(self):
+        """Ask the thread to finish and wait for it"""
+        self._stop_event.set()
+        self.wait()
+
+    def sample_once(self):
+        """Take one sample of every watched process"""
+        with self._lock:
+            pids = set(self._pids)
+
+        results = {}
+        now = time.monotonic()
+        for pid in pids:
+            cpu_seconds = read_cpu_seconds(pid)
+            cpu_percent = None
+            previous = self._last_cpu.get(pid)
+            if cpu_seconds is not None:
+                if previous is not None and now > previous[1]:
+                    cpu_percent = max(0.0, (cpu_seconds - previous[0]) / (now - previous[1]) * 100)
+                self._last_cpu[pid] = (cpu_seconds, now)
+            results[pid] = {"rss": read_rss_bytes(pid), "cpu": cpu_percent}
+
+        # Forget processes that are no longer watched
+        for pid in list(self._last_cpu):
+            if pid not in pids:
+                del self._last_cpu[pid]
+        return results
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.sampled.emit(self.sample_once())
+            self._stop_event.wait(self.interval)
+
+
+class RendererWatchdog(QObject):
+    """Keeps tool renderers under a memory budget and tracks the game renderer"""
+    sampled = pyqtSignal(dict)  # re-emitted sampler results, pid -> stats
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.game_page = None
+        self.latest = {}  # pid -> last sample
+        self.budget_discards = 0
+        self.ceiling_discards = 0
+        self.ceiling_warned = set()  # pages already warned about while visible
+
+        try:
+            interval = float(config.get_config_value("watchdog_interval", 5))
+        except (ValueError, TypeError):
+            interval = 5.0
+        self.sampler = ProcessSampler(interval)
+        self.sampler.sampled.connect(self.on_sampled)
+
+        # Renderer PIDs change on crash/discard, so refresh them on the GUI thread
+        self.pid_timer = QTimer(self)
+        self.pid_timer.timeout.connect(self.refresh_pids)
+        self.pid_timer.start(int(interval * 1000))
+
+    def start(self):
+        self.refresh_pids()
+        if not self.sampler.isRunning():
+            self.sampler.start()
+
+    def stop(self):
+        self.pid_timer.stop()
+        if self.sampler.isRunning():
+            self.sampler.stop()
+
+    def watch_game(self, page):
+        """Include the game page in sampling. It is never discarded."""
+        self.game_page = page
+        self.refresh_pids()
+
+    def get_game_pid(self):
+        try:
+            return self.game_page.renderProcessPid() if self.game_page is not None else 0
+        except RuntimeError:
+            return 0
+
+    def get_tool_pids(self):
+        """Return page -> renderer pid for every tracked tool page"""
+        pids = {}
+        for page in list(lifecycle.get_manager().pages):
+            try:
+                pids[page] = page.renderProcessPid()
+            except RuntimeError:
+                lifecycle.get_manager().unregister(page)
+        return pids
+
+    def refresh_pids(self):
+        pids = set(self.get_tool_pids().values())
+        pids.add(self.get_game_pid())
+        self.sampler.set_pids(pids)
+
+    def get_budget_bytes(self):
+        try:
+            return int(config.get_config_value("tool_memory_budget_mb", 1024)) * 1024 * 1024
+        except (ValueError, TypeError):
+            return 1024 * 1024 * 1024
+
+    def on_sampled(self, results):
+        """Check the tool memory budget against a fresh sample"""
+        self.latest = results
+        self.sampled.emit(results)
+        self.enforce_ceilings()
+        self.enforce_budget()
+
+    def enforce_ceilings(self):
+        """Apply each tool's own memory ceiling from the manifest.
+
+        Pages sharing a renderer are measured by that whole process, so a ceiling
+        is an upper bound on the renderer a tool lives in, not on the tool alone."""
+        manager = lifecycle.get_manager()
+        self.ceiling_warned &= set(manager.pages)
+        game_pid = self.get_game_pid()
+        for page, pid in self.get_tool_pids().items():
+            info = manager.pages.get(page)
+            ceiling_mb = info["policy"].memory_mb if info else None
+            if not ceiling_mb or not pid or pid == game_pid:
+                continue
+            rss = self.latest.get(pid, {}).get("rss") or 0
+            if rss <= ceiling_mb * 1024 * 1024:
+                self.ceiling_warned.discard(page)
+                continue
+            if lifecycle.get_state(page) == lifecycle.DISCARDED:
+                continue
+            if not page.isVisible():
+                if manager.discard(page):
+                    self.ceiling_discards += 1
+                    print(f"⚠️ {info['title']} used {format_bytes(rss)}, over its {ceiling_mb} MB ceiling")
+            elif page not in self.ceiling_warned:
+                # Never pull a page out from under the user; it is handled once hidden
+                self.ceiling_warned.add(page)
+                print(f"⚠️ {info['title']} uses {format_bytes(rss)}, over its {ceiling_mb} MB ceiling")
+
+    def enforce_budget(self):
+        """Discard least recently used hidden tool pages until tools fit the budget"""
+        budget = self.get_budget_bytes()
+        if budget <= 0:
+            return
+
+        game_pid = self.get_game_pid()
+        page_pids = self.get_tool_pids()
+
+        # Several pages can share a renderer, so count each process once
+        tool_pids = {pid for pid in page_pids.values() if pid and pid != game_pid}
+        total = sum(self.latest.get(pid, {}).get("rss") or 0 for pid in tool_pids)
+        if total <= budget:
+            return
+
+        print(f"⚠️ Tool renderers use {format_bytes(total)}, over budget of {format_bytes(budget)}")
+        manager = lifecycle.get_manager()
+        candidates = sorted(
+            (page for page in page_pids if page_pids[page] in tool_pids and not page.isVisible()),
+            key=lambda page: manager.pages[page]["last_active"],
+        )
+        for page in candidates:
+            if total <= budget:
+                break
+            pid = page_pids[page]
+            if not manager.discard(page):
+                continue
+            self.budget_discards += 1
+            # Only credit the process once every page using it is gone
+            sharing = [p for p in page_pids if page_pids[p] == pid]
+            if all(lifecycle.get_state(p) == lifecycle.DISCARDED for p in sharing):
+                total -= self.latest.get(pid, {}).get("rss") or 0
+
+
+_watchdog = None
+
+
+def get_watchdog():
+    """Return the process-wide renderer watchdog"""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = RendererWatchdog(QApplication.instance())
+    return _watchdog
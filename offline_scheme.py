@@ -0,0 +1,158 @@
+# offline_scheme.py
+from PyQt6.QtWebEngineCore import (QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob,
+                                   QWebEngineUrlRequestInterceptor)
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QUrl, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from content_store import ContentStore, CachingFetcher
+import tool_manifest
+import config
+import url_schemes
+import itertools
+import os
+
+# Tool pages on cached hosts are loaded as kitcache://host/path instead of https://.
+# That makes kitcache://host their origin: cookies and storage are separate from
+# the https:// site's, same-origin fetches come through this handler, and non-GET
+# requests are sent to the network (see benchmarks/offline_origin_check.py).
+SCHEME = url_schemes.OFFLINE_CACHE
+
+# Schemes whose form posts and other non-GET requests go straight to the network
+PASSTHROUGH_SCHEMES = (url_schemes.OFFLINE_CACHE, url_schemes.WORLD_MAP)
+
+_handler = None
+_passthrough = None
+
+
+def is_enabled():
+    return bool(config.get_config_value("offline_cache_enabled", True))
+
+
+def get_cached_hosts():
+    return config.get_config_value("offline_cache_hosts") or []
+
+
+def map_url(url):
+    """Return the kitcache:// form of a tool URL if its host is served from the cache"""
+    qurl = QUrl(url)
+    if not is_enabled() or qurl.scheme() != "https" or qurl.host() not in get_cached_hosts():
+        return url
+    qurl.setScheme(SCHEME.decode())
+    return qurl.toString()
+
+
+def to_network_url(qurl):
+    """Return the https:// URL a kitcache:// request stands for"""
+    network_url = QUrl(qurl)
+    network_url.setScheme("https")
+    return network_url.toString()
+
+
+class NetworkPassthrough(QWebEngineUrlRequestInterceptor):
+    """Redirects non-GET requests on the kit's schemes to their https:// URL.
+
+    Interceptor redirects keep the method and body; a scheme handler's redirect
+    would turn a POST into a GET."""
+
+    def interceptRequest(self, info):
+        url = info.requestUrl()
+        if bytes(info.requestMethod()) != b"GET" and url.scheme().encode() in PASSTHROUGH_SCHEMES:
+            info.redirect(QUrl(to_network_url(url)))
+
+
+class JobTracker:
+    """Request jobs waiting on a worker, by token.
+
+    Chromium deletes a job when its page goes away, and sip can't tell, so a job
+    kept across a worker call may be dangling. Workers carry a token instead, and
+    the job's destroyed signal retires it. GUI thread only."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.tokens = itertools.count()
+
+    def add(self, job):
+        token = next(self.tokens)
+        self.jobs[token] = job
+        job.destroyed.connect(lambda _=None, t=token: self.jobs.pop(t, None))
+        return token
+
+    def take(self, token):
+        """Return the job for token, or None if Qt has deleted it"""
+        return self.jobs.pop(token, None)
+
+
+class CachingSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serves tool pages from the on-disk content store, fetching on a worker thread"""
+    fetched = pyqtSignal(int, object)  # job token, FetchResult
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        try:
+            max_bytes = int(config.get_config_value("offline_cache_mb", 200)) * 1024 * 1024
+            ttl = float(config.get_config_value("offline_cache_ttl", 3600))
+        except (ValueError, TypeError):
+            max_bytes, ttl = 200 * 1024 * 1024, 3600.0
+        self.store = ContentStore(root, max_bytes)
+        self.fetcher = CachingFetcher(self.store, ttl)
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="OfflineCache")
+        self.jobs = JobTracker()
+        # Worker threads hand results back to the GUI thread through a queued signal
+        self.fetched.connect(self.on_fetched)
+
+    def requestStarted(self, job):
+        if bytes(job.requestMethod()) != b"GET":
+            # NetworkPassthrough sends these to the network before they get here
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        url = to_network_url(job.requestUrl())
+        # Tools can ask for their own freshness in the manifest
+        ttl = tool_manifest.get_manifest().get_cache_ttl(QUrl(url).host().lower())
+        self.executor.submit(self.fetch, self.jobs.add(job), url, ttl)
+
+    def fetch(self, token, url, ttl=None):
+        """Worker thread: resolve the request from the store or the network"""
+        self.fetched.emit(token, self.fetcher.fetch(url, ttl))
+
+    def on_fetched(self, token, result):
+        """GUI thread: complete the request if its page is still there"""
+        job = self.jobs.take(token)
+        if job is None:
+            return
+        if result.redirect:
+            job.redirect(QUrl(map_url(result.redirect)))
+        elif result.body is not None:
+            buffer = QBuffer(job)
+            buffer.setData(QByteArray(result.body))
+            buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+            # Chromium wants a bare MIME type here, without charset parameters
+            content_type = (result.content_type or "application/octet-stream").split(";")[0].strip()
+            job.reply(content_type.encode(), buffer)
+        elif result.error and result.error.startswith("HTTP 404"):
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+        else:
+            print(f"Offline cache could not load {job.requestUrl().toString()}: {result.error}")
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+
+    def preconnect(self, url):
+        """Open a keep-alive connection to a cached host before its first cache miss"""
+        self.executor.submit(self.fetcher.pool.preconnect, url)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.fetcher.close()
+
+
+def install(profile, cache_root):
+    """Attach the caching handler to a profile (shared by every profile that asks)"""
+    global _handler, _passthrough
+    if _handler is None:
+        _handler = CachingSchemeHandler(os.path.join(cache_root, "offline_cache"), profile.parent())
+        _passthrough = NetworkPassthrough(profile.parent())
+    profile.installUrlSchemeHandler(SCHEME, _handler)
+    profile.setUrlRequestInterceptor(_passthrough)
+    return _handler
+
+
+def get_handler():
+    """Return the installed handler, or None if no profile uses it yet"""
+    return _handler
@@ -0,0 +1,213 @@
+# performance_panel.py
+from PyQt6.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QTreeWidget,
+                             QTreeWidgetItem, QPushButton, QLabel, QComboBox)
+from PyQt6.QtCore import Qt
+from procstats import format_bytes, read_tree_io_bytes
+import performance_presets
+import ram_cache
+import memory_watchdog
+import lifecycle
+import block_stats
+import config
+import os
+
+# Collects JS heap usage and bytes transferred for the current document
+PAGE_STATS_SCRIPT = """
+(function() {
+    var heap = (performance.memory && performance.memory.usedJSHeapSize) || null;
+    var entries = performance.getEntriesByType('navigation')
+        .concat(performance.getEntriesByType('resource'));
+    var bytes = 0;
+    for (var i = 0; i < entries.length; i++) {
+        bytes += entries[i].transferSize || 0;
+    }
+    return {heap: heap, net: bytes};
+})()
+"""
+
+COLUMNS = ["Page", "CPU", "RSS", "JS heap", "Network"]
+
+
+class PerformanceGroup(QGroupBox):
+    """Live per-page resource usage for the game view and open tools"""
+
+    def __init__(self, parent=None):
+        super().__init__("Performance", parent)
+        self.page_stats = {}  # page -> {"heap", "net"} from the last JS query
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(5, 10, 5, 5)
+
+        # Chromium switches are fixed at startup, so a new choice waits for a restart
+        preset_layout = QHBoxLayout()
+        preset_layout.addWidget(QLabel("Preset:"))
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(performance_presets.PRESETS))
+        self.preset_combo.setCurrentText(performance_presets.get_configured_preset())
+        self.preset_combo.currentTextChanged.connect(self.on_preset_changed)
+        preset_layout.addWidget(self.preset_combo, 1)
+        self.preset_label = QLabel()
+        preset_layout.addWidget(self.preset_label)
+        layout.addLayout(preset_layout)
+        self.update_preset_label()
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(COLUMNS))
+        self.tree.setHeaderLabels(COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSelectionMode(QTreeWidget.SelectionMode.SingleSelection)
+        self.tree.itemSelectionChanged.connect(self.update_discard_button)
+        layout.addWidget(self.tree)
+
+        bottom_layout = QHBoxLayout()
+        self.summary_label = QLabel("Reclaimed: 0 B")
+        bottom_layout.addWidget(self.summary_label, 1)
+
+        self.discard_button = QPushButton("Discard page")
+        self.discard_button.setObjectName("smallButton")
+        self.discard_button.setToolTip("Free the renderer memory of the selected background tool")
+        self.discard_button.setEnabled(False)
+        self.discard_button.clicked.connect(self.discard_selected)
+        bottom_layout.addWidget(self.discard_button)
+
+        load_times_button = QPushButton("Load times")
+        load_times_button.setObjectName("smallButton")
+        load_times_button.setToolTip("Page load timings of the game and tools, slowest first")
+        load_times_button.clicked.connect(self.show_load_times)
+        bottom_layout.addWidget(load_times_button)
+        layout.addLayout(bottom_layout)
+
+        self.setLayout(layout)
+
+        # Refresh at the sampler's fixed rate rather than on a timer of our own
+        memory_watchdog.get_watchdog().sampled.connect(self.on_sampled)
+
+    def show_load_times(self):
+        """Open the summary of the page load timing log"""
+        import load_timing
+        load_timing.LoadTimingDialog(self.window()).exec()
+
+    def get_pages(self):
+        """Return (title, page, is_game) for every page worth showing"""
+        pages = []
+        watchdog = memory_watchdog.get_watchdog()
+        if watchdog.game_page is not None:
+            pages.append(("⚔️ Game", watchdog.game_page, True))
+        for page, info in lifecycle.get_manager().pages.items():
+            pages.append((info["title"], page, False))
+        return pages
+
+    def query_page_stats(self, page):
+        """Ask the page for its JS heap and network totals; the answer arrives later"""
+        try:
+            if lifecycle.get_state(page) != lifecycle.ACTIVE:
+                self.page_stats.pop(page, None)
+                return
+            page.runJavaScript(PAGE_STATS_SCRIPT,
+                               lambda result, p=page: self.on_page_stats(p, result))
+        except RuntimeError:
+            self.page_stats.pop(page, None)
+
+    def on_page_stats(self, page, result):
+        if isinstance(result, dict):
+            self.page_stats[page] = result
+
+    def on_sampled(self, samples):
+        """Rebuild the table from the latest process sample"""
+        if not self.isVisible():
+            return
+
+        selected_page = self.get_selected_page()
+        self.tree.clear()
+        pages = self.get_pages()
+        for title, page, is_game in pages:
+            try:
+                pid = page.renderProcessPid()
+                state = lifecycle.get_state(page)
+            except RuntimeError:
+                continue
+            self.query_page_stats(page)
+
+            sample = samples.get(pid, {})
+            cpu = sample.get("cpu")
+            js_stats = self.page_stats.get(page, {})
+            if state != lifecycle.ACTIVE:
+                title = f"{title} ({state.lower()})"
+
+            item = QTreeWidgetItem([
+                title,
+                f"{cpu:.0f}%" if cpu is not None else "n/a",
+                format_bytes(sample.get("rss")),
+                format_bytes(js_stats.get("heap")),
+                format_bytes(js_stats.get("net")),
+            ])
+            for column in range(1, len(COLUMNS)):
+                item.setTextAlignment(column, Qt.AlignmentFlag.AlignRight)
+            item.setData(0, Qt.ItemDataRole.UserRole, None if is_game else page)
+            self.tree.addTopLevelItem(item)
+            if page is selected_page:
+                item.setSelected(True)
+
+        # Drop cached JS stats for pages that are gone
+        live_pages = {page for _, page, _ in pages}
+        for page in list(self.page_stats):
+            if page not in live_pages:
+                del self.page_stats[page]
+
+        stats = lifecycle.get_manager().get_stats()
+        blocked = block_stats.get_counts()
+        self.summary_label.setText(
+            f"Reclaimed: {format_bytes(stats['reclaimed_bytes'])} "
+            f"({stats['discarded']} discarded) · Blocked: {sum(blocked.values())}"
+        )
+        lines = [f"{title}: {count} requests blocked" for title, count in sorted(blocked.items())]
+        lines = lines or ["No requests blocked yet"]
+        # Storage I/O of the kit and its Chromium processes, in either cache mode
+        read_bytes, written_bytes = read_tree_io_bytes(os.getpid())
+        lines.append(f"Disk I/O: {format_bytes(read_bytes)} read, {format_bytes(written_bytes)} written")
+        ram = ram_cache.get_active()
+        if ram is not None:
+            ram_stats = ram.get_stats()
+            lines.append(f"RAM cache: {format_bytes(ram_stats['ram_bytes'])} in RAM, "
+                         f"{format_bytes(ram_stats['snapshot_bytes'])} snapshotted to disk")
+        self.summary_label.setToolTip("\n".join(lines))
+        self.update_discard_button()
+
+    def on_preset_changed(self, name):
+        config.set_config_value("performance_preset", name)
+        self.update_preset_label()
+
+    def update_preset_label(self):
+        """Show which preset is running and whether a different one is pending"""
+        active = performance_presets.get_active_preset()
+        if self.preset_combo.currentText() == active:
+            self.preset_label.setText("active")
+        else:
+            self.preset_label.setText(f"restart to apply ({active} active)")
+        self.preset_combo.setToolTip(performance_presets.PRESETS[self.preset_combo.currentText()]["description"])
+
+    def get_selected_page(self):
+        items = self.tree.selectedItems()
+        if not items:
+            return None
+        return items[0].data(0, Qt.ItemDataRole.UserRole)
+
+    def update_discard_button(self):
+        page = self.get_selected_page()
+        try:
+            can_discard = (page is not None and not page.isVisible()
+                           and lifecycle.get_state(page) != lifecycle.DISCARDED
+                           and lifecycle.get_manager().is_allowed(page, lifecycle.DISCARDED))
+        except RuntimeError:
+            can_discard = False
+        self.discard_button.setEnabled(can_discard)
+
+    def discard_selected(self):
+        """Discard the selected tool page; the game page is never selectable for this"""
+        page = self.get_selected_page()
+        if page is None:
+            return
+        if lifecycle.get_manager().discard(page, force=True):
+            self.page_stats.pop(page, None)
+        self.update_discard_button()
@@ -0,0 +1,101 @@
+# performance_presets.py
+import config
+import os
+
+ENV_FLAGS = "QTWEBENGINE_CHROMIUM_FLAGS"
+DEFAULT_PRESET = "default"
+
+# Chromium switches and QWebEngineSettings attributes for each preset. Switches
+# only take effect if set before the web engine starts and apply to every page,
+# the game's included; attributes are applied as defaults for the tool profiles
+# only, so the game page keeps Chromium's settings. Every preset but the default
+# is opt-in.
+PRESETS = {
+    "default": {
+        "description": "Chromium's own settings; the game renders as it always has",
+        "flags": [],
+        "settings": {},
+    },
+    "low-memory": {
+        "description": "Fewest renderer processes, no GPU process, background tabs throttled",
+        "flags": [
+            "--renderer-process-limit=2",
+            "--process-per-site",
+            "--disable-gpu",
+            "--num-raster-threads=1",
+        ],
+        "settings": {
+            "Accelerated2dCanvasEnabled": False,
+            "WebGLEnabled": False,
+            "ScrollAnimatorEnabled": False,
+            "PdfViewerEnabled": False,
+            "PluginsEnabled": False,
+            "PlaybackRequiresUserGesture": True,
+        },
+    },
+    "balanced": {
+        "description": "Software rasterization with a capped renderer count",
+        "flags": [
+            "--renderer-process-limit=4",
+            "--disable-gpu-rasterization",
+            "--num-raster-threads=2",
+        ],
+        "settings": {
+            "Accelerated2dCanvasEnabled": False,
+            "ScrollAnimatorEnabled": False,
+            "PlaybackRequiresUserGesture": True,
+        },
+    },
+    "max-fps": {
+        "description": "No background throttling and more raster threads, at the cost of CPU",
+        "flags": [
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+            "--num-raster-threads=4",
+        ],
+        "settings": {
+            "Accelerated2dCanvasEnabled": True,
+            "WebGLEnabled": True,
+            "ScrollAnimatorEnabled": False,
+        },
+    },
+}
+
+_active = None
+
+
+def get_configured_preset():
+    """Return the preset name from config, falling back to the default"""
+    name = config.get_config_value("performance_preset", DEFAULT_PRESET)
+    return name if name in PRESETS else DEFAULT_PRESET
+
+
+def get_active_preset():
+    """Return the preset applied at startup (config changes wait for a restart)"""
+    return _active or get_configured_preset()
+
+
+def apply_chromium_flags():
+    """Put the configured preset's switches in the environment; call before QApplication"""
+    global _active
+    _active = get_configured_preset()
+    flags = PRESETS[_active]["flags"]
+    if flags:
+        # Switches already in the environment come last so they win over the preset
+        existing = os.environ.get(ENV_FLAGS, "").strip()
+        os.environ[ENV_FLAGS] = " ".join(flags + ([existing] if existing else []))
+    print(f"⚙️ Performance preset: {_active}")
+    return _active
+
+
+def apply_settings(profile):
+    """Apply the active preset's web settings as defaults for a tool profile's pages"""
+    from PyQt6.QtWebEngineCore import QWebEngineSettings
+    settings = profile.settings()
+    for attribute, enabled in PRESETS[get_active_preset()]["settings"].items():
+        web_attribute = getattr(QWebEngineSettings.WebAttribute, attribute, None)
+        if web_attribute is None:
+            print(f"Skipping unknown web setting {attribute}")
+            continue
+        settings.setAttribute(web_attribute, enabled)
@@ -0,0 +1,238 @@
+# prefetch.py
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import QObject, QTimer, QUrl
+from PyQt6.QtWidgets import QApplication
+from procstats import read_rss_bytes, format_bytes
+import profiles
+import view_pool
+import request_blocker
+import offline_scheme
+import tool_manifest
+import lifecycle
+import memory_watchdog
+import config
+import json
+import time
+
+# Don't repeat a preconnect to the same origin within this many seconds
+PRECONNECT_TTL = 60
+
+PRECONNECT_SCRIPT = """
+(function(origin) {
+    ['dns-prefetch', 'preconnect'].forEach(function(rel) {
+        var link = document.createElement('link');
+        link.rel = rel;
+        link.href = origin;
+        link.crossOrigin = 'anonymous';
+        document.head.appendChild(link);
+    });
+})(%s)
+"""
+
+
+class ToolPrefetcher(QObject):
+    """Warms connections on hover and prerenders a tool after a short dwell"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.preconnected = {}  # origin -> time of last preconnect
+        self.prerenders = {}  # url -> {"view", "title", "loaded", "slot", "pinned"}, oldest first
+        self.pending_url = None
+        self.pending_title = None
+        self.prerender_hits = 0
+
+        # Hidden page used only to issue preconnect hints on the tools profile
+        self.hint_page = QWebEnginePage(profiles.get_profile(profiles.TOOLS_PROFILE), self)
+        self.hint_page.setHtml("<html><head></head><body></body></html>")
+
+        self.dwell_timer = QTimer(self)
+        self.dwell_timer.setSingleShot(True)
+        self.dwell_timer.timeout.connect(self.on_dwell)
+
+        # A prerender the lifecycle manager or the watchdog discarded is no use any more
+        lifecycle.get_manager().state_changed.connect(self.on_state_changed)
+
+    def is_enabled(self):
+        return bool(config.get_config_value("prerender_enabled", True))
+
+    def get_limits(self):
+        """Return (dwell ms, max prerenders, memory cap in bytes) from config"""
+        try:
+            dwell_ms = int(config.get_config_value("prerender_dwell_ms", 400))
+            max_count = int(config.get_config_value("prerender_max_count", 2))
+            max_bytes = int(config.get_config_value("prerender_memory_mb", 300)) * 1024 * 1024
+        except (ValueError, TypeError):
+            dwell_ms, max_count, max_bytes = 400, 2, 300 * 1024 * 1024
+        return dwell_ms, max_count, max_bytes
+
+    def hover_started(self, url, title):
+        """Pointer or focus arrived on a tool: preconnect now, prerender after the dwell"""
+        if not self.is_enabled():
+            return
+        self.preconnect(url)
+        if url in self.prerenders:
+            return
+        # Tools whose pages go stale quickly only get the warm connection
+        if not tool_manifest.get_manifest().get_policy(title).prerender:
+            return
+        dwell_ms, max_count, _ = self.get_limits()
+        if max_count <= 0:
+            return
+        self.pending_url = url
+        self.pending_title = title
+        self.dwell_timer.start(dwell_ms)
+
+    def hover_ended(self, url):
+        """Pointer or focus left a tool: stop waiting and drop its prerender"""
+        if self.pending_url == url:
+            self.dwell_timer.stop()
+            self.pending_url = None
+        entry = self.prerenders.get(url)
+        if entry is not None and not entry["pinned"]:
+            self.cancel(url)
+
+    def preconnect(self, url):
+        """Ask Chromium to resolve DNS and open a TLS connection to the tool's origin"""
+        origin = QUrl(url).adjusted(QUrl.UrlFormattingOption.RemovePath
+                                    | QUrl.UrlFormattingOption.RemoveQuery
+                                    | QUrl.UrlFormattingOption.RemoveFragment).toString()
+        now = time.monotonic()
+        if now - self.preconnected.get(origin, -PRECONNECT_TTL) < PRECONNECT_TTL:
+            return
+        self.preconnected[origin] = now
+        # Cached hosts are fetched by the offline cache, not by Chromium
+        handler = offline_scheme.get_handler()
+        if handler is not None and offline_scheme.map_url(url) != url:
+            handler.preconnect(url)
+            return
+        self.hint_page.runJavaScript(PRECONNECT_SCRIPT % json.dumps(origin))
+
+    def on_dwell(self):
+        """The pointer stayed long enough: load the tool into a hidden view"""
+        url, title = self.pending_url, self.pending_title
+        self.pending_url = None
+        if url is not None:
+            self.prerender(url, title)
+
+    def prerender(self, url, title, pinned=False):
+        """Load a tool into a hidden view. Pinned prerenders (manifest preloads)
+        survive the pointer leaving the tool's button."""
+        if not self.is_enabled() or url in self.prerenders:
+            return
+        if tool_manifest.get_manifest().get_policy(title).profile != profiles.TOOLS_PROFILE:
+            return  # Prerenders come from the shared tools-profile pool
+
+        _, max_count, _ = self.get_limits()
+        if max_count <= 0:
+            return
+        while len(self.prerenders) >= max_count:
+            # Evict hover prerenders before preloads
+            unpinned = [u for u, e in self.prerenders.items() if not e["pinned"]]
+            self.cancel(unpinned[0] if unpinned else next(iter(self.prerenders)))
+
+        view, _ = view_pool.get_pool().acquire()
+        slot = lambda ok, u=url: self.on_prerender_loaded(u, ok)
+        entry = {"view": view, "title": title, "loaded": False, "slot": slot, "pinned": pinned}
+        self.prerenders[url] = entry
+        view.page().loadFinished.connect(slot)
+        view.page().tool_title = title
+        request_blocker.apply(view.page(), title)
+        # Hidden, so it is frozen and discarded like any background tool page
+        lifecycle.get_manager().register(view.page(), title)
+        memory_watchdog.get_watchdog().refresh_pids()
+        view.setUrl(QUrl(view_pool.route_url(url)))
+        print(f"Prerendering {title}")
+
+    def on_prerender_loaded(self, url, ok):
+        entry = self.prerenders.get(url)
+        if entry is None or entry["loaded"]:
+            return
+        entry["loaded"] = ok
+        if not ok:
+            self.cancel(url)
+            return
+        self.enforce_memory_cap()
+
+    def on_state_changed(self, page, state):
+        if state != lifecycle.DISCARDED:
+            return
+        for url, entry in list(self.prerenders.items()):
+            try:
+                if entry["view"].page() is page:
+                    self.cancel(url)
+            except RuntimeError:
+                self.detach(url)
+
+    def get_owned_pids(self):
+        """Return the renderer pids that only prerenders use.
+
+        A renderer shared with an open tool or the game holds their memory too,
+        which can't be split by page, so it doesn't count against the cap."""
+        pages = set()
+        pids = set()
+        for entry in self.prerenders.values():
+            try:
+                page = entry["view"].page()
+                pids.add(page.renderProcessPid())
+                pages.add(page)
+            except RuntimeError:
+                pass
+        watchdog = memory_watchdog.get_watchdog()
+        shared = {watchdog.get_game_pid(), 0}
+        shared.update(pid for page, pid in watchdog.get_tool_pids().items() if page not in pages)
+        return pids - shared
+
+    def enforce_memory_cap(self):
+        """Drop the oldest prerenders while the renderers only they use exceed the memory cap"""
+        _, _, max_bytes = self.get_limits()
+        while self.prerenders:
+            total = sum(read_rss_bytes(pid) or 0 for pid in self.get_owned_pids())
+            if total <= max_bytes:
+                return
+            oldest = next(iter(self.prerenders))
+            print(f"Prerenders use {format_bytes(total)}, over cap; dropping {oldest}")
+            self.cancel(oldest)
+
+    def detach(self, url):
+        """Stop tracking a prerender and return its entry"""
+        entry = self.prerenders.pop(url, None)
+        if entry is not None:
+            try:
+                entry["view"].page().loadFinished.disconnect(entry["slot"])
+            except (RuntimeError, TypeError):
+                pass
+        return entry
+
+    def cancel(self, url):
+        """Throw away a prerender and return its view to the pool"""
+        entry = self.detach(url)
+        if entry is not None:
+            view_pool.get_pool().release(entry["view"])
+
+    def is_loaded(self, url):
+        """Whether a prerender of url has finished loading"""
+        entry = self.prerenders.get(url)
+        return entry is not None and bool(entry["loaded"])
+
+    def take(self, url):
+        """Hand over a prerendered view for url, or None if there isn't one"""
+        entry = self.detach(url)
+        if entry is None:
+            return None
+        self.prerender_hits += 1
+        # Stop the dwell timer so a finished hover doesn't prerender again
+        if self.pending_url == url:
+            self.dwell_timer.stop()
+            self.pending_url = None
+        return entry["view"]
+
+
+_prefetcher = None
+
+
+def get_prefetcher():
+    """Return the process-wide tool prefetcher"""
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = ToolPrefetcher(QApplication.instance())
+    return _prefetcher
@@ -0,0 +1,93 @@
+# procstats.py
+import os
+
+try:
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def read_rss_bytes(pid):
+    """Return the resident set size of a process in bytes, or None if unavailable"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            fields = f.read().split()
+        return int(fields[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def format_bytes(num_bytes):
+    """Format a byte count for display"""
+    if num_bytes is None:
+        return "n/a"
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+
+
+def read_cpu_seconds(pid):
+    """Return total user+system CPU time of a process in seconds, or None if unavailable"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            data = f.read()
+        # The command name may contain spaces, so split after its closing paren
+        fields = data[data.rindex(")") + 2:].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        return (utime + stime) / CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def read_io_bytes(pid):
+    """Return (read, written) bytes a process has sent to storage, or None if unavailable.
+
+    tmpfs and page-cache hits don't count, so RAM-backed caches show up as saved I/O."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            values = dict(line.split(":", 1) for line in f.read().splitlines() if ":" in line)
+        return int(values["read_bytes"]), int(values["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def get_descendant_pids(pid):
+    """Return pid followed by every process started below it"""
+    pids = [pid]
+    index = 0
+    while index < len(pids):
+        task_dir = f"/proc/{pids[index]}/task"
+        index += 1
+        try:
+            for tid in os.listdir(task_dir):
+                with open(f"{task_dir}/{tid}/children", "r") as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return pids
+
+
+def read_tree_io_bytes(pid):
+    """Return (read, written) storage bytes of a process and its live children,
+    e.g. the kit together with its Chromium helper processes"""
+    read_bytes = written_bytes = 0
+    for child in get_descendant_pids(pid):
+        io = read_io_bytes(child)
+        if io is not None:
+            read_bytes += io[0]
+            written_bytes += io[1]
+    return read_bytes, written_bytes
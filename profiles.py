@@ -0,0 +1,141 @@
+# profiles.py
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+from PyQt6.QtCore import QCoreApplication, QDir, QEvent
+from PyQt6.QtWidgets import QApplication
+import offline_scheme
+import map_scheme
+import ram_cache
+import performance_presets
+import config
+import os
+import shutil
+
+# Named profiles handed out by the registry
+GAME_PROFILE = "game"
+TOOLS_PROFILE = "tools"
+EPHEMERAL_PROFILE = "ephemeral"
+
+# Storage name and on-disk folder names for each persistent profile
+PROFILE_LAYOUT = {
+    GAME_PROFILE: ("2004Client", "web_cache", "web_storage"),
+    TOOLS_PROFILE: ("2004Tools", "tool_cache", "tool_storage"),
+}
+
+# Cache folders that used to live in the working directory
+LEGACY_CACHE_ENTRIES = ("web_cache", "web_storage", "tool_cache", "tool_storage",
+                        "offline_cache", "world_map.pack")
+
+_profiles = {}
+_migrated = False
+
+
+def get_cache_root():
+    """Return the directory all profile caches live under"""
+    root = config.get_config_value("cache_root")
+    if not root:
+        root = config.get_data_dir()
+        migrate_legacy_caches(root)
+    return os.path.abspath(os.path.expanduser(root))
+
+
+def migrate_legacy_caches(root):
+    """Move caches from the working directory into the per-user data folder, once"""
+    global _migrated
+    if _migrated:
+        return
+    _migrated = True
+    legacy_root = QDir.currentPath()
+    if os.path.abspath(legacy_root) == os.path.abspath(root):
+        return
+    for name in LEGACY_CACHE_ENTRIES:
+        source = os.path.join(legacy_root, name)
+        target = os.path.join(root, name)
+        if os.path.exists(source) and not os.path.exists(target):
+            try:
+                os.makedirs(root, exist_ok=True)
+                shutil.move(source, target)
+                print(f"📦 Moved {name} to {root}")
+            except OSError as e:
+                print(f"⚠️ Could not move {name} to {root}: {e}")
+
+
+def get_cache_size_bytes(name):
+    """Return the configured HTTP cache cap for a profile, in bytes"""
+    sizes = config.get_config_value("profile_cache_mb") or {}
+    default_sizes = config.DEFAULT_CONFIG["profile_cache_mb"]
+    try:
+        size_mb = int(sizes.get(name, default_sizes.get(name, 0)))
+    except (ValueError, TypeError):
+        size_mb = default_sizes.get(name, 0)
+    return max(0, size_mb) * 1024 * 1024
+
+
+def _create_profile(name):
+    """Build and configure a profile for the given registry name"""
+    owner = QApplication.instance()
+    if name == EPHEMERAL_PROFILE:
+        # Off-the-record: nothing touches the disk, cache is held in memory
+        profile = QWebEngineProfile(owner)
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+    else:
+        storage_name, cache_dir, storage_dir = PROFILE_LAYOUT[name]
+        root = get_cache_root()
+        cache_path = os.path.join(root, cache_dir)
+        storage_path = os.path.join(root, storage_dir)
+        # RAM cache mode: Chromium works in tmpfs, snapshots keep the disk copy current
+        ram = ram_cache.get_ram_cache(root)
+        if ram is not None:
+            cache_path = ram.get_path(cache_dir)
+            storage_path = ram.get_path(storage_dir)
+        profile = QWebEngineProfile(storage_name, owner)
+        profile.setCachePath(cache_path)
+        profile.setPersistentStoragePath(storage_path)
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        profile.setPersistentCookiesPolicy(
+            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
+        )
+
+    # 0 lets Chromium pick a size, so only apply explicit caps
+    max_size = get_cache_size_bytes(name)
+    ram = ram_cache.get_active()
+    if ram is not None and name != EPHEMERAL_PROFILE:
+        max_size = ram.cap_cache_size(name, max_size)
+    if max_size:
+        profile.setHttpCacheMaximumSize(max_size)
+
+    # Profile settings are the defaults every page on it starts with. The
+    # presets' settings are tuned for tools; the game keeps Chromium's own
+    if name != GAME_PROFILE:
+        performance_presets.apply_settings(profile)
+
+    # Static guide sites are served through the offline-first content store
+    if name == TOOLS_PROFILE:
+        offline_scheme.install(profile, get_cache_root())
+        map_scheme.install(profile, get_cache_root())
+    return profile
+
+
+def get_profile(name=TOOLS_PROFILE):
+    """Return the shared profile for name, creating it on first use"""
+    if name not in _profiles:
+        if name != EPHEMERAL_PROFILE and name not in PROFILE_LAYOUT:
+            raise ValueError(f"Unknown profile: {name}")
+        _profiles[name] = _create_profile(name)
+        print(f"Created web profile '{name}'")
+    return _profiles[name]
+
+
+def close_all():
+    """Destroy every window, page and profile so Chromium writes their storage out.
+    Call once the event loop has finished."""
+    app = QApplication.instance()
+    for widget in app.topLevelWidgets():
+        widget.deleteLater()
+    # Pages have to go before the profile they use
+    for page in app.findChildren(QWebEnginePage):
+        page.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    for profile in _profiles.values():
+        profile.deleteLater()
+    _profiles.clear()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
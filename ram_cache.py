@@ -0,0 +1,258 @@
+# ram_cache.py
+import config
+import getpass
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+# Profile folders that move to RAM: Chromium's HTTP caches and web storage.
+# Storage (cookies, local storage) is live LevelDB and SQLite while the engine
+# runs, so it is only copied back once the engine has shut down, and always
+# whole: it is exempt from the RAM ceiling, which the caches fit around. The
+# HTTP caches checksum their own entries, so they can be copied while in use.
+CACHE_FOLDERS = ("web_cache", "tool_cache")
+STORAGE_FOLDERS = ("web_storage", "tool_storage")
+
+# Share of the RAM ceiling each profile's HTTP cache may use; storage gets the rest
+CACHE_SHARES = {"game": 0.6, "tools": 0.3}
+
+TMP_SUFFIX = ".kittmp"
+
+
+def is_enabled():
+    return bool(config.get_config_value("ram_cache", False))
+
+
+def get_tmpfs_base():
+    """Return a RAM-backed folder we can write to, or None on systems without one"""
+    for base in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR")):
+        if base and os.path.isdir(base) and os.access(base, os.W_OK):
+            return base
+    return None
+
+
+def get_ram_root(disk_root):
+    """RAM folder for a cache root, unique per user and cache root"""
+    base = get_tmpfs_base()
+    if base is None:
+        return None
+    digest = hashlib.sha1(f"{getpass.getuser()}:{disk_root}".encode()).hexdigest()[:12]
+    return os.path.join(base, f"2004Kit-{digest}")
+
+
+def list_files(root):
+    """Return (mtime_ns, size, relative path) for every file under root, newest first"""
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(TMP_SUFFIX):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed while walking
+            files.append((stat.st_mtime_ns, stat.st_size, os.path.relpath(path, root)))
+    files.sort(reverse=True)
+    return files
+
+
+def sync_tree(source, target, limit=None):
+    """Make target hold the files of source, or only the newest ones up to limit bytes.
+
+    Unchanged files (same size and mtime) are skipped. Returns (bytes copied, bytes kept)."""
+    keep = set()
+    kept = copied = 0
+    for mtime_ns, size, rel in list_files(source):
+        if limit is not None and kept + size > limit:
+            continue
+        keep.add(rel)
+        kept += size
+        destination = os.path.join(target, rel)
+        try:
+            stat = os.stat(destination)
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                continue
+        except OSError:
+            pass
+        tmp_path = destination + TMP_SUFFIX
+        try:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(os.path.join(source, rel), tmp_path)
+            os.replace(tmp_path, destination)
+            copied += size
+        except OSError:
+            # Chromium replaced or removed the file mid-copy; the next sync gets it
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    # Drop files that are gone from source or fell outside the limit
+    for dirpath, _, filenames in os.walk(target, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, target) not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        if dirpath != target:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass  # Not empty
+    return copied, kept
+
+
+class RamCache:
+    """Keeps the web profiles' caches and storage in RAM, with snapshots on disk"""
+
+    def __init__(self, disk_root, ram_root, max_bytes, snapshot_bytes, interval):
+        self.disk_root = disk_root
+        self.ram_root = ram_root
+        self.max_bytes = max_bytes
+        self.snapshot_bytes = snapshot_bytes  # hot cache kept on disk between runs
+        self.interval = interval
+        self.bytes_restored = 0
+        self.bytes_snapshotted = 0
+        self.ram_bytes = 0
+        self.snapshots = 0
+        self.last_snapshot_ms = None
+        self._lock = threading.Lock()  # one snapshot at a time
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def get_path(self, folder):
+        return os.path.join(self.ram_root, folder)
+
+    def cap_cache_size(self, profile_name, max_size):
+        """Limit a profile's HTTP cache to its share of the RAM ceiling"""
+        share = int(self.max_bytes * CACHE_SHARES.get(profile_name, 0.1))
+        return min(max_size, share) if max_size else share
+
+    def restore(self):
+        """Fill RAM from the last disk snapshot; must run before the profiles open.
+
+        A RAM folder left by an earlier run since boot is at least as new as the
+        snapshot, so it is kept as it is."""
+        start = time.perf_counter()
+        os.makedirs(self.ram_root, exist_ok=True)
+        # Storage holds logins and settings: always whole. Caches fill what is left.
+        budget = self.max_bytes
+        for folder in STORAGE_FOLDERS + CACHE_FOLDERS:
+            source = os.path.join(self.disk_root, folder)
+            target = self.get_path(folder)
+            if os.path.exists(target) or not os.path.isdir(source):
+                continue
+            limit = None if folder in STORAGE_FOLDERS else max(0, budget)
+            copied, kept = sync_tree(source, target, limit)
+            budget -= kept
+            self.bytes_restored += copied
+        if budget < 0:
+            print(f"⚠️ Web storage alone is over the {self.max_bytes // (1024 * 1024)} MB RAM cache "
+                  f"ceiling; it is kept whole and the caches get no room")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"🧠 RAM cache at {self.ram_root}: restored {self.bytes_restored // 1024} KB "
+              f"in {elapsed_ms:.0f} ms")
+
+    def snapshot(self, include_storage=False):
+        """Copy the hot part of the caches back to disk, and storage too if
+        include_storage is set (only once the web engine has shut down)"""
+        folders = (STORAGE_FOLDERS if include_storage else ()) + CACHE_FOLDERS
+        with self._lock:
+            start = time.perf_counter()
+            copied = ram_bytes = 0
+            budget = self.snapshot_bytes
+            for folder in folders:
+                source = self.get_path(folder)
+                if not os.path.isdir(source):
+                    continue
+                target = os.path.join(self.disk_root, folder)
+                if folder in STORAGE_FOLDERS:
+                    folder_copied, kept = sync_tree(source, target)
+                else:
+                    folder_copied, kept = sync_tree(source, target, max(0, budget))
+                    budget -= kept
+                copied += folder_copied
+                ram_bytes += sum(size for _, size, _ in list_files(source))
+            self.ram_bytes = ram_bytes
+            self.bytes_snapshotted += copied
+            self.snapshots += 1
+            self.last_snapshot_ms = (time.perf_counter() - start) * 1000
+            return copied
+
+    def start(self):
+        """Snapshot in the background every interval seconds"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="RamCacheSnapshot", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.snapshot()
+            except OSError as e:
+                print(f"Error snapshotting RAM cache: {e}")
+
+    def stop(self):
+        """Stop the background snapshots"""
+        self._stop_event.set()
+
+    def close(self):
+        """Take the final snapshot, storage included; call only after the web
+        engine has shut down and its profiles are gone"""
+        self.stop()
+        try:
+            copied = self.snapshot(include_storage=True)
+            print(f"🧠 RAM cache snapshot: {copied // 1024} KB written in {self.last_snapshot_ms:.0f} ms")
+        except OSError as e:
+            print(f"Error snapshotting RAM cache: {e}")
+
+    def get_stats(self):
+        return {
+            "ram_bytes": self.ram_bytes,
+            "restored_bytes": self.bytes_restored,
+            "snapshot_bytes": self.bytes_snapshotted,
+            "snapshots": self.snapshots,
+            "last_snapshot_ms": self.last_snapshot_ms,
+        }
+
+
+_ram_cache = None
+_checked = False
+
+
+def get_ram_cache(disk_root):
+    """Return the RAM cache for disk_root, restoring it on first use, or None in disk mode"""
+    global _ram_cache, _checked
+    if _checked:
+        return _ram_cache
+    _checked = True
+    ram_root = get_ram_root(disk_root)
+    if not is_enabled():
+        # A RAM copy from an earlier RAM-mode run would be stale by next time
+        if ram_root and os.path.isdir(ram_root):
+            shutil.rmtree(ram_root, ignore_errors=True)
+        return None
+    if ram_root is None:
+        print("⚠️ RAM cache mode needs a tmpfs folder (/dev/shm); using the disk")
+        return None
+    try:
+        max_bytes = int(config.get_config_value("ram_cache_mb", 768)) * 1024 * 1024
+        snapshot_bytes = int(config.get_config_value("ram_cache_snapshot_mb", 256)) * 1024 * 1024
+        interval = float(config.get_config_value("ram_cache_snapshot_interval", 300))
+    except (ValueError, TypeError):
+        max_bytes, snapshot_bytes, interval = 768 * 1024 * 1024, 256 * 1024 * 1024, 300.0
+    _ram_cache = RamCache(disk_root, ram_root, max_bytes, snapshot_bytes, interval)
+    _ram_cache.restore()
+    _ram_cache.start()
+    return _ram_cache
+
+
+def get_active():
+    """Return the RAM cache if this run uses one"""
+    return _ram_cache
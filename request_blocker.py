@@ -0,0 +1,74 @@
+# request_blocker.py
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+from PyQt6.QtWidgets import QApplication
+from url_matcher import HostPathMatcher
+import block_stats
+import config
+import tool_manifest
+
+_matcher = None
+_blockers = {}  # tool manifest id -> RequestBlocker
+
+
+class RequestBlocker(QWebEngineUrlRequestInterceptor):
+    """Drops blocklisted subresource requests for one tool's pages"""
+
+    def __init__(self, title, matcher, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.matcher = matcher
+        self.checked = 0
+
+    def interceptRequest(self, info):
+        # The tool's own page always loads; only what it pulls in is filtered
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return
+        self.checked += 1
+        url = info.requestUrl()
+        if self.matcher.matches(url.host(), url.path()):
+            info.block(True)
+            block_stats.record(self.title)
+
+
+def get_matcher():
+    """Return the blocklist compiled from config (built once)"""
+    global _matcher
+    if _matcher is None:
+        rules = config.get_config_value("blocklist") or []
+        _matcher = HostPathMatcher(rules)
+        print(f"🛡️ Compiled {_matcher.rule_count} blocklist rules")
+    return _matcher
+
+
+def get_blocked_ids():
+    """Manifest ids of the tools the blocklist applies to; tool names from older configs still count"""
+    manifest = tool_manifest.get_manifest()
+    ids = set()
+    for entry in config.get_config_value("request_blocking_tools") or []:
+        tool = manifest.get(entry) or manifest.find(entry)
+        if tool is not None:
+            ids.add(tool.id)
+    return ids
+
+
+def is_enabled_for(title):
+    tool = tool_manifest.get_manifest().find(title)
+    return tool is not None and tool.id in get_blocked_ids()
+
+
+def get_blocker(title):
+    """Return the interceptor for a tool, creating it on first use"""
+    tool_id = tool_manifest.get_manifest().find(title).id
+    if tool_id not in _blockers:
+        _blockers[tool_id] = RequestBlocker(title, get_matcher(), QApplication.instance())
+    return _blockers[tool_id]
+
+
+def apply(page, title):
+    """Attach the tool's blocker to a tool page, or clear it if blocking is off for the tool"""
+    page.setUrlRequestInterceptor(get_blocker(title) if is_enabled_for(title) else None)
+
+
+def clear(page):
+    """Remove any blocker from a page going back to the pool"""
+    page.setUrlRequestInterceptor(None)
@@ -1,19 +1,29 @@
 # right_panel.py
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QGroupBox, 
-                             QCheckBox, QScrollArea, QHBoxLayout, QLabel)
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-from PyQt6.QtCore import QUrl, Qt, pyqtSignal
+                             QCheckBox, QLineEdit, QHBoxLayout, QLabel, QMenu,
+                             QComboBox)
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon, QPixmap
-from config import load_config, save_config, get_config_value, set_config_value
-from styles import get_icon_path
+from config import load_config, get_config_value, set_config_value
+from performance_panel import PerformanceGroup
+from game_dock import VIEW_MODES, get_view_mode
+from tool_list import ToolListView
+import tool_sessions
+import tool_manifest
+import lifecycle
 import os
 
 
 class ToolWindow(QWidget):
-    def __init__(self, url, title, parent=None):
+    dock_requested = pyqtSignal()
+    closed = pyqtSignal()
+    activated = pyqtSignal()
+    
+    def __init__(self, url, title, parent=None, view=None):
         super().__init__(parent)
         self.setWindowTitle(f"2004Kit - {title}")
+        self.url = url
+        self.title = title
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)  # Ensure proper cleanup
         
         # Set window icon if it exists
@@ -43,23 +53,45 @@ class ToolWindow(QWidget):
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        
+        # Thin bar with a button to move the page into a main window tab
+        bar_layout = QHBoxLayout()
+        bar_layout.setContentsMargins(4, 2, 4, 2)
+        bar_layout.addStretch()
+        dock_button = QPushButton("Move to tab")
+        dock_button.setObjectName("smallButton")
+        dock_button.setToolTip("Show this page in a tab of the main window without reloading it")
+        dock_button.clicked.connect(self.dock_requested.emit)
+        bar_layout.addWidget(dock_button)
+        layout.addLayout(bar_layout)
 
-        # Use separate profile for each window to avoid conflicts
-        profile_name = f"ToolWindow_{title.replace(' ', '_')}"
-        profile = QWebEngineProfile(profile_name, self)
-        profile.setPersistentCookiesPolicy(
-            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
-        )
-
-        page = QWebEnginePage(profile, self)
-        self.web_view = QWebEngineView()
-        self.web_view.setPage(page)
+        if view is None:
+            # Borrow a warm view on the shared tools profile. QtWebEngine is only
+            # loaded once a tool is actually opened.
+            import view_pool
+            print(f"Loading URL in window: {url}")
+            view = view_pool.borrow_view(url, title)
+        self.web_view = view
         
         layout.addWidget(self.web_view)
+        self.web_view.show()
         
-        # Load URL after everything is set up
-        print(f"Loading URL in window: {url}")
-        self.web_view.setUrl(QUrl(url))
+        # Let the lifecycle manager freeze this page while the window is hidden
+        lifecycle.get_manager().register(self.web_view.page(), title)
+
+    def take_view(self):
+        """Detach the web view, still loaded, so another container can show it"""
+        view = self.web_view
+        self.web_view = None
+        if view is not None:
+            view.setParent(None)
+        return view
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self.activated.emit()
+        super().changeEvent(event)
 
     def closeEvent(self, event):
         # Save window geometry when closing
@@ -68,6 +100,14 @@ class ToolWindow(QWidget):
             set_config_value("tool_window_geometry", [geom.x(), geom.y(), geom.width(), geom.height()])
         except Exception as e:
             print(f"Error saving window geometry: {e}")
+        
+        # Hand the view back to the pool before the window is deleted, unless
+        # it was moved to a tab
+        if self.web_view is not None:
+            import view_pool
+            view_pool.get_pool().release(self.web_view)
+            self.web_view = None
+        self.closed.emit()
         event.accept()
 
 
@@ -75,7 +115,7 @@ class InGameBrowser(QWidget):
     """Browser widget that can be embedded in the main window"""
     closed = pyqtSignal()
     
-    def __init__(self, url, title, parent=None):
+    def __init__(self, url, title, parent=None, view=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.url = url
@@ -90,25 +130,43 @@ class InGameBrowser(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)  # Remove margins since tab already handles close
 
-        # Web view only - no title bar or close button since tab handles that
-        profile = QWebEngineProfile.defaultProfile()
-        page = QWebEnginePage(profile, self)
-        view = QWebEngineView()
-        view.setPage(page)
-        view.setUrl(QUrl(url))
+        # Web view only - no title bar or close button since tab handles that.
+        # Borrowed from the warm pool unless an open page is being moved here;
+        # QtWebEngine is only loaded once a tool is opened.
+        if view is None:
+            import view_pool
+            view = view_pool.borrow_view(url, title)
 
         layout.addWidget(view)
+        view.show()
+        
+        # Let the lifecycle manager freeze this page while its tab is in the background
+        lifecycle.get_manager().register(view.page(), title)
         
         # Store reference to view for potential future use
         self.web_view = view
 
+    def take_view(self):
+        """Detach the web view, still loaded, so another container can show it"""
+        view = self.web_view
+        self.web_view = None
+        if view is not None:
+            view.setParent(None)
+        return view
+
+    def release_view(self):
+        """Hand the web view back to the pool before this tab is deleted"""
+        if self.web_view is not None:
+            import view_pool
+            view_pool.get_pool().release(self.web_view)
+            self.web_view = None
+
     def close_browser(self):
         """Close the browser tab - this method was missing!"""
         try:
-            # Stop the web view if it exists
+            # Return the web view to the pool if it exists
             if hasattr(self, 'web_view') and self.web_view:
-                self.web_view.stop()
-                self.web_view.setParent(None)
+                self.release_view()
             
             # Emit the closed signal so parent can handle cleanup
             self.closed.emit()
@@ -122,12 +180,16 @@ class InGameBrowser(QWidget):
 
 class RightToolsPanel(QWidget):
     browser_requested = pyqtSignal(str, str)  # url, title
+    view_mode_changed = pyqtSignal(str)  # tabs, split or pip
+    dock_requested = pyqtSignal(object, str, str)  # live web view, url, title
+    open_external_changed = pyqtSignal(bool)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.config = load_config()
-        self.tool_buttons = []
-        self.open_windows = []  # Keep references to open windows to prevent garbage collection
+        # Open tool windows are owned (and kept alive) by the session manager
+        self.sessions = tool_sessions.get_manager()
+        self.prefetch_enabled = False  # Turned on once the web engine has started
         
         # Force RuneScape font
         font = QFont("RuneScape UF")
@@ -149,161 +211,118 @@ class RightToolsPanel(QWidget):
         self.external_checkbox.stateChanged.connect(self.on_external_changed)
         
         settings_layout.addWidget(self.external_checkbox)
+        
+        # Where the game goes while a tool tab is in front
+        view_mode_layout = QHBoxLayout()
+        view_mode_layout.addWidget(QLabel("Game behind tabs:"))
+        self.view_mode_combo = QComboBox()
+        for mode, label in VIEW_MODES.items():
+            self.view_mode_combo.addItem(label, mode)
+        self.view_mode_combo.setCurrentIndex(list(VIEW_MODES).index(get_view_mode()))
+        self.view_mode_combo.setToolTip("Split view and picture-in-picture keep the game rendering")
+        self.view_mode_combo.currentIndexChanged.connect(
+            lambda index: self.view_mode_changed.emit(self.view_mode_combo.itemData(index)))
+        view_mode_layout.addWidget(self.view_mode_combo, 1)
+        settings_layout.addLayout(view_mode_layout)
         settings_group.setLayout(settings_layout)
         
         # Set fixed height for settings group to prevent it from expanding
-        settings_group.setFixedHeight(80)
+        settings_group.setFixedHeight(110)
         main_layout.addWidget(settings_group)
 
+        # Performance Group - live renderer usage per page
+        self.performance_group = PerformanceGroup()
+        self.performance_group.setFixedHeight(230)
+        main_layout.addWidget(self.performance_group)
+
         # Tools Group - this should take up remaining space
         tools_group = QGroupBox("Tools")
         tools_layout = QVBoxLayout()
         tools_layout.setContentsMargins(5, 10, 5, 5)
         
-        # Scroll area for tools - this will expand to fill available space
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        
-        # Remove any size constraints that might limit the scroll area
-        scroll_area.setMinimumHeight(0)
-        scroll_area.setSizePolicy(scroll_area.sizePolicy().Policy.Expanding, 
-                                 scroll_area.sizePolicy().Policy.Expanding)
-        
-        scroll_widget = QWidget()
-        self.tools_layout = QVBoxLayout(scroll_widget)
-        self.tools_layout.setSpacing(5)
-        self.tools_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Define tools list - Updated with new tools
-        self.tools_data = [
-            ("Forums", "https://lostcity.rs"),
-            ("Clue Coordinates", "https://razgals.github.io/2004-Coordinates/"),
-            ("Clue Scroll Help", "https://razgals.github.io/Treasure/"),
-            ("World Map", "https://2004.lostcity.rs/worldmap"),
-            ("Highscores", "https://2004.lostcity.rs/hiscores"),
-            ("Market Prices", "https://lostcity.markets"),
-            ("Quest Help", "https://2004.losthq.rs/?p=questguides"),
-            ("Skill Guides", "https://2004.losthq.rs/?p=skillguides"),
-            ("Skills Calculator", "https://2004.losthq.rs/?p=calculators"),
-            ("Bestiary", "https://2004.losthq.rs/?p=droptables"),
-        ]
-
-        # Create tool buttons
-        self.setup_tool_buttons()
-        
-        scroll_area.setWidget(scroll_widget)
-        tools_layout.addWidget(scroll_area)
+        # Typing narrows the list as you go; Enter opens the first match
+        self.tool_filter = QLineEdit()
+        self.tool_filter.setPlaceholderText("Filter tools...")
+        self.tool_filter.setClearButtonEnabled(True)
+        tools_layout.addWidget(self.tool_filter)
+
+        # Tools come from the manifest (built-ins plus tools.json)
+        self.manifest = tool_manifest.get_manifest()
+
+        # One view paints every tool, so list length doesn't cost widgets or style parses
+        self.tool_list = ToolListView(self.manifest.tools)
+        self.tool_list.tool_activated.connect(self.open_tool_clicked)
+        self.tool_list.tool_hovered.connect(self.on_tool_hovered)
+        self.tool_list.tool_unhovered.connect(self.on_tool_unhovered)
+        self.tool_list.context_menu_requested.connect(self.show_tool_menu)
+        self.tool_filter.textChanged.connect(self.tool_list.set_filter)
+        self.tool_filter.returnPressed.connect(self.tool_list.activate_first)
+        tools_layout.addWidget(self.tool_list)
         tools_group.setLayout(tools_layout)
         
         # Add tools group with stretch factor so it expands to fill remaining space
         main_layout.addWidget(tools_group, 1)  # stretch factor of 1
 
-    def setup_tool_buttons(self):
-        """Create all tool buttons"""
-        # Clear existing buttons
-        for button in self.tool_buttons:
-            button.setParent(None)
-            button.deleteLater()
-        self.tool_buttons.clear()
-
-        # Create buttons for each tool
-        for i, (name, url) in enumerate(self.tools_data):
-            btn = QPushButton()
-            
-            # Force RuneScape font on button
-            font = QFont("RuneScape UF")
-            if not font.exactMatch():
-                font = QFont("runescape_uf")
-            btn.setFont(font)
-            
-            # Set button background image if button.jpg exists
-            if os.path.exists("button.jpg"):
-                btn.setStyleSheet(f"""
-                    QPushButton {{
-                        background-image: url(button.jpg);
-                        border: 2px solid #2a2a2a;
-                        border-radius: 8px;
-                        padding: 8px;
-                        color: #f5e6c0;
-                        font-weight: bold;
-                        min-height: 40px;
-                        text-align: left;
-                    }}
-                    QPushButton:hover {{
-                        border-color: #8b4a4a;
-                        background-color: rgba(139, 74, 74, 0.3);
-                    }}
-                    QPushButton:pressed {{
-                        border: 2px inset #2a2a2a;
-                        background-color: rgba(139, 74, 74, 0.5);
-                    }}
-                """)
-            
-            # Set button text with icon and name
-            icon = get_icon_path(name)
-            btn.setText(f"{icon}  {name}")
-            btn.setToolTip(name)
-            
-            # Set button size
-            btn.setMinimumHeight(50)
-            btn.setMaximumHeight(60)
-            
-            # Set size policy to expand horizontally but keep fixed height
-            btn.setSizePolicy(btn.sizePolicy().Policy.Expanding, 
-                             btn.sizePolicy().Policy.Fixed)
-            
-            # Connect button click - using partial to avoid lambda closure issue
-            def make_click_handler(tool_url, tool_name):
-                return lambda: self.open_tool_clicked(tool_url, tool_name)
-            
-            btn.clicked.connect(make_click_handler(url, name))
-            
-            # Add to layout and track
-            self.tools_layout.addWidget(btn)
-            self.tool_buttons.append(btn)
-            
-        # Add stretch at the bottom to push buttons to top if there's extra space
-        self.tools_layout.addStretch()
+    def enable_prefetch(self):
+        """Start reacting to hover once the web engine is running"""
+        self.prefetch_enabled = True
+
+    def preload_tools(self):
+        """Prerender the tools the manifest marks for preloading"""
+        import prefetch
+        for tool in self.manifest.tools:
+            if tool.preload:
+                prefetch.get_prefetcher().prerender(tool.url, tool.name, pinned=True)
+
+    def on_tool_hovered(self, url, name):
+        """Pointer or keyboard focus on a tool warms its connection and prerenders it"""
+        if self.prefetch_enabled:
+            import prefetch
+            prefetch.get_prefetcher().hover_started(url, name)
+
+    def on_tool_unhovered(self, url):
+        if self.prefetch_enabled:
+            import prefetch
+            prefetch.get_prefetcher().hover_ended(url)
+
+    def show_tool_menu(self, name, global_pos):
+        """The World Map can be downloaded whole for offline use"""
+        if name != "World Map":
+            return
+        menu = QMenu(self)
+        action = menu.addAction("Download whole map for offline use")
+        handler = None
+        # The tile pack lives in the web engine, which may not be running yet
+        if self.prefetch_enabled:
+            import map_scheme
+            handler = map_scheme.get_handler()
+        if handler is None or not handler.has_bulk_source():
+            action.setEnabled(False)
+            action.setToolTip("Open the World Map first, or set world_map_bulk_template in config.json")
+            menu.setToolTipsVisible(True)
+        if menu.exec(global_pos) == action:
+            handler.start_bulk_download()
 
     def on_external_changed(self, state):
         """Handle external window checkbox change"""
         is_external = state == Qt.CheckState.Checked.value
-        self.config["open_external"] = is_external
-        save_config(self.config)
+        set_config_value("open_external", is_external)
+        # Tools already open move to the new layout without reloading
+        self.open_external_changed.emit(is_external)
+        if not is_external:
+            for session in self.sessions.get_sessions(tool_sessions.WINDOW):
+                self.dock_window(session.container)
 
     def open_tool_clicked(self, url, title):
         """Handle tool button click"""
         print(f"Opening tool: {title} - {url}")  # Debug print
-        if self.config.get("open_external", True):
+        # Already open in a tab or window: bring that one forward
+        if self.sessions.focus(self.manifest.get_tool_id(title)):
+            return
+        if get_config_value("open_external", True):
             # Open in separate window
             try:
-                # Check if window already exists
-                for window in self.open_windows[:]:  # Use slice to avoid modification during iteration
-                    if not window.isVisible():  # Remove closed windows
-                        self.open_windows.remove(window)
-                    elif window.windowTitle() == f"2004Kit - {title}":
-                        # Window already exists, bring it to front
-                        window.show()
-                        window.activateWindow()
-                        window.raise_()
-                        return
-                
-                # Create new window - no parent reference to make it truly independent
-                window = ToolWindow(url, title, None)
-                
-                # Connect window destroyed signal to remove from list
-                window.destroyed.connect(lambda: self.remove_window_from_list(window))
-                
-                # Add to list to keep reference
-                self.open_windows.append(window)
-                
-                # Show window
-                window.show()
-                window.activateWindow()
-                window.raise_()
-                
+                self.open_tool_window(url, title)
                 print(f"✅ Successfully opened window: {title}")
                 
             except Exception as e:
@@ -317,10 +336,34 @@ class RightToolsPanel(QWidget):
             except Exception as e:
                 print(f"Error opening browser tab: {e}")
 
-    def remove_window_from_list(self, window):
-        """Remove window from list when it's destroyed"""
-        try:
-            if window in self.open_windows:
-                self.open_windows.remove(window)
-        except:
-            pass  # Window might already be removed
\ No newline at end of file
+    def open_tool_window(self, url, title, view=None):
+        """Show a tool in its own window, optionally adopting an already loaded view"""
+        # Create new window - no parent reference to make it truly independent
+        window = ToolWindow(url, title, None, view)
+        tool_id = self.manifest.get_tool_id(title)
+        
+        # The session manager keeps the window alive until it closes
+        window.closed.connect(lambda: self.sessions.remove(tool_id, window))
+        window.dock_requested.connect(lambda: self.dock_window(window))
+        window.activated.connect(lambda: self.sessions.touch(tool_id))
+        self.sessions.add(tool_id, title, url, tool_sessions.WINDOW, window,
+                          focus=lambda: self.focus_window(window), close=window.close)
+        
+        self.focus_window(window)
+        return window
+
+    def focus_window(self, window):
+        """Show a tool window in front and wake its page"""
+        window.show()
+        window.activateWindow()
+        window.raise_()
+        if window.web_view is not None:
+            lifecycle.get_manager().touch(window.web_view.page())
+
+    def dock_window(self, window):
+        """Move a tool window's live page into a main window tab"""
+        url, title = window.url, window.title
+        view = window.take_view()
+        window.close()
+        if view is not None:
+            self.dock_requested.emit(view, url, title)
\ No newline at end of file
@@ -0,0 +1,123 @@
+# single_instance.py
+from PyQt6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+from PyQt6.QtCore import QObject, pyqtSignal
+import config
+import argparse
+import getpass
+import hashlib
+import json
+import os
+
+# How long a second launch waits for the running kit before starting itself
+CONNECT_TIMEOUT_MS = 300
+REPLY_TIMEOUT_MS = 1000
+
+FOCUS = "focus"
+OPEN_TOOL = "open_tool"
+OPEN_URL = "open_url"
+
+
+def get_server_name():
+    """Name of the local socket, unique per user and cache folder.
+
+    Two kits only conflict when they would share web profiles, so a kit with a
+    different cache_root may still run alongside."""
+    root = config.get_config_value("cache_root") or config.get_data_dir()
+    root = os.path.abspath(os.path.expanduser(root))
+    digest = hashlib.sha1(f"{getpass.getuser()}:{root}".encode()).hexdigest()[:12]
+    return f"2004Kit-{digest}"
+
+
+def is_enabled():
+    return bool(config.get_config_value("single_instance", True))
+
+
+def parse_request(argv):
+    """Turn command line arguments into a request for the running kit"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--tool", help="open a tool by name, e.g. \"Quest Help\"")
+    parser.add_argument("--url", help="open a page in a tool tab or window")
+    # Anything else (Qt options) is left for QApplication
+    args, _ = parser.parse_known_args(argv)
+    if args.tool:
+        return {"action": OPEN_TOOL, "tool": args.tool}
+    if args.url:
+        return {"action": OPEN_URL, "url": args.url}
+    return {"action": FOCUS}
+
+
+def send_request(request, server_name=None):
+    """Deliver a request to a running kit; returns False if none is listening"""
+    socket = QLocalSocket()
+    socket.connectToServer(server_name or get_server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    socket.write((json.dumps(request) + "\n").encode("utf-8"))
+    socket.waitForBytesWritten(REPLY_TIMEOUT_MS)
+    # Wait for the acknowledgement so a dying server isn't mistaken for a live one
+    acknowledged = socket.waitForReadyRead(REPLY_TIMEOUT_MS) and bytes(socket.readLine()).strip() == b"ok"
+    socket.disconnectFromServer()
+    return acknowledged
+
+
+def forward_to_running(argv):
+    """Hand this launch's request to an already running kit. Returns True if it took it."""
+    if not is_enabled():
+        return False
+    request = parse_request(argv)
+    if not send_request(request):
+        return False
+    print(f"➡️ 2004Kit is already running; forwarded {request['action']}")
+    return True
+
+
+class InstanceServer(QObject):
+    """Listens for requests from later launches of the kit"""
+    request_received = pyqtSignal(dict)
+
+    def __init__(self, server_name=None, parent=None):
+        super().__init__(parent)
+        self.server_name = server_name or get_server_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def listen(self):
+        """Claim the instance name; returns False if another kit holds it"""
+        if self.server.listen(self.server_name):
+            return True
+        if self.server.serverError() == QAbstractSocket.SocketError.AddressInUseError:
+            # Either a kit that started a moment ago, or a socket left by a crash
+            probe = QLocalSocket()
+            probe.connectToServer(self.server_name)
+            if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(self.server_name)
+            if self.server.listen(self.server_name):
+                return True
+        print(f"⚠️ Single-instance server unavailable: {self.server.errorString()}")
+        return False
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self.on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def on_ready_read(self, socket):
+        if not socket.canReadLine():
+            return
+        try:
+            request = json.loads(bytes(socket.readLine()).decode("utf-8"))
+        except ValueError as e:
+            print(f"Ignoring malformed instance request: {e}")
+            socket.disconnectFromServer()
+            return
+        socket.write(b"ok\n")
+        socket.flush()
+        if isinstance(request, dict):
+            self.request_received.emit(request)
+
+    def close(self):
+        self.server.close()
@@ -0,0 +1,22 @@
+# startup_timing.py
+import time
+
+# Reference point for every phase; import this module first thing in main.py
+PROCESS_START = time.perf_counter()
+
+_marks = {}
+
+
+def mark(phase):
+    """Record the first time a startup phase is reached and print its offset"""
+    if phase in _marks:
+        return _marks[phase]
+    elapsed_ms = (time.perf_counter() - PROCESS_START) * 1000
+    _marks[phase] = elapsed_ms
+    print(f"⏱️ {phase}: {elapsed_ms:.0f} ms")
+    return elapsed_ms
+
+
+def get_marks():
+    """Return a copy of all recorded phases, in milliseconds since start"""
+    return dict(_marks)
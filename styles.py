@@ -1,4 +1,6 @@
 # styles.py
+import tool_manifest
+
 # Dark Pastel Theme Colors
 DARK_PASTEL_BROWN = "#4a3428"     # Dark pastel brown
 DARK_PASTEL_GREY = "#3a3a3a"      # Dark pastel grey  
@@ -131,6 +133,49 @@ QCheckBox::indicator:checked {{
     border-radius: 3px;
 }}
 
+/* Performance Panel */
+QTreeWidget {{
+    background-color: {DARK_PASTEL_GREY};
+    border: 1px solid {BORDER_COLOR};
+    border-radius: 3px;
+    font-size: 11px;
+}}
+
+QTreeWidget::item:selected {{
+    background-color: {DARK_PASTEL_RED};
+}}
+
+QHeaderView::section {{
+    background-color: {LIGHTER_BROWN};
+    color: {TEXT_COLOR};
+    border: 1px solid {BORDER_COLOR};
+    padding: 2px 4px;
+}}
+
+QPushButton#smallButton {{
+    min-height: 20px;
+    padding: 4px 8px;
+    text-align: center;
+}}
+
+/* Tool list rows are painted by tool_list.ToolButtonDelegate */
+QListView#toolList {{
+    background-color: transparent;
+    border: none;
+}}
+
+QLineEdit {{
+    background-color: {DARK_PASTEL_GREY};
+    border: 1px solid {BORDER_COLOR};
+    border-radius: 4px;
+    padding: 4px;
+}}
+
+QPushButton:disabled {{
+    background-color: {LIGHTER_GREY};
+    color: {LIGHTER_BROWN};
+}}
+
 /* Tool Windows */
 QWebEngineView {{
     border: 1px solid {BORDER_COLOR};
@@ -139,16 +184,4 @@ QWebEngineView {{
 
 def get_icon_path(tool_name):
     """Return the icon path for a tool, with fallback"""
-    icon_map = {
-        "Clue Coordinates": "📍",
-        "Clue Scroll Help": "📜", 
-        "World Map": "🗺️",
-        "Highscores": "🏆",
-        "Market Prices": "💰",
-        "Quest Help": "🛡️",  # Changed from sword to shield to avoid duplication
-        "Skill Guides": "📚",
-        "Forums": "💬",
-        "Skills Calculator": "🧮",
-        "Bestiary": "🐉"
-    }
-    return icon_map.get(tool_name, "🔧")
\ No newline at end of file
+    return tool_manifest.get_manifest().get_icon(tool_name)
\ No newline at end of file
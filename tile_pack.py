@@ -0,0 +1,213 @@
+# tile_pack.py
+import mmap
+import os
+import struct
+import threading
+
+# File layout (all integers little-endian):
+#   MAGIC
+#   tile bodies, back to back
+#   index: per tile <offset:Q><length:I><key_len:H><type_len:B> key type
+#   footer: <index_offset:Q><index_count:I> MAGIC
+# New tiles and a new index are appended on flush, so an interrupted write never
+# touches data the previous footer points at: on open, the pack is cut back to
+# the last complete footer. Stale index blocks are dropped by compacting when
+# the pack is opened.
+MAGIC = b"2KTPACK1"
+FOOTER = struct.Struct("<QI")
+ENTRY = struct.Struct("<QIHB")
+
+# Compact on open once this share of the file is unreachable
+COMPACT_RATIO = 0.25
+
+
+def parse_index(data, magic_at):
+    """Return the index whose footer ends with the MAGIC at magic_at in data, or
+    None if that MAGIC isn't the end of a complete footer (tile bodies can hold
+    the same bytes)"""
+    footer_at = magic_at - FOOTER.size
+    if footer_at < len(MAGIC):
+        return None
+    index_offset, count = FOOTER.unpack_from(data, footer_at)
+    if not len(MAGIC) <= index_offset <= footer_at:
+        return None
+    index = {}
+    position = index_offset
+    try:
+        for _ in range(count):
+            offset, length, key_len, type_len = ENTRY.unpack_from(data, position)
+            position += ENTRY.size
+            key = bytes(data[position:position + key_len]).decode("utf-8")
+            position += key_len
+            content_type = bytes(data[position:position + type_len]).decode("ascii")
+            position += type_len
+            if position > footer_at or offset < len(MAGIC) or offset + length > index_offset:
+                return None
+            index[key] = (offset, length, content_type)
+    except (struct.error, UnicodeDecodeError):
+        return None
+    return index if position == footer_at else None
+
+
+class TilePack:
+    """Single-file, append-only tile store read through mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self.index = {}  # key -> (offset, length, content type)
+        self.pending = {}  # key -> (body, content type), not yet on disk
+        self.mapped = None
+        self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            self._read_index()
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ World map pack unreadable ({e}); starting a new one")
+            os.replace(self.path, self.path + ".corrupt")
+            self.index = {}
+            return
+
+        live_bytes = len(MAGIC) + sum(length for _, length, _ in self.index.values())
+        if os.path.getsize(self.path) > live_bytes and \
+                1 - live_bytes / os.path.getsize(self.path) > COMPACT_RATIO:
+            self._compact()
+        self.mapped = self._map()
+
+    def _read_index(self):
+        """Load the index of the last complete flush, cutting off whatever an
+        interrupted flush left after it"""
+        with open(self.path, "r+b") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("bad header")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                size = end = len(data)
+                while True:
+                    magic_at = data.rfind(MAGIC, len(MAGIC), end)
+                    if magic_at < 0:
+                        raise ValueError("no complete index")
+                    index = parse_index(data, magic_at)
+                    if index is not None:
+                        break
+                    end = magic_at + len(MAGIC) - 1
+            footer_end = magic_at + len(MAGIC)
+            if footer_end < size:
+                print(f"⚠️ World map pack has an unfinished write; keeping the {len(index)} tiles stored before it")
+                f.truncate(footer_end)
+        self.index = index
+
+    def _compact(self):
+        """Rewrite the pack with only reachable data (before it is mapped)"""
+        tmp_path = self.path + ".tmp"
+        new_index = {}
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.write(MAGIC)
+            for key, (offset, length, content_type) in self.index.items():
+                src.seek(offset)
+                new_index[key] = (dst.tell(), length, content_type)
+                dst.write(src.read(length))
+            self._write_index(dst, new_index)
+        os.replace(tmp_path, self.path)
+        self.index = new_index
+
+    def _write_index(self, f, index):
+        """Write an index block and footer at the current position"""
+        index_offset = f.tell()
+        for key, (offset, length, content_type) in index.items():
+            key_bytes = key.encode("utf-8")
+            type_bytes = content_type.encode("ascii")
+            f.write(ENTRY.pack(offset, length, len(key_bytes), len(type_bytes)))
+            f.write(key_bytes)
+            f.write(type_bytes)
+        f.write(FOOTER.pack(index_offset, len(index)))
+        f.write(MAGIC)
+
+    def _map(self):
+        """Map the current file; readers of an older map keep it alive until done"""
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self.index or key in self.pending
+
+    def __len__(self):
+        with self._lock:
+            return len(self.index) + len(self.pending)
+
+    def keys(self):
+        with self._lock:
+            return list(self.index) + list(self.pending)
+
+    def locate(self, key):
+        """Return (mapping, offset, length, content type) for a stored tile, or None.
+
+        The mapping can be sliced without copying the whole file; pending tiles
+        come back as a bytes object with offset 0."""
+        with self._lock:
+            if key in self.pending:
+                body, content_type = self.pending[key]
+                return body, 0, len(body), content_type
+            entry = self.index.get(key)
+            if entry is None or self.mapped is None:
+                return None
+            offset, length, content_type = entry
+            return self.mapped, offset, length, content_type
+
+    def read(self, key):
+        """Return (body, content type) for a tile, or (None, None)"""
+        located = self.locate(key)
+        if located is None:
+            return None, None
+        source, offset, length, content_type = located
+        return source[offset:offset + length], content_type
+
+    def put(self, key, body, content_type):
+        """Queue a tile; it is served from memory until the next flush"""
+        with self._lock:
+            if key not in self.index:
+                self.pending[key] = (bytes(body), content_type)
+
+    def flush(self):
+        """Append pending tiles and a fresh index to the pack.
+
+        The file is written without holding the lock, so locate() keeps answering
+        from the old index and the pending tiles; the new index and map replace
+        them together once the data is on disk."""
+        with self._flush_lock:
+            with self._lock:
+                if not self.pending:
+                    return
+                pending = dict(self.pending)
+                index = dict(self.index)
+            new_file = not os.path.exists(self.path)
+            with open(self.path, "wb" if new_file else "r+b") as f:
+                if new_file:
+                    f.write(MAGIC)
+                else:
+                    # Append after the current footer so the old index stays valid
+                    f.seek(0, os.SEEK_END)
+                for key, (body, content_type) in pending.items():
+                    index[key] = (f.tell(), len(body), content_type)
+                    f.write(body)
+                self._write_index(f, index)
+                f.flush()
+                os.fsync(f.fileno())
+            mapped = self._map()
+            with self._lock:
+                self.index = index
+                self.mapped = mapped
+                for key in pending:
+                    self.pending.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "tiles": len(self.index) + len(self.pending),
+                "pending": len(self.pending),
+                "file_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            }
@@ -0,0 +1,286 @@
+# tool_list.py
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex,
+                          QRectF, QSize, QPoint, pyqtSignal)
+from PyQt6.QtGui import QPixmap, QPainter, QPainterPath, QColor, QPen, QBrush, QFont
+from styles import BORDER_COLOR, DARK_PASTEL_RED, LIGHTER_RED, TEXT_COLOR
+import math
+import os
+
+BUTTON_IMAGE = "button.jpg"
+
+# Row geometry, matching the old per-tool buttons
+ROW_HEIGHT = 50
+ROW_SPACING = 5
+ICON_SIZE = 20
+PADDING = 10
+RADIUS = 8
+
+# Item roles, read from Qt.ItemDataRole when the first model is made rather than at
+# import: the first Qt enum lookup builds PyQt's whole Qt namespace, a one-time cost
+# that belongs to building the window, not to importing this module
+URL_ROLE = NAME_ROLE = ICON_ROLE = None
+NAME_ROLES = ()  # roles data() answers with the tool's name
+
+NORMAL = "normal"
+HOVER = "hover"
+PRESSED = "pressed"
+
+# Cached backgrounds are keyed by row size; a resize drag makes many sizes
+MAX_CACHED_BACKGROUNDS = 32
+
+
+def resolve_roles():
+    """Fill in the item roles from Qt.ItemDataRole (once)"""
+    global URL_ROLE, NAME_ROLE, ICON_ROLE, NAME_ROLES
+    if URL_ROLE is not None:
+        return
+    URL_ROLE = Qt.ItemDataRole.UserRole
+    NAME_ROLE = URL_ROLE + 1
+    ICON_ROLE = URL_ROLE + 2
+    NAME_ROLES = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, NAME_ROLE)
+
+
+class ToolListModel(QAbstractListModel):
+    """Rows of manifest tools, narrowed by a name filter"""
+
+    def __init__(self, tools=(), parent=None):
+        super().__init__(parent)
+        resolve_roles()
+        self.tools = []
+        self.keys = []  # lowercased names the filter matches against
+        self.visible = []  # indexes into self.tools shown under the current filter
+        self.filter_text = ""
+        self.set_tools(tools)
+
+    def set_tools(self, tools):
+        self.beginResetModel()
+        self.tools = list(tools)
+        self.keys = [tool.name.lower() for tool in self.tools]
+        self.visible = self.match(range(len(self.tools)), self.filter_text)
+        self.endResetModel()
+
+    def match(self, rows, text):
+        if not text:
+            return list(rows)
+        keys = self.keys
+        return [row for row in rows if text in keys[row]]
+
+    def set_filter(self, text):
+        """Show only tools whose name contains text. Typing one more character
+        only rescans the tools that matched before it."""
+        text = text.strip().lower()
+        if text == self.filter_text:
+            return
+        if self.filter_text and text.startswith(self.filter_text):
+            rows = self.visible
+        else:
+            rows = range(len(self.tools))
+        self.beginResetModel()
+        self.visible = self.match(rows, text)
+        self.filter_text = text
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=None):
+        """Return the tool's name, URL or icon for role (None: the display role)"""
+        if not index.isValid():
+            return None
+        tool = self.tools[self.visible[index.row()]]
+        if role is None or role in NAME_ROLES:
+            return tool.name
+        if role == URL_ROLE:
+            return tool.url
+        if role == ICON_ROLE:
+            return tool.icon
+        return None
+
+
+class ToolButtonDelegate(QStyledItemDelegate):
+    """Paints each row like the old tool buttons, from pixmaps rendered once"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = QPixmap(BUTTON_IMAGE) if os.path.exists(BUTTON_IMAGE) else None
+        self.backgrounds = {}  # (width, height, dpr, state) -> QPixmap
+        self.icons = {}  # (icon, dpr) -> QPixmap
+        self.text_font = None
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT + ROW_SPACING)
+
+    def get_background(self, width, height, dpr, state):
+        """Return the button frame for a row size and state, rendering it on first use"""
+        key = (width, height, dpr, state)
+        pixmap = self.backgrounds.get(key)
+        if pixmap is not None:
+            return pixmap
+        if len(self.backgrounds) >= MAX_CACHED_BACKGROUNDS:
+            self.backgrounds.clear()
+
+        pixmap = QPixmap(math.ceil(width * dpr), math.ceil(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(1, 1, width - 2, height - 2), RADIUS, RADIUS)
+
+        if self.source is not None and not self.source.isNull():
+            # Same look as the old button.jpg stylesheet: tiled image, red tint on hover/press
+            painter.fillPath(path, QBrush(self.source))
+            if state != NORMAL:
+                painter.fillPath(path, QColor(139, 74, 74, 77 if state == HOVER else 128))
+        else:
+            painter.fillPath(path, QColor(LIGHTER_RED if state == HOVER else DARK_PASTEL_RED))
+
+        border = DARK_PASTEL_RED if state == HOVER else BORDER_COLOR
+        painter.setPen(QPen(QColor(border), 2))
+        painter.drawPath(path)
+        painter.end()
+
+        self.backgrounds[key] = pixmap
+        return pixmap
+
+    def get_icon(self, icon, font, dpr):
+        """Return an emoji icon rendered to a pixmap, rendering it on first use"""
+        key = (icon, dpr)
+        pixmap = self.icons.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(math.ceil(ICON_SIZE * dpr), math.ceil(ICON_SIZE * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            icon_font = QFont(font)
+            icon_font.setPixelSize(ICON_SIZE - 4)
+            painter.setFont(icon_font)
+            painter.setPen(QColor(TEXT_COLOR))
+            painter.drawText(QRectF(0, 0, ICON_SIZE, ICON_SIZE), Qt.AlignmentFlag.AlignCenter, icon)
+            painter.end()
+            self.icons[key] = pixmap
+        return pixmap
+
+    def paint(self, painter, option, index):
+        view = option.widget
+        if getattr(view, "pressed_index", None) == index:
+            state = PRESSED
+        elif option.state & (QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_HasFocus):
+            state = HOVER
+        else:
+            state = NORMAL
+
+        rect = option.rect.adjusted(0, 0, 0, -ROW_SPACING)
+        dpr = view.devicePixelRatioF() if view is not None else 1.0
+        painter.drawPixmap(rect.topLeft(), self.get_background(rect.width(), rect.height(), dpr, state))
+
+        icon_top = rect.top() + (rect.height() - ICON_SIZE) // 2
+        painter.drawPixmap(QPoint(rect.left() + PADDING, icon_top),
+                           self.get_icon(index.data(ICON_ROLE), option.font, dpr))
+
+        if self.text_font is None:
+            self.text_font = QFont(option.font)
+            self.text_font.setBold(True)
+        painter.setFont(self.text_font)
+        painter.setPen(QColor(TEXT_COLOR))
+        text_rect = rect.adjusted(PADDING * 2 + ICON_SIZE, 0, -PADDING, 0)
+        text = painter.fontMetrics().elidedText(index.data(NAME_ROLE), Qt.TextElideMode.ElideRight,
+                                                text_rect.width())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+
+
+class ToolListView(QListView):
+    """Filterable list of tools. Only visible rows are laid out and painted."""
+    tool_activated = pyqtSignal(str, str)  # url, name
+    tool_hovered = pyqtSignal(str, str)  # url, name (pointer or keyboard focus)
+    tool_unhovered = pyqtSignal(str)  # url
+    context_menu_requested = pyqtSignal(str, QPoint)  # name, global position
+
+    def __init__(self, tools=(), parent=None):
+        super().__init__(parent)
+        self.setObjectName("toolList")
+        self.tool_model = ToolListModel(tools, self)
+        self.setModel(self.tool_model)
+        self.setItemDelegate(ToolButtonDelegate(self))
+
+        # Every row is the same height, so the layout never measures rows one by one
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+
+        self.pressed_index = QPersistentModelIndex()
+        self.hovered = None  # (url, name) of the row the pointer or focus is on
+        self.clicked.connect(self.activate)
+        self.customContextMenuRequested.connect(self.on_context_menu)
+
+    def set_tools(self, tools):
+        self.set_hovered(QModelIndex())
+        self.tool_model.set_tools(tools)
+
+    def set_filter(self, text):
+        """Show only tools whose name contains text"""
+        self.set_hovered(QModelIndex())
+        self.tool_model.set_filter(text)
+
+    def activate(self, index):
+        if index.isValid():
+            self.tool_activated.emit(index.data(URL_ROLE), index.data(NAME_ROLE))
+
+    def activate_first(self):
+        """Open the first visible tool (Enter in the filter box)"""
+        self.activate(self.tool_model.index(0, 0))
+
+    def set_hovered(self, index):
+        """Tell listeners which tool the pointer or keyboard focus moved to"""
+        hovered = (index.data(URL_ROLE), index.data(NAME_ROLE)) if index.isValid() else None
+        if hovered == self.hovered:
+            return
+        if self.hovered is not None:
+            self.tool_unhovered.emit(self.hovered[0])
+        self.hovered = hovered
+        if hovered is not None:
+            self.tool_hovered.emit(*hovered)
+
+    def mouseMoveEvent(self, event):
+        self.set_hovered(self.indexAt(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hovered(QModelIndex())
+        super().leaveEvent(event)
+
+    def currentChanged(self, current, previous):
+        super().currentChanged(current, previous)
+        if self.hasFocus():
+            self.set_hovered(current)
+
+    def focusOutEvent(self, event):
+        if not self.underMouse():
+            self.set_hovered(QModelIndex())
+        super().focusOutEvent(event)
+
+    def mousePressEvent(self, event):
+        self.pressed_index = QPersistentModelIndex(self.indexAt(event.position().toPoint()))
+        self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        self.pressed_index = QPersistentModelIndex()
+        self.viewport().update()
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Space):
+            self.activate(self.currentIndex())
+            return
+        super().keyPressEvent(event)
+
+    def on_context_menu(self, pos):
+        index = self.indexAt(pos)
+        if index.isValid():
+            self.context_menu_requested.emit(index.data(NAME_ROLE), self.viewport().mapToGlobal(pos))
@@ -0,0 +1,196 @@
+# tool_manifest.py
+import config
+import json
+import os
+import re
+
+DEFAULT_ICON = "🔧"
+
+# Profile names from profiles.py, repeated here so the manifest loads without QtWebEngine.
+# The game profile is never available to tools.
+TOOL_PROFILES = ("tools", "ephemeral")
+
+# Policy for any field a tool doesn't set
+TOOL_DEFAULTS = {
+    "icon": DEFAULT_ICON,
+    "profile": "tools",  # Web profile the tool's pages use
+    "cache_ttl": None,  # Offline cache freshness in seconds, None = offline_cache_ttl
+    "preload": False,  # Prerender in the background once the game has loaded
+    "prerender": True,  # Prerender after hovering the tool's button
+    "freeze": True,  # May be frozen while hidden
+    "discard": True,  # May be discarded while hidden
+    "memory_mb": None,  # Renderer memory ceiling, None = only the shared tool budget
+    "enabled": True,  # False hides a built-in tool
+}
+
+# Built-in tools, in panel order. A tools.json manifest can change any field of
+# these by id and add tools of its own.
+DEFAULT_TOOLS = [
+    {"id": "forums", "name": "Forums", "url": "https://lostcity.rs", "icon": "💬",
+     "memory_mb": 400},
+    {"id": "clue-coordinates", "name": "Clue Coordinates",
+     "url": "https://razgals.github.io/2004-Coordinates/", "icon": "📍", "cache_ttl": 86400},
+    {"id": "clue-scroll-help", "name": "Clue Scroll Help",
+     "url": "https://razgals.github.io/Treasure/", "icon": "📜", "cache_ttl": 86400},
+    # Reloading the map is slow and loses the view position
+    {"id": "world-map", "name": "World Map", "url": "https://2004.lostcity.rs/worldmap",
+     "icon": "🗺️", "discard": False},
+    {"id": "highscores", "name": "Highscores", "url": "https://2004.lostcity.rs/hiscores",
+     "icon": "🏆"},
+    # Live prices: prerendering would show stale numbers
+    {"id": "market-prices", "name": "Market Prices", "url": "https://lostcity.markets",
+     "icon": "💰", "prerender": False, "memory_mb": 300},
+    {"id": "quest-help", "name": "Quest Help", "url": "https://2004.losthq.rs/?p=questguides",
+     "icon": "🛡️", "cache_ttl": 86400},
+    {"id": "skill-guides", "name": "Skill Guides", "url": "https://2004.losthq.rs/?p=skillguides",
+     "icon": "📚", "cache_ttl": 86400},
+    # Form input would be lost by a discard
+    {"id": "skills-calculator", "name": "Skills Calculator",
+     "url": "https://2004.losthq.rs/?p=calculators", "icon": "🧮", "discard": False},
+    {"id": "bestiary", "name": "Bestiary", "url": "https://2004.losthq.rs/?p=droptables",
+     "icon": "🐉", "cache_ttl": 86400},
+]
+
+
+def make_tool_id(title):
+    """Stable id for a tool name, e.g. "Quest Help" -> "quest-help" """
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def validate_tool(entry):
+    """Return a list of problems with a merged tool entry (empty if it is valid)"""
+    errors = []
+    unknown = set(entry) - set(TOOL_DEFAULTS) - {"id", "name", "url"}
+    if unknown:
+        errors.append(f"unknown fields {sorted(unknown)}")
+    if not isinstance(entry.get("name"), str) or not entry["name"].strip():
+        errors.append("name must be a non-empty string")
+    if not isinstance(entry.get("url"), str) or not entry["url"].startswith(("https://", "http://")):
+        errors.append("url must be an http(s) URL")
+    if not isinstance(entry.get("icon"), str):
+        errors.append("icon must be a string")
+    if entry.get("profile") not in TOOL_PROFILES:
+        errors.append(f"profile must be one of {TOOL_PROFILES}")
+    for field in ("preload", "prerender", "freeze", "discard", "enabled"):
+        if not isinstance(entry.get(field), bool):
+            errors.append(f"{field} must be true or false")
+    for field, minimum in (("cache_ttl", 0), ("memory_mb", 1)):
+        value = entry.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                  or value < minimum):
+            errors.append(f"{field} must be null or a number >= {minimum}")
+    return errors
+
+
+class ToolSpec:
+    """One validated tool from the manifest"""
+
+    def __init__(self, entry):
+        self.id = entry["id"]
+        self.name = entry["name"]
+        self.url = entry["url"]
+        self.icon = entry["icon"]
+        self.profile = entry["profile"]
+        self.cache_ttl = entry["cache_ttl"]
+        self.preload = entry["preload"]
+        self.prerender = entry["prerender"]
+        self.freeze = entry["freeze"]
+        self.discard = entry["discard"]
+        self.memory_mb = entry["memory_mb"]
+
+    def get_host(self):
+        return self.url.split("://", 1)[1].split("/", 1)[0].split("?", 1)[0].lower()
+
+
+class ToolManifest:
+    """Every tool the panel offers, with its resource policy"""
+
+    def __init__(self, entries):
+        self.tools = []
+        self.by_id = {}
+        self.by_name = {}  # lowercased name -> ToolSpec
+        for entry in entries:
+            spec = ToolSpec(entry)
+            self.tools.append(spec)
+            self.by_id[spec.id] = spec
+            self.by_name[spec.name.lower()] = spec
+        # Tools default to the same policy as built-ins without their own settings
+        self.default = ToolSpec(dict(TOOL_DEFAULTS, id="", name="", url=""))
+
+    def get(self, tool_id):
+        return self.by_id.get(tool_id)
+
+    def find(self, name):
+        """Return the tool with this display name, or None"""
+        return self.by_name.get(name.lower()) if name else None
+
+    def get_tool_id(self, name):
+        """Return the manifest id of the tool with this display name; pages not in the manifest get their own"""
+        tool = self.find(name)
+        return tool.id if tool is not None else f"page:{name.lower()}"
+
+    def get_policy(self, name):
+        """Return the tool's spec, or the default policy for pages not in the manifest"""
+        return self.find(name) or self.default
+
+    def get_icon(self, name):
+        return self.get_policy(name).icon
+
+    def get_cache_ttl(self, host):
+        """Shortest cache TTL any tool on host asks for, or None for the global default"""
+        ttls = [t.cache_ttl for t in self.tools if t.cache_ttl is not None and t.get_host() == host]
+        return min(ttls) if ttls else None
+
+
+def read_manifest_file(path):
+    """Return the tool entries in a manifest file ([] if it doesn't exist)"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read tool manifest {path}: {e}")
+        return []
+    entries = data.get("tools") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        print(f"❌ Tool manifest {path} must hold a list of tools")
+        return []
+    return entries
+
+
+def load_manifest(path=None):
+    """Merge the built-in tools with a manifest file, validating each entry on its own"""
+    path = path or config.get_config_value("tool_manifest") or "tools.json"
+    merged = {entry["id"]: dict(TOOL_DEFAULTS, **entry) for entry in DEFAULT_TOOLS}
+
+    for entry in read_manifest_file(path):
+        if not isinstance(entry, dict):
+            print(f"⚠️ Skipping tool manifest entry that is not an object: {entry!r}")
+            continue
+        tool_id = entry.get("id") or make_tool_id(str(entry.get("name", "")))
+        base = merged.get(tool_id)
+        candidate = dict(base or TOOL_DEFAULTS, **entry)
+        candidate["id"] = tool_id
+        errors = validate_tool(candidate)
+        if errors and base is not None:
+            # A bad override must not take the tool it overrides away
+            print(f"⚠️ Ignoring override of tool '{tool_id}' in {path}, keeping the previous entry: "
+                  f"{'; '.join(errors)}")
+        elif errors:
+            print(f"⚠️ Skipping tool '{tool_id}' in {path}: {'; '.join(errors)}")
+        else:
+            merged[tool_id] = candidate
+
+    return ToolManifest([entry for entry in merged.values() if entry["enabled"]])
+
+
+_manifest = None
+
+
+def get_manifest():
+    """Return the tool manifest, loaded on first use"""
+    global _manifest
+    if _manifest is None:
+        _manifest = load_manifest()
+    return _manifest
@@ -0,0 +1,121 @@
+# tool_sessions.py
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+from collections import OrderedDict
+import config
+import time
+
+TAB = "tab"
+WINDOW = "window"
+
+
+class ToolSession:
+    """One open tool: the tab or window showing it and how to focus or close that"""
+
+    def __init__(self, tool_id, title, url, kind, container, focus, close):
+        self.tool_id = tool_id
+        self.title = title
+        self.url = url
+        self.kind = kind  # TAB or WINDOW
+        self.container = container
+        self.focus = focus  # callable bringing the container to the front
+        self.close = close  # callable closing the container; its close path calls remove()
+        self.opened_at = time.monotonic()
+        self.last_focused = self.opened_at
+
+
+class ToolSessionManager(QObject):
+    """Owns every open tool instance, keyed by tool id, least recently focused first"""
+    opened = pyqtSignal(object)  # ToolSession
+    focused = pyqtSignal(object)
+    closed = pyqtSignal(object)
+    evicted = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sessions = OrderedDict()  # tool_id -> ToolSession
+        self.counts = {"opened": 0, "focused": 0, "closed": 0, "evicted": 0}
+
+    def get(self, tool_id):
+        return self.sessions.get(tool_id)
+
+    def get_sessions(self, kind=None):
+        return [s for s in self.sessions.values() if kind is None or s.kind == kind]
+
+    def get_limit(self):
+        try:
+            return max(1, int(config.get_config_value("tool_session_limit", 8)))
+        except (ValueError, TypeError):
+            return 8
+
+    def touch(self, tool_id):
+        """Mark a tool the user switched to as most recently used"""
+        session = self.sessions.get(tool_id)
+        if session is not None:
+            self.sessions.move_to_end(tool_id)
+            session.last_focused = time.monotonic()
+        return session
+
+    def focus(self, tool_id):
+        """Bring an open tool to the front; returns False if it isn't open"""
+        session = self.touch(tool_id)
+        if session is None:
+            return False
+        self.counts["focused"] += 1
+        session.focus()
+        self.focused.emit(session)
+        return True
+
+    def add(self, tool_id, title, url, kind, container, focus, close):
+        """Track a newly opened tool container, closing the least recently used over the cap"""
+        session = ToolSession(tool_id, title, url, kind, container, focus, close)
+        self.sessions.pop(tool_id, None)
+        self.sessions[tool_id] = session
+        self.counts["opened"] += 1
+        self.opened.emit(session)
+        self.enforce_limit()
+        return session
+
+    def remove(self, tool_id, container=None):
+        """Forget a tool whose container closed. A stale container (one the tool
+        has since moved out of) doesn't remove the current session."""
+        session = self.sessions.get(tool_id)
+        if session is None or (container is not None and session.container is not container):
+            return
+        del self.sessions[tool_id]
+        self.counts["closed"] += 1
+        self.closed.emit(session)
+
+    def close(self, tool_id):
+        """Close an open tool through its container"""
+        session = self.sessions.get(tool_id)
+        if session is not None:
+            try:
+                session.close()
+            except RuntimeError:
+                pass  # Container already deleted
+            self.remove(tool_id, session.container)
+
+    def enforce_limit(self):
+        """Close least recently focused tools while more than the cap are open"""
+        limit = self.get_limit()
+        while len(self.sessions) > limit:
+            tool_id, session = next(iter(self.sessions.items()))
+            print(f"Closing {session.title}: more than {limit} tools open")
+            self.counts["evicted"] += 1
+            self.evicted.emit(session)
+            self.close(tool_id)
+
+    def get_stats(self):
+        return dict(self.counts, open=len(self.sessions))
+
+
+_manager = None
+
+
+def get_manager():
+    """Return the process-wide tool session manager"""
+    global _manager
+    if _manager is None:
+        _manager = ToolSessionManager(QApplication.instance())
+    return _manager
@@ -0,0 +1,71 @@
+# url_matcher.py
+
+
+class _HostNode:
+    __slots__ = ("children", "block_all", "prefixes", "prefix_lengths")
+
+    def __init__(self):
+        self.children = {}  # next host label (right to left) -> _HostNode
+        self.block_all = False  # rule covers the whole host and its subdomains
+        self.prefixes = set()  # blocked path prefixes for this host suffix
+        self.prefix_lengths = ()  # distinct prefix lengths, longest first
+
+
+class HostPathMatcher:
+    """Blocklist compiled into a host-suffix trie with path prefix tables.
+
+    Rules look like "doubleclick.net" (the host and all subdomains) or
+    "example.com/ads/" (only paths starting with /ads/ on that host suffix).
+    A lookup walks the host labels from the right once and checks each node's
+    path prefixes by length, so its cost grows with the URL, not the list."""
+
+    def __init__(self, rules=()):
+        self.root = _HostNode()
+        self.rule_count = 0
+        for rule in rules:
+            self.add(rule)
+        self.finalize()
+
+    def add(self, rule):
+        rule = rule.strip().lower()
+        if not rule or rule.startswith("#"):
+            return
+        # Accept full URLs as well as bare host[/path] rules
+        if "://" in rule:
+            rule = rule.split("://", 1)[1]
+        host, _, path = rule.partition("/")
+        host = host.lstrip("*.").split(":")[0]
+        if not host:
+            return
+
+        node = self.root
+        for label in reversed(host.split(".")):
+            node = node.children.setdefault(label, _HostNode())
+        if path:
+            node.prefixes.add("/" + path)
+        else:
+            node.block_all = True
+        self.rule_count += 1
+
+    def finalize(self):
+        """Precompute prefix lengths; call after the last add()"""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node.prefix_lengths = tuple(sorted({len(p) for p in node.prefixes}, reverse=True))
+            stack.extend(node.children.values())
+
+    def matches(self, host, path="/"):
+        """Return True if host/path is covered by a rule"""
+        node = self.root
+        labels = host.lower().split(".")
+        for index in range(len(labels) - 1, -1, -1):
+            node = node.children.get(labels[index])
+            if node is None:
+                return False
+            if node.block_all:
+                return True
+            for length in node.prefix_lengths:
+                if path[:length] in node.prefixes:
+                    return True
+        return False
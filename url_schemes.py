@@ -0,0 +1,28 @@
+# url_schemes.py
+from PyQt6.QtWebEngineCore import QWebEngineUrlScheme
+
+# The kit's own schemes; each stands for an https:// URL served from local data
+OFFLINE_CACHE = b"kitcache"  # static tool sites from the offline content store
+WORLD_MAP = b"kitmap"  # the World Map page, with tiles from the tile pack
+GAME_ASSETS = b"kitasset"  # the game client's files from the versioned asset store
+
+_registered = False
+
+
+def register_all():
+    """Register every custom scheme with Chromium's URL parser and security model.
+
+    Must run before the QApplication is created: Qt ignores schemes registered
+    once any web engine object exists."""
+    global _registered
+    if _registered:
+        return
+    for name in (OFFLINE_CACHE, WORLD_MAP, GAME_ASSETS):
+        scheme = QWebEngineUrlScheme(name)
+        scheme.setSyntax(QWebEngineUrlScheme.Syntax.HostAndPort)
+        scheme.setDefaultPort(443)
+        scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme
+                        | QWebEngineUrlScheme.Flag.CorsEnabled
+                        | QWebEngineUrlScheme.Flag.FetchApiAllowed)
+        QWebEngineUrlScheme.registerScheme(scheme)
+    _registered = True
@@ -0,0 +1,193 @@
+# view_pool.py
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import QObject, QTimer, QUrl
+from PyQt6.QtWidgets import QApplication
+import profiles
+import offline_scheme
+import map_scheme
+import lifecycle
+import request_blocker
+import tool_manifest
+import load_timing
+import config
+import time
+
+BLANK_URL = QUrl("about:blank")
+
+# Number of recent open latencies kept for reporting
+LATENCY_HISTORY = 50
+
+
+class WebViewPool(QObject):
+    """Keeps a few blank, already-initialized tool views ready to be borrowed"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.idle_views = []
+        self.hits = 0
+        self.misses = 0
+        self.open_latencies = []  # (title, ms, source): "pool hit", "pool miss" or "prerender"
+
+    def get_target_size(self):
+        try:
+            return max(0, int(config.get_config_value("view_pool_size", 2)))
+        except (ValueError, TypeError):
+            return 2
+
+    def create_view(self, profile_name=profiles.TOOLS_PROFILE):
+        """Build a view with its own page on a tool profile (the shared tools profile by default)"""
+        view = QWebEngineView()
+        # The page belongs to the view so it survives moving between containers
+        page = QWebEnginePage(profiles.get_profile(profile_name), view)
+        page.profile_name = profile_name
+        view.setPage(page)
+        page.loadFinished.connect(lambda ok, v=view: self.on_view_loaded(v, ok))
+        return view
+
+    def on_view_loaded(self, view, ok):
+        """Log the timings of a tool page load (pool warm-up loads have no tool title)"""
+        page = view.page()
+        title = getattr(page, "tool_title", None)
+        if title is not None:
+            load_timing.collect(page, title, ok, background=not view.isVisible())
+
+    def fill(self):
+        """Top the pool up one view per event-loop turn so startup stays responsive"""
+        if len(self.idle_views) >= self.get_target_size():
+            return
+        view = self.create_view()
+        # Navigating once makes Chromium spin up the renderer ahead of time
+        view.setUrl(BLANK_URL)
+        self.idle_views.append(view)
+        QTimer.singleShot(0, self.fill)
+
+    def acquire(self):
+        """Return (view, hit) with a view ready to navigate"""
+        if self.idle_views:
+            view = self.idle_views.pop()
+            self.hits += 1
+            hit = True
+        else:
+            view = self.create_view()
+            self.misses += 1
+            hit = False
+        # Replace what was just borrowed
+        QTimer.singleShot(0, self.fill)
+        return view, hit
+
+    def release(self, view):
+        """Take a view back from a closing container, or delete it if the pool is full"""
+        if view is None:
+            return
+        try:
+            page = view.page()
+            lifecycle.get_manager().unregister(page)
+            # Forget the last tool so the next one starts clean
+            request_blocker.clear(page)
+            page.tool_title = None
+            self.stop_tracking(page)
+            view.setParent(None)
+            # Only tools-profile views are interchangeable; others are thrown away
+            if (getattr(page, "profile_name", profiles.TOOLS_PROFILE) != profiles.TOOLS_PROFILE
+                    or len(self.idle_views) >= self.get_target_size()):
+                view.deleteLater()
+                return
+            if lifecycle.get_state(page) != lifecycle.ACTIVE:
+                page.setLifecycleState(page.LifecycleState.Active)
+            view.stop()
+            view.setUrl(BLANK_URL)
+            page.history().clear()
+            view.hide()
+            self.idle_views.append(view)
+        except RuntimeError:
+            pass  # View already deleted
+
+    def track_open(self, view, title, source):
+        """Record how long a borrowed view takes to finish its first load"""
+        start = time.perf_counter()
+        page = view.page()
+
+        def on_load_finished(ok):
+            self.stop_tracking(page)
+            self.record_open(title, (time.perf_counter() - start) * 1000, source)
+
+        page.open_tracker = on_load_finished
+        page.loadFinished.connect(on_load_finished)
+
+    def stop_tracking(self, page):
+        """Drop a load still being timed by track_open"""
+        tracker = getattr(page, "open_tracker", None)
+        if tracker is not None:
+            page.open_tracker = None
+            try:
+                page.loadFinished.disconnect(tracker)
+            except (RuntimeError, TypeError):
+                pass
+
+    def record_open(self, title, elapsed_ms, source):
+        self.open_latencies.append((title, elapsed_ms, source))
+        del self.open_latencies[:-LATENCY_HISTORY]
+        print(f"Opened {title} in {elapsed_ms:.0f} ms ({source})")
+
+    def get_stats(self):
+        """Return pool counters and latency averages for display"""
+        def average(values):
+            return sum(values) / len(values) if values else None
+        return {
+            "idle": len(self.idle_views),
+            "hits": self.hits,
+            "misses": self.misses,
+            "avg_open_ms_hit": average([ms for _, ms, source in self.open_latencies if source == "pool hit"]),
+            "avg_open_ms_miss": average([ms for _, ms, source in self.open_latencies if source == "pool miss"]),
+            "avg_open_ms_prerender": average([ms for _, ms, source in self.open_latencies
+                                              if source == "prerender"]),
+        }
+
+    def clear(self):
+        """Delete every idle view"""
+        for view in self.idle_views:
+            view.deleteLater()
+        self.idle_views.clear()
+
+
+def route_url(url):
+    """Return the URL a tool should actually load, after local cache schemes"""
+    return offline_scheme.map_url(map_scheme.map_url(url))
+
+
+def borrow_view(url, title):
+    """Return a view showing url: a matching prerender if one exists, else a pooled view"""
+    import prefetch
+    pool = get_pool()
+    prefetcher = prefetch.get_prefetcher()
+    loaded = prefetcher.is_loaded(url)
+    view = prefetcher.take(url)
+    if view is not None:
+        if loaded:
+            pool.record_open(title, 0.0, "prerender")  # Ready before it was asked for
+        else:
+            pool.track_open(view, title, "prerender")
+        return view
+
+    profile_name = tool_manifest.get_manifest().get_policy(title).profile
+    if profile_name == profiles.TOOLS_PROFILE:
+        view, hit = pool.acquire()
+    else:
+        view, hit = pool.create_view(profile_name), False
+    pool.track_open(view, title, "pool hit" if hit else "pool miss")
+    view.page().tool_title = title
+    request_blocker.apply(view.page(), title)
+    view.setUrl(QUrl(route_url(url)))
+    return view
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the process-wide tool view pool"""
+    global _pool
+    if _pool is None:
+        _pool = WebViewPool(QApplication.instance())
+    return _pool